@@ -1,10 +1,53 @@
-from gui import QDeckEditor
-
 if __name__ == '__main__':
-    from PySide6.QtWidgets import QApplication
+    import argparse
+    import os
     import sys
+    from config import create_directories
+    from learn.profiling import Profiler
+
+    parser = argparse.ArgumentParser(description='Flashcards app')
+    parser.add_argument('--profile', action='store_true',
+                        help='Writes a report of the startup phases and of the hot functions in data/profiles on exit')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Profiles the memory allocated by each phase as well (slower)')
+    parser.add_argument('--cprofile', action='store_true', help='Writes a cProfile dump next to the report')
+    args = parser.parse_args()
+    # BYHEART_PROFILE: Enables the profiling mode as well. Comma separated options: 'memory', 'cprofile'
+    options = os.environ.get('BYHEART_PROFILE', '')
+    options = set(options.split(',')) if options not in ('', '0') else set()
+    if args.profile or args.profile_memory or args.cprofile or options:
+        Profiler.enable(memory=args.profile_memory or 'memory' in options,
+                        cprofile=args.cprofile or 'cprofile' in options)
+
+    # Imported once the profiling mode is set, as it decorates the modules' functions
+    with Profiler.phase('imports'):
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QObject, QEvent
+        from gui import QDeckEditor
+        from gui.deck import PreRenderer
+        from learn.render import MathCache, AssetCache
+
+    class QFirstPaint(QObject):
+        """
+        Marks the first paint of the main window in the profiling report.
+        """
+        def eventFilter(self, watched, event) -> bool:
+            if event.type() == QEvent.Type.Paint:
+                Profiler.mark('first paint')
+                watched.removeEventFilter(self)
+            return False
 
+    create_directories()
     app = QApplication()
-    deck_editor = QDeckEditor()
+    app.aboutToQuit.connect(PreRenderer.shutdown)
+    app.aboutToQuit.connect(MathCache.save)
+    app.aboutToQuit.connect(AssetCache.save)
+    with Profiler.phase('main window'):
+        deck_editor = QDeckEditor()
+    if Profiler.enabled:
+        first_paint = QFirstPaint(deck_editor)
+        deck_editor.installEventFilter(first_paint)
     deck_editor.showMaximized()
+    app.aboutToQuit.connect(deck_editor.tree.save_worker.wait)
+    app.aboutToQuit.connect(Profiler.write_report)
     sys.exit(app.exec())
@@ -4,10 +4,8 @@ import os
 # project_directory: Root path of the project
 project_directory = os.path.dirname(__file__)
 
-# data_directory: Directory is created to store user flashcard related data
+# data_directory: Directory storing user flashcard related data
 data_directory = os.path.join(project_directory, 'data')
-if not os.path.isdir(data_directory):
-    os.mkdir(data_directory)
 
 # decks_directory: Directory containing one deck file per user deck
 decks_directory = os.path.join(project_directory, 'data', 'decks')
@@ -15,11 +13,23 @@ decks_directory = os.path.join(project_directory, 'data', 'decks')
 records_directory = os.path.join(project_directory, 'data', 'records')
 # picker_directory: Directory containing one file for target times and one for interval boxes per user deck
 picker_directory = os.path.join(project_directory, 'data', 'picker')
+# checkpoint_directory: Directory containing the journals of the exam sessions not saved yet (see ExamCheckpoint.py)
+checkpoint_directory = os.path.join(project_directory, 'data', 'checkpoints')
 
-# Creating the needed directories if not already existing
-for directory in [decks_directory, records_directory, picker_directory]:
-    if not os.path.isdir(directory):
-        os.mkdir(directory)
+
+def create_directories() -> None:
+    """
+    Creates the needed directories if not already existing. Called once at startup (see app.py), not on import.
+    """
+    for directory in [data_directory, decks_directory, records_directory, picker_directory, checkpoint_directory]:
+        if not os.path.isdir(directory):
+            os.mkdir(directory)
+
+
+# pack_path: File bundling the decks, records and picker files, to speed up loading (see learn/pack/DataPack.py)
+pack_path = os.path.join(project_directory, 'data', 'data.pack')
+# pack_mmap: If True, the pack file is memory-mapped instead of being read in memory
+pack_mmap = True
 
 # icons_directory: Directory containing the icons used by the app
 icons_directory = os.path.join(project_directory, 'images', 'icons')
@@ -27,6 +37,36 @@ icons_directory = os.path.join(project_directory, 'images', 'icons')
 # templates_directory: Directory containing the html and css files for the app
 templates_directory = os.path.join(project_directory, 'gui', 'templates')
 
+# template_cache_directory: Directory where the compiled flashcard template is kept between sessions
+template_cache_directory = os.path.join(project_directory, 'data', 'template_cache')
+# render_cache_size: Number of flashcard HTML pages kept in memory (see gui/deck/RenderCache.py)
+render_cache_size = 256
+# render_cache_directory: Directory where flashcard HTML pages are kept between sessions. None to disable.
+render_cache_directory = os.path.join(project_directory, 'data', 'render_cache')
+# render_cache_disk_size: Maximum number of flashcard HTML pages kept in render_cache_directory
+render_cache_disk_size = 20000
+# prerender_processes: Number of processes rendering flashcards in advance (see gui/deck/PreRenderer.py)
+prerender_processes = max(1, (os.cpu_count() or 2) - 1)
+# prerender_batch_size: Number of flashcard pages rendered per task sent to a process
+prerender_batch_size = 8
+# math_cache_path: File keeping the MathML conversions of Latex expressions between sessions
+# (see learn/render/MathCache.py)
+math_cache_path = os.path.join(project_directory, 'data', 'math_cache.json')
+# math_cache_size: Maximum number of characters of the Latex expressions and their MathML conversions in cache
+math_cache_size = 8_000_000
+# asset_cache_directory: Directory storing the images of the flashcards at display size (see learn/render/AssetCache.py)
+asset_cache_directory = os.path.join(project_directory, 'data', 'assets')
+# asset_display_size: Maximum width and height in pixels of the images displayed in flashcards
+asset_display_size = (1920, 1080)
+# exam_warmup_delay: Delay in milliseconds between the display of the main window and the creation of the exam window,
+# which starts QtWebEngine
+exam_warmup_delay = 300
+# checkpoint_interval: Interval in milliseconds between two checkpoints of an exam session, besides the ones at each
+# answer
+checkpoint_interval = 5000
+# profile_directory: Directory where the reports of the profiling mode are written (see learn/profiling/Profiler.py)
+profile_directory = os.path.join(project_directory, 'data', 'profiles')
+
 # intervals: Flashcard review intervals
 intervals = [
     timedelta(days=1),
@@ -51,3 +91,6 @@ sample_size = 3
 warmup_size = 2
 # factor_max: Factor between target response time and admissible response time
 factor_max = 1.5
+
+# undo_memory_limit: Estimated memory in bytes above which the oldest edit operations can't be undone anymore
+undo_memory_limit = 8 * 1024 * 1024
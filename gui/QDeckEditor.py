@@ -1,12 +1,14 @@
-from config import icons_directory
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
-from gui import QTreeDeck, QtExam
-from PySide6.QtCore import Qt, Slot, QSize
-from gui.deck import QDeck, QFlashCard
+from config import icons_directory, exam_warmup_delay
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QMessageBox
+from gui import QTreeDeck, QtExam, QDeckSearch
+from gui.deck import PreRenderer
+from PySide6.QtCore import Qt, Slot, QSize, QTimer
 from learn.quizz import Examiner
+from learn.deck import Deck, FlashCard, DeckView
 from learn.pickle import DeckManager
+from learn.profiling import Profiler
 import os
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QShortcut, QKeySequence
 
 
 class QDeckEditor(QWidget):
@@ -15,11 +17,15 @@ class QDeckEditor(QWidget):
 
     It's composed of:
     - Upper buttons for edit operations
+    - A search box for flashcards
     - The decks' tree
     - A lower button to start exam
 
     Upper buttons are defined in the class QDeckButtons of this file.
     The slots these buttons are connected are defined in QTreeDeck.
+
+    The exam window isn't created with the main window, as its web view starts QtWebEngine: it's created
+    exam_warmup_delay milliseconds (config.py) after the main window is shown, or on exam start if it's sooner.
     """
 
     def __init__(self, parent=None):
@@ -29,13 +35,16 @@ class QDeckEditor(QWidget):
         ##########################
         self.tree = QTreeDeck(self)
         self.buttons = QDeckButtons(parent=self)
+        self.search = QDeckSearch(parent=self)
         self.start_button = QPushButton('Start')
         self.start_button.setStyleSheet("font-size: 22px")
-        self.exam = QtExam()
+        self.exam: QtExam | None = None
+        self.title = self.windowTitle()
         # Adding widgets to layout
         ############################
         self.layout = QVBoxLayout(self)
         self.layout.addWidget(self.buttons, alignment=Qt.AlignmentFlag.AlignLeft)
+        self.layout.addWidget(self.search)
         self.layout.addWidget(self.tree)
         self.layout.addWidget(self.start_button)
         # Connecting buttons to QTreeDeck's slots, and this class' slots
@@ -49,6 +58,42 @@ class QDeckEditor(QWidget):
         self.buttons.create_button.clicked.connect(self.tree.new)
         self.buttons.enable_button.clicked.connect(self.tree.enable)
         self.start_button.clicked.connect(self.start_exam)
+        self.search.card_selected.connect(self.tree.select_card)
+        self.tree.save_worker.progress.connect(self.save_progress)
+        self.tree.save_worker.saved.connect(self.saved)
+        self.tree.save_worker.failed.connect(self.save_failed)
+        # Undo/redo shortcuts
+        ######################
+        QShortcut(QKeySequence.StandardKey.Undo, self).activated.connect(self.tree.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self).activated.connect(self.tree.redo)
+
+    def showEvent(self, event) -> None:
+        if self.exam is None:
+            QTimer.singleShot(exam_warmup_delay, self.get_exam)
+        return QWidget.showEvent(self, event)
+
+    @Slot()
+    def get_exam(self) -> QtExam:
+        """
+        @return: The exam window, created on first call
+        """
+        if self.exam is None:
+            with Profiler.phase('exam window'):
+                self.exam = QtExam()
+            self.exam.card_returned.connect(self.tree.refresh_card)
+        return self.exam
+
+    @Slot(int, int)
+    def save_progress(self, written: int, total: int) -> None:
+        self.setWindowTitle("%s - Saving %d/%d" % (self.title, written, total))
+
+    @Slot()
+    def saved(self) -> None:
+        self.setWindowTitle(self.title)
+
+    @Slot(str)
+    def save_failed(self, message: str) -> None:
+        QMessageBox.warning(self, "Save failed", "The decks couldn't be saved:\n" + message)
 
     @Slot()
     def start_exam(self):
@@ -59,31 +104,39 @@ class QDeckEditor(QWidget):
         However, it is not possible to select multiple decks: The program will only choose the first one.
         It is also not possible to select cards from different decks: Program will throw an error.
         """
-        if len(self.tree.selectedItems()) == 0:  # No selected element
+        selected = self.tree.selected_items()
+        if len(selected) == 0:  # No selected element
             return None
-        if len(set([item.parent() for item in self.tree.selectedItems()])) != 1:
+        if not self.tree.selection_at_same_level():
             raise ValueError("Items selected for exam must be at same level")
-        item = self.tree.selectedItems()[0]
-        if isinstance(item, QFlashCard):
+        item = selected[0]
+        if isinstance(item, FlashCard):
             # Selected flashcards
             #######################
-            cards = self.tree.selectedItems()
-            deck: QDeck = cards[0].parent()
-            filter_card = lambda x: x in cards and x.is_enabled()
-        elif isinstance(item, QDeck):
+            deck: Deck = self.tree.selected_deck()
+            keys = set(card.key for card in selected)
+        elif isinstance(item, Deck):
             # Selected a deck
             #######################
-            filter_card = lambda x: x.is_enabled()
             deck = item
+            keys = None
         else:
-            raise TypeError('%s not of type QDeck or QFlashCard' % type(item))
-        time_tracker = DeckManager.get_time_tracker(deck)
-        scheduler = DeckManager.get_scheduler(deck)
-        historian = DeckManager.get_historian(deck)
-        deck = deck.filter(filter_card)
-        examiner = Examiner(deck, historian, time_tracker, scheduler)
-        self.exam.set_examiner(examiner)
-        self.exam.showMaximized()
+            raise TypeError('%s not of type Deck or FlashCard' % type(item))
+        with Profiler.phase('exam start'):
+            time_tracker = DeckManager.get_time_tracker(deck)
+            scheduler = DeckManager.get_scheduler(deck)
+            historian = DeckManager.get_historian(deck)
+            deck = DeckView(deck, keys, lambda card: card.enabled)
+            # Resuming the previous session on the deck, if it was interrupted
+            examiner = Examiner(deck, historian, time_tracker, scheduler, checkpoint=True)
+            # Rendering the cards in advance, the most likely to be picked first
+            PreRenderer.cancel()
+            if examiner.pending_card is not None:
+                PreRenderer.add([examiner.pending_card])
+            PreRenderer.add(examiner.picker.rank_cards())
+        exam = self.get_exam()
+        exam.set_examiner(examiner)
+        exam.showMaximized()
 
 
 class QDeckButtons(QWidget):
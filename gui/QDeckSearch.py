@@ -0,0 +1,62 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Slot, Signal, QTimer
+from learn.pickle import DeckManager
+
+
+class QDeckSearch(QWidget):
+    """
+    Search box for flashcards, above the decks' tree.
+
+    The results are read from the search index of DeckManager, and listed below the search box, the best matches
+    first. The tree items are not filtered: activating a result emits card_selected, to select the card in the tree.
+    """
+    # card_selected: Emitted with the flashcard and the deck of the activated result
+    card_selected = Signal(object, object)
+
+    def __init__(self, max_results=50, parent=None):
+        super().__init__(parent=parent)
+        self.max_results = max_results
+        # Creation of subwidgets
+        ##########################
+        self.search_box = QLineEdit(self)
+        self.search_box.setPlaceholderText('Search flashcards...')
+        self.search_box.setClearButtonEnabled(True)
+        self.results = QListWidget(self)
+        self.results.hide()
+        # self.timer: Delays the search while typing
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(150)
+        # Adding widgets to layout
+        ############################
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.addWidget(self.search_box)
+        self.layout.addWidget(self.results)
+        # Connections
+        ##############
+        self.search_box.textChanged.connect(self.timer.start)
+        self.timer.timeout.connect(self.search)
+        self.results.itemActivated.connect(self.select_result)
+        self.results.itemClicked.connect(self.select_result)
+
+    @Slot()
+    def search(self) -> None:
+        """
+        Fills the results list with the search results of the search box's text.
+        """
+        self.results.clear()
+        query = self.search_box.text()
+        if not query.strip():
+            self.results.hide()
+            return
+        for card, deck in DeckManager.index.search(query, limit=self.max_results):
+            item = QListWidgetItem('%s  [%s]' % (card.question.split('\n')[0], deck.title))
+            item.setData(Qt.UserRole, card)
+            item.setData(Qt.UserRole + 1, deck)
+            self.results.addItem(item)
+        self.results.show()
+
+    @Slot()
+    def select_result(self, item: QListWidgetItem) -> None:
+        self.card_selected.emit(item.data(Qt.UserRole), item.data(Qt.UserRole + 1))
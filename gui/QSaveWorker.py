@@ -0,0 +1,88 @@
+from PySide6.QtCore import QObject, Signal
+from learn.deck import Deck
+from learn.pickle import DeckManager, DeckSnapshot
+from learn.pack import DataPack
+from typing import Dict, Set
+import threading
+
+
+class QSaveWorker(QObject):
+    """
+    Saves decks in a background thread, so that the decks can be edited meanwhile.
+
+    Call save(decks, deleted_decks) from the GUI thread: a snapshot of the data to write is taken right away (see
+    DeckManager.get_snapshot), and written later by the worker thread. Saves requested while another one is written
+    are merged: only the last snapshot of each deck is written, once the current save is done.
+
+    Progress and errors are reported by the signals below. Connected slots are called in the GUI thread.
+    """
+    # progress: Emitted with the number of written decks and the number of decks to write
+    progress = Signal(int, int)
+    # saved: Emitted when all the requested saves are written
+    saved = Signal()
+    # failed: Emitted with the error message when a save fails. The decks of that save are written on next save.
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        # self.pending: Snapshots of the decks waiting to be written, by deck key
+        self.pending: Dict[str, DeckSnapshot] = {}
+        # self.deleted: Keys of the decks whose files are waiting to be deleted
+        self.deleted: Set[str] = set()
+        self.thread: threading.Thread | None = None
+
+    def save(self, decks: [Deck], deleted_decks: [Deck] = ()) -> None:
+        """
+        Takes snapshots of the decks' data and has them written in the background. Also deletes the files of
+        deleted_decks.
+        """
+        with self.lock:
+            for deck in decks:
+                # A pending snapshot rewriting all the records can only be replaced by another one
+                pending = self.pending.get(deck.key)
+                rewrite_records = pending is not None and not pending.iterate
+                self.pending[deck.key] = DeckManager.get_snapshot(deck, rewrite_records=rewrite_records)
+                self.deleted.discard(deck.key)
+            for deck in deleted_decks:
+                DeckManager.saved_hashes.pop(deck.key, None)
+                DeckManager.remove(deck)
+                self.pending.pop(deck.key, None)
+                self.deleted.add(deck.key)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self) -> None:
+        """
+        Target of the worker thread. Writes the pending snapshots until there is none.
+        """
+        while True:
+            with self.lock:
+                if not self.pending and not self.deleted:
+                    self.thread = None
+                    break
+                snapshots, self.pending = list(self.pending.values()), {}
+                deleted, self.deleted = self.deleted, set()
+            written = 0
+            try:
+                for deck_key in deleted:
+                    DeckManager.delete_files(deck_key)
+                for snapshot in snapshots:
+                    DeckManager.write_snapshot(snapshot)
+                    written += 1
+                    self.progress.emit(written, len(snapshots))
+            except Exception as error:
+                # Records files to rewrite entirely on next save
+                DeckManager.moved_cards.update(snapshot.key for snapshot in snapshots[written:] if not snapshot.iterate)
+                self.failed.emit(str(error))
+        DataPack.schedule_repack()
+        self.saved.emit()
+
+    def wait(self) -> None:
+        """
+        Blocks until the pending saves are written. To call before quitting the app.
+        """
+        thread = self.thread
+        if thread is not None:
+            thread.join()
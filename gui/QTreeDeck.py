@@ -1,56 +1,82 @@
-from PySide6.QtWidgets import QTreeWidget, QAbstractItemView
-import PySide6.QtWidgets
-from learn.deck import FlashCard
+from PySide6.QtWidgets import QTreeView, QAbstractItemView, QHeaderView
+from learn.deck import Deck, FlashCard
 from learn.pickle import DeckManager
-from gui.deck import QDeck, QFlashCard, QDeckTitleEdit, QFlashCardEdit
+from learn.profiling import Profiler
+from gui.deck import QDeckModel, QDeckTitleEdit, QFlashCardEdit, QFlashCardView
+from learn.render import MathCache
+from gui.QSaveWorker import QSaveWorker
 from copy import copy
-from PySide6.QtCore import Slot
-import PySide6.QtGui
-from learn.pickle import DeckManager
-from learn.quizz import TargetTimeTracker, Scheduler
+from PySide6.QtCore import Slot, QModelIndex
+from learn.pickle import OperationHistorian
+from learn.pickle.OperationHistorian import Operation, OperationGroup, MoveCards, RemoveCards, AddCards, \
+    EditFlashCard, ToggleEnabled
+from typing import List
 
 
-class QTreeDeck(QTreeWidget):
+class QTreeDeck(QTreeView):
     """
     Tree representing the decks and their flashcards.
 
-    First level elements are QDecks and second are QFlashcards.
+    First level elements are decks and second are flashcards. The tree displays a QDeckModel over the loaded Deck and
+    FlashCard objects: the rows of flashcards are only created when a deck is expanded and scrolled.
 
     Also implements the methods to create, edit, save, delete, copy/cut and paste the tree items.
     Those methods are slots to be connected in QDeckEditor class.
+
+    Edit operations are recorded by OperationHistorian, so they can be undone with the undo and redo slots. Copying
+    isn't an edit: the copied cards are kept out of the history, while cut cards are moved out of their deck by an
+    operation.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
         # Creation of subwidgets
         ##############################
-        self.decks = [QDeck.from_deck(deck) for deck in DeckManager.load()]
+        with Profiler.phase('deck load'):
+            self.decks: List[Deck] = DeckManager.load()
+        with Profiler.phase('tree build'):
+            self.deck_model = QDeckModel(self.decks, self)
+            self.setModel(self.deck_model)
         self.deck_title_editor = QDeckTitleEdit()
         self.card_editor = QFlashCardEdit()
+        self.save_worker = QSaveWorker(self)
 
         # Instance parameters
         ##########################
-        self.setColumnCount(2)
-        self.setHeaderLabels(["Decks", "Next review"])
-        self.insertTopLevelItems(0, self.decks)
+        self.setUniformRowHeights(True)  # Rows height isn't computed for each flashcard
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setStyleSheet("font-size: 16px")
-        self.header().setSectionResizeMode(0, PySide6.QtWidgets.QHeaderView.Stretch)
+        self.header().setSectionResizeMode(0, QHeaderView.Stretch)
         self.header().setStretchLastSection(False)
 
         # Connections and additional variables
         #######################################
-        self.itemDoubleClicked.connect(self.double_click_item)
+        self.doubleClicked.connect(self.double_click_item)
+        self.expanded.connect(self.expand_deck)
         self.has_cut = False
-        self.deck_cut: QDeck = QDeck('')
+        # self.deck_cut: Auxiliary deck of the cut cards
+        self.deck_cut: Deck = Deck('')
+        # self.copied_cards: Copies of the copied cards, pasted if has_cut is False
+        self.copied_cards: List[FlashCard] = []
 
     @Slot()
-    def double_click_item(self, item: QDeck | QFlashCard, column_no: int) -> None:
+    def double_click_item(self, index: QModelIndex) -> None:
         """
         Displays the flashcard if it was double-clicked.
         """
-        if isinstance(item, QFlashCard) and column_no == 0:
-            self.card_editor.viewer.set_card(item, face='both')
-            self.card_editor.viewer.show()
+        item = self.deck_model.item(index)
+        if isinstance(item, FlashCard) and index.column() == 0:
+            viewer = QFlashCardView.get_preview()
+            viewer.set_card(item, face='both')
+            viewer.show()
+
+    @Slot()
+    def expand_deck(self, index: QModelIndex) -> None:
+        """
+        Converts in background the Latex expressions of the opened deck's flashcards.
+        """
+        deck = self.deck_model.item(index)
+        if isinstance(deck, Deck):
+            MathCache.warm([content for card in deck.cards for content in (card.question, card.correction)])
 
     @Slot()
     def remove(self) -> None:
@@ -58,23 +84,20 @@ class QTreeDeck(QTreeWidget):
         Deletes the selected elements at object and file system levels.
         Can only select cards of the same deck or decks.
         """
-        selected: [QFlashCard | QDeck] = self.selectedItems()
+        selected: [FlashCard | Deck] = self.selected_items()
         if not selected or not self.selection_at_same_level():
             return None  # No selection, or cards from different decks, or mix of cards and decks
-        selected: [QFlashCard] | [QDeck]
-        if isinstance(selected[0], QDeck):
+        selected: [FlashCard] | [Deck]
+        if isinstance(selected[0], Deck):
             # Delete decks
             ################
-            selected: [QDeck]
-            for deck in selected:
-                QTreeWidget.takeTopLevelItem(self, self.decks.index(deck))
-                DeckManager.remove(deck)
-                self.decks.remove(deck)
-        elif isinstance(selected[0], QFlashCard):
+            selected: [Deck]
+            OperationHistorian.execute(OperationGroup([QRemoveDeck(self, deck) for deck in selected]))
+        elif isinstance(selected[0], FlashCard):
             # Delete flashcards
             ####################
-            selected: [QFlashCard]
-            DeckManager.remove_cards(selected, selected[0].parent())
+            selected: [FlashCard]
+            OperationHistorian.execute(RemoveCards(selected, self.selected_deck()))
 
     @Slot()
     def copy(self) -> None:
@@ -84,20 +107,22 @@ class QTreeDeck(QTreeWidget):
         If decks are selected, will copy the flashcards they contain.
         If flashcards are selected, they must be from same deck.
 
-        All cut cards are moved in an auxiliary deck
+        Copied cards aren't recorded by OperationHistorian, so undo doesn't empty the clipboard. Cut cards that weren't
+        pasted are removed from the auxiliary deck by an operation, as they're no longer in any deck.
         """
-        selected: [QFlashCard | QDeck] = self.selectedItems()
-        DeckManager.clear(self.deck_cut)
+        selected: [FlashCard | Deck] = self.selected_items()
+        if self.has_cut:
+            OperationHistorian.execute(OperationGroup(self.clear_clipboard() + [QSetCut(self, False)]))
+        self.copied_cards = []
         if not selected or not self.selection_at_same_level():
             return None  # No selection, or cards from different decks, or mix of cards and decks
-        selected: [QFlashCard] | [QDeck]
-        if isinstance(selected[0], QDeck):
+        selected: [FlashCard] | [Deck]
+        if isinstance(selected[0], Deck):
             # Selected: Deck list -> list of cards of the decks
-            selected: [QDeck]
+            selected: [Deck]
             selected = [card for deck in selected for card in deck.cards]
-        selected: [QFlashCard]
-        self.deck_cut.add_cards([copy(card) for card in selected])
-        self.has_cut = False
+        selected: [FlashCard]
+        self.copied_cards = [copy(card) for card in selected]
 
     @Slot()
     def cut(self) -> None:
@@ -109,24 +134,28 @@ class QTreeDeck(QTreeWidget):
 
         All cut cards are moved in an auxiliary deck
         """
-        selected: [QFlashCard | QDeck] = self.selectedItems()
-        DeckManager.clear(self.deck_cut)
+        selected: [FlashCard | Deck] = self.selected_items()
+        operations = self.clear_clipboard()
+        self.copied_cards = []
         if not selected or not self.selection_at_same_level():
+            if operations:
+                OperationHistorian.execute(OperationGroup(operations))
             return None  # No selection, or cards from different decks, or mix of cards and decks
-        selected: [QFlashCard] | [QDeck]
-        if isinstance(selected[0], QFlashCard):
+        selected: [FlashCard] | [Deck]
+        if isinstance(selected[0], FlashCard):
             # Cut flashcards
             ################
-            selected: [QFlashCard]
-            parent: QDeck = selected[0].parent()
-            DeckManager.move_cards(selected, parent, self.deck_cut)
-        elif isinstance(selected[0], QDeck):
+            selected: [FlashCard]
+            operations.append(MoveCards(selected, self.selected_deck(), self.deck_cut, 0))
+        elif isinstance(selected[0], Deck):
             # Cut decks
             ################
-            selected: [QDeck]
-            for deck in selected:
-                DeckManager.move_cards(copy(deck.cards), deck, self.deck_cut)
-        self.has_cut = True
+            selected: [Deck]
+            for ind, deck in enumerate(selected):
+                index = sum(len(cut_deck) for cut_deck in selected[:ind])
+                operations.append(MoveCards(copy(deck.cards), deck, self.deck_cut, index))
+        operations.append(QSetCut(self, True))
+        OperationHistorian.execute(OperationGroup(operations))
 
     @Slot()
     def paste(self) -> None:
@@ -137,22 +166,30 @@ class QTreeDeck(QTreeWidget):
 
         If selected a flashcard, pastes the cards in the same deck after the selected card
         If selected a deck, pastes the cards in the beginning of the deck
+
+        Pasted cards are renamed if their question is already in the deck.
         """
-        selected: [QFlashCard | QDeck] = self.selectedItems()
-        if len(self.deck_cut) == 0 or not selected:
+        indexes = self.selected_indexes()
+        if (len(self.deck_cut) == 0 if self.has_cut else not self.copied_cards) or not indexes:
             return None
         # Index for insertion
         #######################
-        item: QFlashCard | QDeck = selected[0]
-        deck = item if isinstance(item, QDeck) else item.parent()
-        index = 0 if isinstance(item, QDeck) else deck.indexOfChild(item) + 1
+        item: FlashCard | Deck = self.deck_model.item(indexes[0])
+        deck = item if isinstance(item, Deck) else self.deck_model.item(indexes[0].parent())
+        index = 0 if isinstance(item, Deck) else indexes[0].row() + 1
         # Insertion
         #############
         if self.has_cut:
-            DeckManager.move_cards(copy(self.deck_cut.cards), self.deck_cut, deck, index_destination=index)
+            cards = copy(self.deck_cut.cards)
+            # Renamed with edits, so undoing the paste restores the cut cards' questions
+            renames = [EditFlashCard(card, question, card.correction)
+                       for card, question in zip(cards, deck.get_unique_questions(cards)) if question != card.question]
+            OperationHistorian.execute(OperationGroup(renames + [MoveCards(cards, self.deck_cut, deck, index),
+                                                                 QSetCut(self, False)]))
         else:
-            deck.insert_cards(index, [copy(card) for card in self.deck_cut])
-        self.has_cut = False
+            cards = [copy(card) for card in self.copied_cards]
+            deck.rename_duplicate_cards(cards)
+            OperationHistorian.execute(AddCards(cards, deck, index))
 
     @Slot()
     def edit_item(self) -> None:
@@ -164,14 +201,15 @@ class QTreeDeck(QTreeWidget):
         If selected a flashcard, shows the QFlashCardEdit widget
         If selected a deck, shows the QDeckTitleEdit widget
         """
-        if len(self.selectedItems()) == 0:
+        selected: [FlashCard | Deck] = self.selected_items()
+        if len(selected) == 0:
             return None
-        item: QFlashCard | QDeck = self.selectedItems()[0]
-        if isinstance(item, QDeck):
+        item: FlashCard | Deck = selected[0]
+        if isinstance(item, Deck):
             self.deck_title_editor.set_deck(item)
             self.deck_title_editor.show()
-        elif isinstance(item, QFlashCard):
-            target_time_tracker = DeckManager.get_time_tracker(item.parent())
+        elif isinstance(item, FlashCard):
+            target_time_tracker = DeckManager.get_time_tracker(self.selected_deck())
             self.card_editor.set_card(item, target_time_tracker)
             self.card_editor.show()
 
@@ -183,66 +221,171 @@ class QTreeDeck(QTreeWidget):
         If no selection, creates a deck and shows the QDeckTitleEdit widget
         If selected a deck, creates a card in that deck and shows the QFlashCardEdit widget
         """
-        if len(self.selectedItems()) == 0:
+        indexes = self.selected_indexes()
+        if len(indexes) == 0:
             # No selection
             ##################
-            new_item = QDeck('-- Enter deck name --')
-            self.insertTopLevelItem(self.topLevelItemCount(), new_item)
-            self.decks.append(new_item)
+            new_deck = Deck('-- Enter deck name --')
+            OperationHistorian.execute(QAddDeck(self, new_deck))
+            new_index = self.deck_model.deck_index(new_deck)
         else:
             # Selected a Deck
             ##################
-            item: QFlashCard | QDeck = self.selectedItems()[0]
-            parent: QDeck = item if isinstance(item, QDeck) else item.parent()
-            new_item = QFlashCard('-- Enter a question --', '-- Enter a correction --')
-            parent.add_card(new_item)
+            item: FlashCard | Deck = self.deck_model.item(indexes[0])
+            parent: Deck = item if isinstance(item, Deck) else self.deck_model.item(indexes[0].parent())
+            new_card = FlashCard('-- Enter a question --', '-- Enter a correction --')
+            parent.rename_duplicate_cards([new_card])
+            OperationHistorian.execute(AddCards([new_card], parent))
+            new_index = self.deck_model.card_index(new_card, parent)
         self.clearSelection()
-        self.setCurrentItem(new_item)
+        self.setCurrentIndex(new_index)
         self.edit_item()
 
     @Slot()
     def save(self) -> None:
         """
-        Saves the decks and related cards data in the file system
+        Saves the decks and related cards data in the file system, in the background (see QSaveWorker)
         """
-        for deck in self.decks:
-            DeckManager.save(deck)
-        for deck in DeckManager.decks:
-            if deck not in self.decks:
-                DeckManager.delete(deck)
+        keys = set(deck.key for deck in self.decks)
+        deleted = [deck for deck in DeckManager.decks if deck.key not in keys]
+        self.save_worker.save(self.decks, deleted)
 
     @Slot()
     def enable(self):
-        selected: [QFlashCard | QDeck] = self.selectedItems()
+        selected: [FlashCard | Deck] = self.selected_items()
         if not selected or not self.selection_at_same_level():
             return None  # No selection, or cards from different decks, or mix of cards and decks
-        selected: [QFlashCard] | [QDeck]
-        if isinstance(selected[0], QDeck):
+        selected: [FlashCard] | [Deck]
+        if isinstance(selected[0], Deck):
             # Selected: Deck list -> list of cards of the decks
-            selected: [QDeck]
-            decks = selected
+            selected: [Deck]
             selected = [card for deck in selected for card in deck.cards]
-        else:
-            decks = [selected[0].parent()]
-        selected: [QFlashCard]
-        for card in selected:
-            card: QFlashCard
-            card.set_enabled(not card.is_enabled())
-            card.set_next_review_text(card.parent())
-        for deck in decks:
-            deck.set_next_review_text()
+        selected: [FlashCard]
+        OperationHistorian.execute(ToggleEnabled(selected))
+
+    @Slot()
+    def undo(self) -> None:
+        """
+        Reverses the last edit operation
+        """
+        OperationHistorian.undo()
+
+    @Slot()
+    def redo(self) -> None:
+        """
+        Applies again the last undone edit operation
+        """
+        OperationHistorian.redo()
+
+    def clear_clipboard(self) -> [Operation]:
+        """
+        @return: Operations to empty the auxiliary deck of cut cards, to be executed with the next ones
+        """
+        if len(self.deck_cut) == 0:
+            return []
+        return [RemoveCards(copy(self.deck_cut.cards), self.deck_cut)]
+
+    @Slot()
+    def select_card(self, card: FlashCard, deck: Deck) -> None:
+        """
+        Selects a flashcard and scrolls to it. Used to show search results.
+        """
+        index = self.deck_model.card_index(card, deck)
+        self.expand(index.parent())
+        self.clearSelection()
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+
+    @Slot()
+    def refresh_card(self, card: FlashCard, deck: Deck) -> None:
+        """
+        Updates the next review of a flashcard and its deck, after it was reviewed
+        """
+        self.deck_model.refresh_next_review(deck, [card])
+
+    def selected_indexes(self) -> List[QModelIndex]:
+        """
+        @return: Indexes of the selected rows, in column 0
+        """
+        return self.selectionModel().selectedRows(0)
+
+    def selected_items(self) -> List[Deck | FlashCard]:
+        return [self.deck_model.item(index) for index in self.selected_indexes()]
+
+    def selected_deck(self) -> Deck | None:
+        """
+        @return: Deck of the first selected flashcard, or None if no flashcard is selected
+        """
+        indexes = self.selected_indexes()
+        return self.deck_model.item(indexes[0].parent()) if indexes else None
 
     def selection_at_same_level(self) -> bool:
         """
-        @return: True if selected cards from different decks, or mix of cards and decks
+        @return: False if selected cards from different decks, or mix of cards and decks
         """
-        return len(set([item.parent() for item in self.selectedItems()])) == 1
+        return len(set([index.parent().row() for index in self.selected_indexes()])) == 1
+
+
+class QAddDeck(Operation):
+    """
+    Adds a deck at the end of the tree
+    """
+    def __init__(self, tree: QTreeDeck, deck: Deck):
+        self.tree = tree
+        self.deck = deck
+
+    def execute(self):
+        self.tree.deck_model.insert_deck(len(self.tree.decks), self.deck)
+        DeckManager.index.add_deck(self.deck)
+
+    def reverse(self):
+        self.tree.deck_model.remove_deck(self.deck)
+        DeckManager.remove(self.deck)
+
+
+class QRemoveDeck(Operation):
+    """
+    Removes a deck from the tree. Its files are deleted on next save.
+    """
+    def __init__(self, tree: QTreeDeck, deck: Deck):
+        self.tree = tree
+        self.deck = deck
+        # self.index: Index of the deck when it was removed, taken at execution as the other decks of a group can be
+        # removed before
+        self.index: int | None = None
+
+    def execute(self):
+        self.index = self.tree.decks.index(self.deck)
+        self.tree.deck_model.remove_deck(self.deck)
+        DeckManager.remove(self.deck)
+
+    def reverse(self):
+        self.tree.deck_model.insert_deck(self.index, self.deck)
+        DeckManager.index.add_deck(self.deck)
+
+
+class QSetCut(Operation):
+    """
+    Sets whether the auxiliary deck contains cut or copied cards
+    """
+    def __init__(self, tree: QTreeDeck, has_cut: bool):
+        self.tree = tree
+        self.has_cut = has_cut
+        self.old_has_cut = tree.has_cut
+
+    def execute(self):
+        self.tree.has_cut = self.has_cut
+
+    def reverse(self):
+        self.tree.has_cut = self.old_has_cut
 
 
 if __name__ == '__main__':
     from PySide6.QtWidgets import QApplication
+    from config import create_directories
     import sys
 
+    create_directories()
     app = QApplication()
     tree = QTreeDeck()
     tree.show()
@@ -1,11 +1,13 @@
 import sys
-from PySide6.QtCore import Qt, QTimer, Slot, QEvent, QSize
-from PySide6.QtWidgets import QWidget, QApplication, QLabel, QGridLayout, QPushButton, QVBoxLayout, QHBoxLayout
-from PySide6.QtGui import QIcon
-from gui.deck import QFlashCardView, QFlashCard
+from PySide6.QtCore import Qt, QTimer, Slot, Signal, QEvent, QSize
+from PySide6.QtWidgets import QWidget, QApplication, QGridLayout, QPushButton, QVBoxLayout, QHBoxLayout
+from PySide6.QtGui import QIcon, QPainter, QColor, QBrush, QFont, QFontMetrics
+from gui.deck import QFlashCardView, PreRenderer
+from learn.deck import FlashCard
 from learn.quizz import Examiner
+from learn.profiling import Profiler
 import os
-from config import icons_directory
+from config import icons_directory, checkpoint_interval
 
 
 class QtExam(QWidget):
@@ -14,7 +16,7 @@ class QtExam(QWidget):
 
     The widget is composed of:
     - A web engine view, to display the flashcards
-    - Below, a label displaying the elapsed time
+    - Below, a QElapsedTime widget displaying the elapsed time
     - At the right, 2 buttons to select success or failure for a flashcard
 
     It can be in 3 states:
@@ -23,7 +25,12 @@ class QtExam(QWidget):
     - After-review: Both faces of the flashcard is displaying. The elapsed time is frozen and the buttons are available.
 
     Need to hit space-bar to switch states. For the last state, need to push a button to go in-review again.
+
+    While the widget is shown, the session is checkpointed every checkpoint_interval milliseconds (config.py), besides
+    the checkpoints written by the examiner at each answer (see Examiner.save_checkpoint).
     """
+    # card_returned: Emitted with the flashcard and the deck after a flashcard review is recorded
+    card_returned = Signal(object, object)
 
     def __init__(self):
         super().__init__()
@@ -33,9 +40,11 @@ class QtExam(QWidget):
         self.examiner: Examiner | None = None
         # self.timer: Will update the elapsed time regularly
         self.timer = QTimer(self)
-        # self.timer_label: Label to display the elapsed time
-        self.timer_label = QLabel(self)
-        self.timer_label.setStyleSheet("font-size:28px; border-radius: 5px; padding: 3px;")
+        # self.checkpoint_timer: Will write checkpoints of the session regularly
+        self.checkpoint_timer = QTimer(self)
+        self.checkpoint_timer.setInterval(checkpoint_interval)
+        # self.timer_label: Widget to display the elapsed time
+        self.timer_label = QElapsedTime(self)
         # self.exam_panel: The right-side buttons, to select success status after review
         self.buttons = QtPassFailButtons(self.timer_label, button_size=(50, 50))
         # self.card_viewer: QWebEngineView subclass instance to display flashcards
@@ -50,6 +59,8 @@ class QtExam(QWidget):
         # Setting connections
         ##############################
         self.timer.timeout.connect(self.update_time)
+        self.checkpoint_timer.timeout.connect(self.save_checkpoint)
+        self.card_viewer.card_painted.connect(self.card_painted)
         self.buttons.win.clicked.connect(self.set_pass)
         self.buttons.fail.clicked.connect(self.set_fail)
         self.buttons.win.hide()
@@ -59,13 +70,14 @@ class QtExam(QWidget):
         ##############################
         # self.success: Holds the success status for a flashcard
         self.success: bool | None = None
-        self.card: QFlashCard | None = None
+        self.card: FlashCard | None = None
 
     def set_examiner(self, examiner: Examiner) -> None:
         """
         Sets the examiner for the flashcard review session. Needs to be used before
         """
         self.examiner = examiner
+        self.checkpoint_timer.start()
 
     def keyPressEvent(self, event) -> None:
         """
@@ -86,9 +98,10 @@ class QtExam(QWidget):
         When the widget is closed, resets it the 'initial' state
         """
         self.timer.stop()
-        self.timer_label.setText('')
-        self.timer_label.setStyleSheet("font-size:28px; border-radius: 5px; padding: 3px;")
+        self.checkpoint_timer.stop()
+        self.timer_label.clear()
         self.examiner.end()
+        PreRenderer.cancel()
         self.card_viewer.reset()
         for button in [self.buttons.win, self.buttons.fail]:
             button.hide()
@@ -106,8 +119,7 @@ class QtExam(QWidget):
         """
         if self.buttons.fail.isDown() or self.buttons.win.isDown():
             self.examiner.return_card(self.card, self.buttons.win.isDown())
-            self.card.set_next_review_text(self.examiner.deck)
-            self.examiner.deck.set_next_review_text()
+            self.card_returned.emit(self.card, self.examiner.deck)
         self.card = self.examiner.pick_card()
         self.card_viewer.set_card(self.card, face='front')
         self.timer.start(100)
@@ -115,6 +127,20 @@ class QtExam(QWidget):
             button.hide()
             button.setDown(False)
 
+    @Slot()
+    def save_checkpoint(self) -> None:
+        if self.examiner is not None:
+            self.examiner.save_checkpoint()
+
+    @Slot()
+    def card_painted(self) -> None:
+        """
+        Starts the response time when the picked flashcard is visible. See Examiner.card_displayed.
+        """
+        Profiler.mark('first card render')
+        if self.examiner is not None and self.examiner.has_picked_card():
+            self.examiner.card_displayed()
+
     def flip_card(self) -> None:
         """
         Used to flip a flashcard when review is finished -> 'After-review' state
@@ -135,24 +161,16 @@ class QtExam(QWidget):
 
         If the flashcard has a target response time, the background of the timer will get more red as it's value gets
         close to the target time. Else, the background will not change.
+
+        After a minute, the time is displayed in seconds and updated every second instead of every 100ms.
         """
-        # Setting timer background value
-        ##################################
-        # duration: Elapsed time in seconds since the flashcard was picked
+        # duration: Elapsed time in seconds since the flashcard was displayed
         duration: float = self.examiner.get_duration()
-        self.timer_label.setText("%.1fs" % duration)
-
-        # Setting timer background style
-        #################################
         target_time: float = self.examiner.time_tracker.get_target_time(self.card)
-        if target_time is not None:  # If target time is set
-            # noinspection PyTypeChecker
-            alpha = min(1, duration / target_time)
-            red = int(alpha * 255)
-            self.timer_label.setStyleSheet("background-color: rgba(%d,0,0,%.1f); font-size:28px; border-radius: 5px; "
-                                           "padding: 3px;" % (red, alpha))
-        else:  # If not target time
-            self.timer_label.setStyleSheet("font-size:28px; border-radius: 5px; padding: 3px;")
+        self.timer_label.set_time(duration, target_time)
+        interval = 100 if duration < 60 else 1000
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
 
     @Slot()
     def set_pass(self) -> None:
@@ -174,7 +192,7 @@ class QtPassFailButtons(QWidget):
     - Shift+Enter: Fail
     """
 
-    def __init__(self, timer: QLabel, button_size=(50, 50), parent=None):
+    def __init__(self, timer: QWidget, button_size=(50, 50), parent=None):
         super().__init__(parent=parent)
         # Creating subwidgets
         ##############################
@@ -207,3 +225,64 @@ class QPassFailButton(QPushButton):
         icon_path = os.path.join(icons_directory, icon_file)
         self.setIcon(QIcon(icon_path))
         self.setIconSize(QSize(size[0] // 2, size[1] // 2))
+
+
+class QElapsedTime(QWidget):
+    """
+    Displays the elapsed time of a flashcard review, on a background getting more red as it gets close to the target
+    time.
+
+    The widget is painted directly, with brushes created once for each of the 11 background levels: setting the time
+    only repaints the widget if the displayed text or background changed.
+    """
+    # brushes: Background brushes, from transparent (no time elapsed) to red (target time reached)
+    brushes: [QBrush] = []
+    levels = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        if not QElapsedTime.brushes:
+            QElapsedTime.brushes = [QBrush(QColor(int(255 * level / QElapsedTime.levels), 0, 0,
+                                                  int(255 * level / QElapsedTime.levels)))
+                                    for level in range(QElapsedTime.levels + 1)]
+        self.text_font = QFont(self.font())
+        self.text_font.setPixelSize(28)
+        metrics = QFontMetrics(self.text_font)
+        self.setMinimumSize(metrics.horizontalAdvance('0000.0s') + 6, metrics.height() + 6)
+        # self.text: Displayed time
+        self.text = ''
+        # self.level: Index of the background brush, or None for no background
+        self.level: int | None = None
+
+    def set_time(self, duration: float, target_time: float | None) -> None:
+        """
+        @param duration: Elapsed time in seconds
+        @param target_time: Target time in seconds of the flashcard, or None
+        """
+        text = "%.1fs" % duration if duration < 60 else "%ds" % duration
+        level = None
+        if target_time:
+            level = round(min(1, duration / target_time) * QElapsedTime.levels)
+        if text != self.text or level != self.level:
+            self.text, self.level = text, level
+            self.update()
+
+    def clear(self) -> None:
+        self.text, self.level = '', None
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        return self.minimumSize()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        if self.level:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QElapsedTime.brushes[self.level])
+            painter.drawRoundedRect(self.rect(), 5, 5)
+        if self.text:
+            painter.setPen(self.palette().windowText().color())
+            painter.setFont(self.text_font)
+            painter.drawText(self.rect(), Qt.AlignCenter, self.text)
+        painter.end()
@@ -1,3 +1,5 @@
 from .QtExam import QtExam
+from .QSaveWorker import QSaveWorker
 from .QTreeDeck import QTreeDeck
+from .QDeckSearch import QDeckSearch
 from .QDeckEditor import QDeckEditor
@@ -0,0 +1,115 @@
+from config import prerender_processes, prerender_batch_size
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
+import multiprocessing
+import threading
+from learn.deck import FlashCard
+from learn.render import format_contents, markup_pattern
+from gui.deck import RenderCache
+from gui.deck.flash_card_html import get_content_key
+
+
+class PreRenderer:
+    """
+    Parses flashcards' questions and corrections with format_content in advance, in a pool of prerender_processes
+    processes (config.py), to fill RenderCache. Then displaying a card during an exam doesn't wait for the formatting
+    of its LaTeX and code.
+
+    - Call add(cards) to queue the questions and corrections of cards, in order. Plain texts and contents already in
+    cache are skipped. With priority=True, the cards are parsed before the already queued ones, and the queue is kept
+    otherwise.
+    - Call cancel() to empty the queue. Batches already sent to the processes still fill the cache.
+
+    Contents are sent to the processes in batches of prerender_batch_size, and only a few batches at a time, so that
+    cards added with priority don't wait for the rest of the queue.
+    The pool is created on first use, and closed with shutdown(). Its processes are spawned, not forked from the app
+    with its Qt threads, and only import learn.render to run format_contents.
+    """
+    executor: ProcessPoolExecutor | None = None
+    # queue: Contents to parse, as (key, content), the next one first
+    queue: Deque[Tuple[str, str]] = deque()
+    # queued: Keys of the contents in queue or being parsed
+    queued: Set[str] = set()
+    # running: Keys of the contents of the batches sent to the processes
+    running: Dict[Future, List[str]] = {}
+    max_running: int = 2 * prerender_processes
+    lock = threading.RLock()
+
+    @staticmethod
+    def add(cards: [FlashCard], priority: bool = False) -> None:
+        """
+        Queues the questions and corrections of the cards, in order.
+        @param priority: If True, the cards are parsed before the already queued cards
+        """
+        contents = []
+        with PreRenderer.lock:
+            for card in cards:
+                for content in (card.question, card.correction):
+                    if markup_pattern.search(content) is None:
+                        continue  # Plain text, not parsed
+                    key = get_content_key(content)
+                    if key not in PreRenderer.queued and not RenderCache.contains(key):
+                        PreRenderer.queued.add(key)
+                        contents.append((key, content))
+            if priority:
+                PreRenderer.queue.extendleft(reversed(contents))
+            else:
+                PreRenderer.queue.extend(contents)
+            PreRenderer.submit()
+
+    @staticmethod
+    def submit() -> None:
+        """
+        Sends batches of the queue to the processes, up to max_running batches at a time.
+        """
+        with PreRenderer.lock:
+            while PreRenderer.queue and len(PreRenderer.running) < PreRenderer.max_running:
+                if PreRenderer.executor is None:
+                    PreRenderer.executor = ProcessPoolExecutor(max_workers=prerender_processes,
+                                                               mp_context=multiprocessing.get_context('spawn'))
+                batch = [PreRenderer.queue.popleft()
+                         for _ in range(min(prerender_batch_size, len(PreRenderer.queue)))]
+                future = PreRenderer.executor.submit(format_contents, [content for _, content in batch])
+                PreRenderer.running[future] = [key for key, _ in batch]
+                future.add_done_callback(PreRenderer.batch_done)
+
+    @staticmethod
+    def batch_done(future: Future) -> None:
+        """
+        Called in a thread of the pool when a batch is parsed: adds it to RenderCache and sends the next batch.
+        """
+        with PreRenderer.lock:
+            keys = PreRenderer.running.pop(future, [])
+            PreRenderer.queued.difference_update(keys)
+            if not future.cancelled() and future.exception() is None:
+                for key, html in zip(keys, future.result()):
+                    RenderCache.put(key, html)
+            # A card that can't be parsed is parsed again on display, where the error is raised
+            if PreRenderer.executor is not None:
+                PreRenderer.submit()
+
+    @staticmethod
+    def cancel() -> None:
+        """
+        Empties the queue.
+        """
+        with PreRenderer.lock:
+            PreRenderer.queued.difference_update(key for key, _ in PreRenderer.queue)
+            PreRenderer.queue.clear()
+
+    @staticmethod
+    def is_running() -> bool:
+        with PreRenderer.lock:
+            return bool(PreRenderer.queue or PreRenderer.running)
+
+    @staticmethod
+    def shutdown(wait: bool = False) -> None:
+        """
+        Cancels the queue and closes the processes.
+        """
+        with PreRenderer.lock:
+            PreRenderer.cancel()
+            executor, PreRenderer.executor = PreRenderer.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,349 @@
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt, QTimer, Slot
+from PySide6.QtGui import QBrush, QColor
+from learn.deck import Deck, FlashCard
+from learn.pickle import DeckManager
+from learn.quizz import ReviewAggregate
+from typing import Dict, List
+
+
+class QDeckModel(QAbstractItemModel):
+    """
+    Model of the decks' tree displayed by QTreeDeck, over Deck and FlashCard objects.
+
+    First level rows are the decks and second level rows are their flashcards. Column 0 is the deck's title or the
+    card's question, and column 1 is the number of days until next review.
+
+    No Qt item is created for the flashcards:
+    - The rows of a deck's flashcards are created by the view when needed, fetch_size at a time (see canFetchMore and
+    fetchMore). Only the first ones exist until the deck is scrolled.
+    - The next review column is computed for all the cards of a deck at once when one of its rows is displayed (see
+    DeckManager.get_next_reviews), and cached until refresh_next_review.
+    - The deck's next review and due count are read from a ReviewAggregate, updated card by card on each change.
+
+    The model is an observer of its decks (see Deck class), so the edits done with Deck and DeckManager methods (moves,
+    removals, card edits...) are displayed. Decks are added to and removed from the tree with insert_deck and
+    remove_deck.
+    """
+    # fetch_size: Number of flashcard rows created at once
+    fetch_size = 256
+    headers = ("Decks", "Next review")
+    disabled_brush = QBrush(QColor.fromRgb(160, 160, 160, 255), Qt.SolidPattern)
+    late_brush = QBrush(QColor.fromRgb(255, 0, 0, 127), Qt.SolidPattern)
+
+    def __init__(self, decks: List[Deck], parent=None):
+        """
+        @param decks: Decks of the tree. The list is modified by insert_deck and remove_deck.
+        """
+        super().__init__(parent)
+        self.decks = decks
+        # self.root: Internal pointer of the decks' indexes. The flashcards' indexes point to their deck.
+        self.root = object()
+        # self.fetched: Dictionary between deck key and number of flashcard rows created
+        self.fetched: Dict[str, int] = {}
+        # self.card_review_days: Dictionary between deck key and days until next review of the deck's cards, by key
+        self.card_review_days: Dict[str, Dict[str, int | None]] = {}
+        # self.aggregates: Dictionary between deck key and next reviews aggregate of its enabled cards
+        self.aggregates: Dict[str, ReviewAggregate] = {}
+        # self.changed_decks: Dictionary between key of the decks whose rows changed and changed column (None if all)
+        self.changed_decks: Dict[str, int | None] = {}
+        self.changes_timer = QTimer(self)
+        self.changes_timer.setSingleShot(True)
+        self.changes_timer.setInterval(0)
+        self.changes_timer.timeout.connect(self.flush_changes)
+        # self.inserting, self.removing: True while rows are inserted or removed. Views may ask for more rows meanwhile.
+        self.inserting = False
+        self.removing = False
+        for deck in self.decks:
+            deck.add_observer(self)
+
+    # Access to items
+    ##################
+    def is_deck_index(self, index: QModelIndex) -> bool:
+        return index.isValid() and index.internalPointer() is self.root
+
+    def item(self, index: QModelIndex) -> Deck | FlashCard | None:
+        """
+        @return: Deck or flashcard of the index, or None if the index is invalid
+        """
+        if not index.isValid():
+            return None
+        if index.internalPointer() is self.root:
+            return self.decks[index.row()]
+        deck: Deck = index.internalPointer()
+        return deck[index.row()] if index.row() < len(deck) else None
+
+    def deck_row(self, deck: Deck) -> int:
+        """
+        @return: Row of the deck, found by key, or -1 if it isn't in the tree
+        """
+        for row, tree_deck in enumerate(self.decks):
+            if tree_deck.key == deck.key:
+                return row
+        return -1
+
+    def deck_index(self, deck: Deck, column: int = 0) -> QModelIndex:
+        row = self.deck_row(deck)
+        return self.createIndex(row, column, self.root) if row != -1 else QModelIndex()
+
+    def card_index(self, card: FlashCard, deck: Deck) -> QModelIndex:
+        """
+        @return: Index of the card in the deck. The rows of the deck are fetched up to the card.
+        """
+        row = next(row for row, deck_card in enumerate(deck.cards) if deck_card is card)
+        parent = self.deck_index(deck)
+        while self.fetched.get(deck.key, 0) <= row:
+            self.fetchMore(parent)
+        return self.index(row, 0, parent)
+
+    # QAbstractItemModel methods
+    #############################
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, self.root)
+        return self.createIndex(row, column, self.decks[parent.row()])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid() or index.internalPointer() is self.root:
+            return QModelIndex()
+        return self.deck_index(index.internalPointer())
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self.decks)
+        if self.is_deck_index(parent) and parent.column() == 0:
+            return self.fetched.get(self.decks[parent.row()].key, 0)
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.headers)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if not parent.isValid():
+            return len(self.decks) > 0
+        if self.is_deck_index(parent) and parent.column() == 0:
+            return len(self.decks[parent.row()]) > 0
+        return False
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if self.inserting or self.removing or not self.is_deck_index(parent):
+            return False
+        deck = self.decks[parent.row()]
+        return self.fetched.get(deck.key, 0) < len(deck)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """
+        Creates the next fetch_size rows of flashcards of a deck
+        """
+        if not self.canFetchMore(parent):
+            return
+        deck = self.decks[parent.row()]
+        fetched = self.fetched.get(deck.key, 0)
+        count = min(self.fetch_size, len(deck) - fetched)
+        self.inserting = True
+        self.beginInsertRows(self.deck_index(deck), fetched, fetched + count - 1)
+        self.fetched[deck.key] = fetched + count
+        self.endInsertRows()
+        self.inserting = False
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        item = self.item(index)
+        if item is None:
+            return None
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return item.title if isinstance(item, Deck) else item.question
+            if isinstance(item, FlashCard) and not item.enabled:
+                return ''
+            return self.get_review_text(self.get_review_days(item, index.internalPointer()))
+        if role == Qt.ToolTipRole and isinstance(item, Deck):
+            return '%d card(s) to review' % self.get_aggregate(item).due_count
+        if role == Qt.ForegroundRole:
+            if isinstance(item, FlashCard) and not item.enabled:
+                return self.disabled_brush
+            if index.column() == 1:
+                days = self.get_review_days(item, index.internalPointer())
+                if days is not None and days < 0:
+                    return self.late_brush
+        return None
+
+    # Next review column
+    #####################
+    def get_review_days(self, item: Deck | FlashCard, deck: Deck | object) -> int | None:
+        """
+        @param item: Deck or flashcard of a row
+        @param deck: Deck of the flashcard. Ignored for decks.
+        @return: Days until next review of the flashcard, or minimum of the deck's enabled flashcards. Negative if late.
+        None if not reviewed yet.
+        """
+        if isinstance(item, Deck):
+            return self.get_aggregate(item).get_min()
+        return self.get_cards_review_days(deck)[item.key]
+
+    def get_cards_review_days(self, deck: Deck) -> Dict[str, int | None]:
+        """
+        @return: Dictionary between card key and days until next review, for all the cards of the deck
+        """
+        if deck.key not in self.card_review_days:
+            self.card_review_days[deck.key] = DeckManager.get_next_reviews(deck)
+        return self.card_review_days[deck.key]
+
+    def get_aggregate(self, deck: Deck) -> ReviewAggregate:
+        """
+        @return: Aggregate of the next reviews of the deck's enabled cards. Kept up to date on each card change.
+        """
+        if deck.key not in self.aggregates:
+            card_days = self.get_cards_review_days(deck)
+            self.aggregates[deck.key] = ReviewAggregate({card.key: card_days[card.key] for card in deck if card.enabled})
+        return self.aggregates[deck.key]
+
+    def update_card(self, deck: Deck, card: FlashCard, reviewed: bool = True) -> None:
+        """
+        Updates the days until next review of a card, and its deck's aggregate, if they were computed
+        @param reviewed: False if the card's records didn't change, for instance if it was only enabled or edited
+        """
+        if deck.key not in self.card_review_days:
+            return
+        card_days = self.card_review_days[deck.key]
+        if reviewed or card.key not in card_days:
+            card_days[card.key] = DeckManager.get_next_review_days(card, deck)
+        if deck.key in self.aggregates:
+            if card.enabled:
+                self.aggregates[deck.key].set_days(card.key, card_days[card.key])
+            else:
+                self.aggregates[deck.key].discard(card.key)
+
+    @staticmethod
+    def get_review_text(days: int | None) -> str:
+        if days is None:
+            return ''
+        if days == 0:
+            return 'Today'
+        return str(days) + ' ' + ('days' if abs(days) > 1 else 'day')
+
+    def refresh_next_review(self, deck: Deck, cards: [FlashCard] = None) -> None:
+        """
+        Recomputes the next review column of a deck and some of its cards, for instance after a review
+        @param deck: Deck of the cards
+        @param cards: Cards to refresh. If None, all the cards of the deck are.
+        """
+        if cards is None:
+            self.card_review_days.pop(deck.key, None)
+            self.aggregates.pop(deck.key, None)
+        else:
+            for card in cards:
+                self.update_card(deck, card)
+        self.rows_changed(deck, column=1)
+
+    def rows_changed(self, deck: Deck, column: int | None = None) -> None:
+        """
+        Notifies the views that the deck's row and its flashcard rows changed. Only the displayed ones are repainted.
+        Changes of all the columns are notified at once on next event loop iteration, as cards are often changed by
+        batches (see flush_changes).
+        @param column: Changed column, or None for all columns
+        """
+        if deck.key in self.changed_decks and self.changed_decks[deck.key] != column:
+            column = None
+        self.changed_decks[deck.key] = column
+        if not self.changes_timer.isActive():
+            self.changes_timer.start()
+
+    @Slot()
+    def flush_changes(self) -> None:
+        """
+        Notifies the views of the changes recorded by rows_changed
+        """
+        changed_decks, self.changed_decks = self.changed_decks, {}
+        for deck_key, column in changed_decks.items():
+            first_column, last_column = (0, len(self.headers) - 1) if column is None else (column, column)
+            row = next((row for row, deck in enumerate(self.decks) if deck.key == deck_key), -1)
+            if row == -1:
+                continue
+            parent = self.index(row, 0)
+            self.dataChanged.emit(self.index(row, first_column), self.index(row, last_column))
+            fetched = self.fetched.get(deck_key, 0)
+            if fetched:
+                self.dataChanged.emit(self.index(0, first_column, parent), self.index(fetched - 1, last_column, parent))
+
+    # Edition of the decks list
+    ############################
+    def insert_deck(self, row: int, deck: Deck) -> None:
+        self.inserting = True
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.decks.insert(row, deck)
+        deck.add_observer(self)
+        self.endInsertRows()
+        self.inserting = False
+
+    def remove_deck(self, deck: Deck) -> None:
+        row = self.deck_row(deck)
+        self.removing = True
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.decks[row]
+        deck.remove_observer(self)
+        self.fetched.pop(deck.key, None)
+        self.card_review_days.pop(deck.key, None)
+        self.aggregates.pop(deck.key, None)
+        self.endRemoveRows()
+        self.removing = False
+
+    # Deck observer methods (see Deck class)
+    #########################################
+    def card_about_to_be_inserted(self, deck: Deck, index: int) -> None:
+        fetched = self.fetched.get(deck.key, 0)
+        # The inserted card has a row if it's among the fetched ones, or after them if all were fetched
+        self.inserting = index < fetched or fetched == len(deck)
+        if self.inserting:
+            self.beginInsertRows(self.deck_index(deck), index, index)
+
+    def card_inserted(self, deck: Deck, index: int) -> None:
+        if self.inserting:
+            self.fetched[deck.key] = self.fetched.get(deck.key, 0) + 1
+            self.endInsertRows()
+            self.inserting = False
+        self.update_card(deck, deck[index])
+        self.rows_changed(deck, column=1)
+
+    def card_about_to_be_removed(self, deck: Deck, index: int) -> None:
+        if deck.key in self.aggregates:
+            self.aggregates[deck.key].discard(deck[index].key)
+        self.removing = index < self.fetched.get(deck.key, 0)
+        if self.removing:
+            self.beginRemoveRows(self.deck_index(deck), index, index)
+
+    def card_removed(self, deck: Deck, index: int) -> None:
+        if self.removing:
+            self.fetched[deck.key] -= 1
+            self.endRemoveRows()
+            self.removing = False
+        self.rows_changed(deck, column=1)
+
+    def card_changed(self, deck: Deck, card: FlashCard) -> None:
+        self.update_card(deck, card, reviewed=False)
+        # The card's row isn't searched: the displayed rows of the deck are repainted
+        self.rows_changed(deck)
+
+    def deck_changed(self, deck: Deck) -> None:
+        self.dataChanged.emit(self.deck_index(deck, 0), self.deck_index(deck, len(self.headers) - 1))
+
+    def deck_about_to_be_reset(self, deck: Deck) -> None:
+        self.removing = True
+        self.beginResetModel()
+
+    def deck_reset(self, deck: Deck) -> None:
+        self.fetched.pop(deck.key, None)
+        self.card_review_days.pop(deck.key, None)
+        self.aggregates.pop(deck.key, None)
+        self.endResetModel()
+        self.removing = False
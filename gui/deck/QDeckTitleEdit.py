@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLineEdit
 from PySide6.QtCore import Slot
-from gui.deck import QDeck
+from learn.deck import Deck
+from learn.pickle import OperationHistorian
+from learn.pickle.OperationHistorian import EditDeckTitle
 
 
 class QDeckTitleEdit(QWidget):
@@ -19,13 +21,13 @@ class QDeckTitleEdit(QWidget):
         # Buttons
         self.save_button.clicked.connect(self.save)
 
-    def set_deck(self, deck: QDeck):
+    def set_deck(self, deck: Deck):
         self.deck = deck
         self.title.setText(self.deck.title)
 
     @Slot()
     def save(self):
-        self.deck.setText(0, self.title.text())
+        OperationHistorian.execute(EditDeckTitle(self.deck, self.title.text()))
         self.hide()
 
 
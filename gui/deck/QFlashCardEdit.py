@@ -1,7 +1,10 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel
 from PySide6.QtCore import Qt, Slot
-from gui.deck import QFlashCardView, QFlashCard
+from gui.deck import QFlashCardView, PreRenderer
+from learn.deck import FlashCard
 from learn.quizz import TargetTimeTracker
+from learn.pickle import OperationHistorian
+from learn.pickle.OperationHistorian import EditFlashCard
 
 
 class QFlashCardEdit(QWidget):
@@ -10,9 +13,8 @@ class QFlashCardEdit(QWidget):
     """
     def __init__(self, parent=None):
         super().__init__(parent=parent)
-        self.card: QFlashCard | None = None
+        self.card: FlashCard | None = None
         self.target_time_tracker: TargetTimeTracker | None = None
-        self.viewer = QFlashCardView()
         self.layout = QVBoxLayout(self)
         # Header with target time and card key
         #######################################
@@ -54,7 +56,7 @@ class QFlashCardEdit(QWidget):
         self.preview_button.clicked.connect(self.preview)
         self.reset_target_time_button.clicked.connect(self.reset_target_time)
 
-    def set_card(self, card: QFlashCard, target_time_tracker: TargetTimeTracker):
+    def set_card(self, card: FlashCard, target_time_tracker: TargetTimeTracker):
         self.card = card
         self.target_time_tracker = target_time_tracker
         self.question.setPlainText(card.question)
@@ -75,11 +77,13 @@ class QFlashCardEdit(QWidget):
 
     @Slot()
     def save(self):
-        self.card.setText(0, self.question.toPlainText())
-        self.card.correction = self.correction.toPlainText()
+        OperationHistorian.execute(EditFlashCard(self.card, self.question.toPlainText(),
+                                                 self.correction.toPlainText()))
         self.target_time_tracker.save()
+        PreRenderer.add([self.card], priority=True)
 
     @Slot()
     def preview(self):
-        self.viewer.set_card(self.card, face='both')
-        self.viewer.show()
+        viewer = QFlashCardView.get_preview()
+        viewer.set_card(self.card, face='both')
+        viewer.show()
@@ -1,8 +1,11 @@
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtCore import QUrl, QRect
+from PySide6.QtCore import QUrl, QRect, Slot, Signal
 from config import project_directory
-from gui.deck import generate_card_html
+from gui.deck.flash_card_html import generate_card_page, generate_card_content
 from learn.deck import FlashCard
+from learn.profiling import Profiler
+from typing import List
+import json
 
 
 class QFlashCardView(QWebEngineView):
@@ -10,27 +13,81 @@ class QFlashCardView(QWebEngineView):
     Class to display a flashcard's content.
 
     Allows to select the card's faces to display.
+
+    The page (see generate_card_page) is loaded once. Then the flashcard's content is replaced with JavaScript
+    functions of the page, without loading it again, and displaying another face of the same card only changes the
+    style of the question and correction elements.
+    card_painted is emitted once the flashcard set by set_card is painted: the page notifies it by changing its title.
+
+    Each view starts QtWebEngine processes, so views are created on first use: get_preview() returns the window shared
+    to preview flashcards.
     """
+    # card_painted: Emitted when the content of the last call of set_card is painted
+    card_painted = Signal()
+    # preview: Window shared to preview flashcards, created on first call of get_preview
+    preview: 'QFlashCardView | None' = None
+
     def __init__(self, size=(700, 450), parent=None):
         super().__init__(parent)
         self.setObjectName(u"FlashCardViewer")
         self.setGeometry(QRect(0, 0, size[0], size[1]))
-        self.reset()
         self.setWindowTitle("Flashcard view")
+        # self.loaded: True once the page is loaded, and its JavaScript functions can be called
+        self.loaded = False
+        # self.scripts: Scripts waiting for the page to be loaded
+        self.scripts: List[str] = []
+        # self.card: Displayed flashcard, and its displayed question and correction
+        self.card: FlashCard | None = None
+        self.content: (str, str) | None = None
+        # self.paint_id: Number of the last call of set_card, notified by the page when painted
+        self.paint_id = 0
+        self.loadFinished.connect(self.page_loaded)
+        self.titleChanged.connect(self.title_changed)
+        self.setHtml(generate_card_page(), baseUrl=QUrl("file:///" + project_directory))
+        self.reset()
 
     def reset(self):
-        self.setHtml(
-            '<!DOCTYPE html>\
-            <html lang="en">\
-            <head>\
-                <meta charset="UTF-8">\
-            </head>\
-            <body style="position: absolute; left: 50%; top: 50%;">\
-                Press SPACE to start\
-            </body>\
-            </html>'
-        )
+        self.card, self.content = None, None
+        self.run_script('set_message(%s)' % json.dumps("Press SPACE to start"))
 
+    @Profiler.timed
     def set_card(self, card: FlashCard, face='both'):
-        content = generate_card_html(card, face=face)
-        self.setHtml(content, baseUrl=QUrl("file:///" + project_directory))
+        face = face if face in ('front', 'back') else 'both'
+        content = (card.question, card.correction)
+        self.paint_id += 1
+        if card is self.card and content == self.content:
+            self.run_script('set_face(%s, %d)' % (json.dumps(face), self.paint_id))
+        else:
+            question, correction = generate_card_content(card)
+            arguments = (json.dumps(question), json.dumps(correction), json.dumps(face), self.paint_id)
+            self.run_script('set_card(%s, %s, %s, %d)' % arguments)
+            self.card, self.content = card, content
+
+    @staticmethod
+    def get_preview() -> 'QFlashCardView':
+        if QFlashCardView.preview is None:
+            QFlashCardView.preview = QFlashCardView()
+        return QFlashCardView.preview
+
+    def run_script(self, script: str) -> None:
+        """
+        Runs JavaScript code in the page, or once it's loaded.
+        """
+        if self.loaded:
+            self.page().runJavaScript(script)
+        else:
+            self.scripts.append(script)
+
+    @Slot(str)
+    def title_changed(self, title: str) -> None:
+        if title == 'painted %d' % self.paint_id:
+            self.card_painted.emit()
+
+    @Slot(bool)
+    def page_loaded(self, ok: bool) -> None:
+        if not ok or self.loaded:
+            return
+        self.loaded = True
+        for script in self.scripts:
+            self.page().runJavaScript(script)
+        self.scripts = []
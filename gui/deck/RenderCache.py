@@ -0,0 +1,143 @@
+from config import render_cache_size, render_cache_directory, render_cache_disk_size
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from typing import Set
+
+
+class RenderCache:
+    """
+    Cache of the HTML pages of flashcards, generated by generate_card_html (flash_card_html.py), and of their
+    questions and corrections parsed by format_content (see format_cached).
+
+    Pages are stored by key, a digest of the question, the correction, the displayed face and the template version
+    (see get_key). Parsed questions and corrections are stored with the face 'content'.
+    An edited card gets new keys, so the cache doesn't need to be invalidated: the pages of the old content are just
+    not used anymore, and evicted with time.
+
+    There are 2 tiers:
+    - In memory: the render_cache_size (config.py) most recently used pages
+    - On disk: one file per page in render_cache_directory (config.py), kept between sessions. The least recently
+    written files are deleted above render_cache_disk_size files. Disabled if render_cache_directory is None.
+
+    Methods can be called from several threads.
+    """
+    # entries: Pages in memory by key, the least recently used first
+    entries: OrderedDict = OrderedDict()
+    max_entries: int = render_cache_size
+    directory: str | None = render_cache_directory
+    max_disk_entries: int = render_cache_disk_size
+    # disk_keys: Keys of the pages on disk. None until the directory is listed.
+    disk_keys: Set[str] | None = None
+    lock = threading.RLock()
+    # Statistics
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def get_key(question: str, correction: str, face: str, version: str) -> str:
+        """
+        @param face: Displayed face(s): 'front', 'back' or 'both'
+        @param version: Version of the template and of the formatting functions
+        @return: Key of the flashcard page
+        """
+        content = '\0'.join([version, face, question, correction])
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def get(key: str) -> str | None:
+        """
+        @return: The page with this key, from memory or disk, or None if it isn't in cache
+        """
+        with RenderCache.lock:
+            if key in RenderCache.entries:
+                RenderCache.entries.move_to_end(key)
+                RenderCache.hits += 1
+                return RenderCache.entries[key]
+            if RenderCache.directory is not None and key in RenderCache.get_disk_keys():
+                try:
+                    with open(os.path.join(RenderCache.directory, key + '.html'), 'r', encoding='utf-8') as file:
+                        html = file.read()
+                except OSError:
+                    RenderCache.disk_keys.discard(key)
+                else:
+                    RenderCache.hits += 1
+                    RenderCache.put(key, html, write=False)
+                    return html
+            RenderCache.misses += 1
+            return None
+
+    @staticmethod
+    def put(key: str, html: str, write: bool = True) -> None:
+        """
+        Adds a page to the cache.
+        @param write: If False, the page is only kept in memory
+        """
+        with RenderCache.lock:
+            RenderCache.entries[key] = html
+            RenderCache.entries.move_to_end(key)
+            while len(RenderCache.entries) > RenderCache.max_entries:
+                RenderCache.entries.popitem(last=False)
+            if write and RenderCache.directory is not None and key not in RenderCache.get_disk_keys():
+                RenderCache.write(key, html)
+
+    @staticmethod
+    def contains(key: str) -> bool:
+        with RenderCache.lock:
+            return key in RenderCache.entries or \
+                (RenderCache.directory is not None and key in RenderCache.get_disk_keys())
+
+    @staticmethod
+    def get_disk_keys() -> Set[str]:
+        """
+        Lists the pages on disk on first call, and deletes the oldest ones above max_disk_entries.
+        """
+        if RenderCache.disk_keys is None:
+            if not os.path.isdir(RenderCache.directory):
+                os.makedirs(RenderCache.directory)
+            file_names = [name for name in os.listdir(RenderCache.directory) if name.endswith('.html')]
+            RenderCache.disk_keys = set(name[:-len('.html')] for name in file_names)
+            RenderCache.prune()
+        return RenderCache.disk_keys
+
+    @staticmethod
+    def write(key: str, html: str) -> None:
+        path = os.path.join(RenderCache.directory, key + '.html')
+        try:
+            with open(path + '.tmp', 'w', encoding='utf-8') as file:
+                file.write(html)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            return  # The disk tier is only a cache
+        RenderCache.disk_keys.add(key)
+        if len(RenderCache.disk_keys) > RenderCache.max_disk_entries:
+            RenderCache.prune()
+
+    @staticmethod
+    def prune() -> None:
+        """
+        Deletes the least recently written pages on disk, down to 3/4 of max_disk_entries.
+        """
+        if len(RenderCache.disk_keys) <= RenderCache.max_disk_entries:
+            return
+        paths = [os.path.join(RenderCache.directory, key + '.html') for key in RenderCache.disk_keys]
+        paths.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in paths[:len(paths) - RenderCache.max_disk_entries * 3 // 4]:
+            if os.path.exists(path):
+                os.remove(path)
+            RenderCache.disk_keys.discard(os.path.basename(path)[:-len('.html')])
+
+    @staticmethod
+    def clear(disk: bool = False) -> None:
+        """
+        Empties the memory tier, and the disk tier if disk is True.
+        """
+        with RenderCache.lock:
+            RenderCache.entries.clear()
+            if disk and RenderCache.directory is not None:
+                for key in RenderCache.get_disk_keys():
+                    path = os.path.join(RenderCache.directory, key + '.html')
+                    if os.path.exists(path):
+                        os.remove(path)
+                RenderCache.disk_keys = set()
@@ -1,7 +1,8 @@
-from .QFlashCard import QFlashCard
-from .QDeck import QDeck
-from .flash_card_css import write_flashcard_css
+from .QDeckModel import QDeckModel
+from .flash_card_css import write_flashcard_css, get_css_path
+from .RenderCache import RenderCache
 from .flash_card_html import generate_card_html
+from .PreRenderer import PreRenderer
 from .QFlashCardView import QFlashCardView
 from .QFlashCardEdit import QFlashCardEdit
 from .QDeckTitleEdit import QDeckTitleEdit
@@ -1,6 +1,8 @@
 from config import templates_directory
+from functools import lru_cache
+import hashlib
 import os
-from pygments.formatters import HtmlFormatter
+import pygments
 
 start_css = """
 #question {
@@ -23,9 +25,42 @@ start_css = """
 """
 
 
-def write_flashcard_css():
-    with open(os.path.join(templates_directory, 'flashcard.css'), 'w') as file:
-        file.write(start_css + HtmlFormatter().get_style_defs('.highlight'))
+def write_flashcard_css() -> bool:
+    """
+    Writes flashcard.css in templates_directory (config.py), unless it's up to date: its first line is a comment with
+    the version of start_css and pygments it was generated from. So pygments' formatter is only imported when the
+    stylesheet changes.
+    @return: True if the file was written
+    """
+    path = os.path.join(templates_directory, 'flashcard.css')
+    header = '/* %s */\n' % get_css_version()
+    try:
+        with open(path, 'r') as file:
+            if file.readline() == header:
+                return False
+    except OSError:
+        pass
+    from pygments.formatters import HtmlFormatter
+    with open(path + '.tmp', 'w') as file:
+        file.write(header + start_css + HtmlFormatter().get_style_defs('.highlight'))
+    os.replace(path + '.tmp', path)
+    return True
+
+
+def get_css_version() -> str:
+    """
+    @return: Hash of what flashcard.css is generated from
+    """
+    return hashlib.blake2b(('%s\0%s' % (pygments.__version__, start_css)).encode('utf-8'), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_css_path() -> str:
+    """
+    @return: Path of flashcard.css, written on first call if it's not up to date
+    """
+    write_flashcard_css()
+    return os.path.join(templates_directory, 'flashcard.css')
 
 
 if __name__ == '__main__':
@@ -1,28 +1,44 @@
-import bs4.element
-
 from learn.deck import FlashCard
-from jinja2 import Environment, FileSystemLoader
-import latex2mathml.converter
-import re
-from config import templates_directory
+from learn.profiling import Profiler
+from learn.render import format_content, format_version, get_assets_version, markup_pattern
+from config import templates_directory, template_cache_directory
 import os
-from gui.deck import write_flashcard_css
-from bs4 import BeautifulSoup
-from pygments.lexers import get_lexer_by_name
-from pygments.formatters import HtmlFormatter
-from pygments import highlight
-
-
-
-write_flashcard_css()
+import hashlib
+from functools import lru_cache
+from gui.deck import get_css_path, RenderCache
 
 """
 Contains functions to generate HTML string to display flashcards.
-Use generate_card_html(...) to generate the HTML content.
+Use generate_card_html(...) to generate the HTML content, or generate_card_page() and generate_card_content(...) to
+update the content of a loaded page.
+
+Questions and corrections are parsed by format_content (see learn/render/content_html.py), and the results are cached
+in RenderCache. jinja2 is imported on first use, and the template is compiled once per change of its source: its
+bytecode is kept in template_cache_directory (config.py).
 """
 
-environment = Environment(loader=FileSystemLoader(templates_directory))
-template = environment.get_template("flashcard.html")
+
+@lru_cache(maxsize=None)
+def get_template():
+    """
+    @return: The jinja2 template flashcard.html, loaded on first call
+    """
+    from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+    os.makedirs(template_cache_directory, exist_ok=True)
+    environment = Environment(loader=FileSystemLoader(templates_directory),
+                              bytecode_cache=FileSystemBytecodeCache(template_cache_directory))
+    return environment.get_template("flashcard.html")
+
+
+@lru_cache(maxsize=None)
+def get_template_version() -> str:
+    """
+    @return: Version of the pages in RenderCache, from the template source and format_version
+    """
+    with open(os.path.join(templates_directory, "flashcard.html"), 'r', encoding='utf-8') as file:
+        source = file.read()
+    return hashlib.blake2b(('%d\0%s\0%s' % (format_version, templates_directory, source)).encode('utf-8'),
+                           digest_size=8).hexdigest()
 
 
 def generate_card_html(card: FlashCard, face: str = 'both') -> str:
@@ -39,79 +55,70 @@ def generate_card_html(card: FlashCard, face: str = 'both') -> str:
     Question and response are wrapped in HTML div tags, and can contain HTML elements, and some of their content is
     parsed by function format_content.
 
+    Pages are cached by content in RenderCache, so displaying again a card, or its other face, doesn't format it again.
+
     @param card: Flashcard to generate HTML for
     @param face: Can have 'front', 'back' or other values
     @return: HTML string of the Flashcard
     """
-    display_question = 'none' if face == 'back' else 'block'
-    display_correction = 'none' if face == 'front' else 'block'
-    content = template.render(question=format_content(card.question),
-                              correction=format_content(card.correction),
-                              display_question=display_question,
-                              display_correction=display_correction,
-                              css_file_path=os.path.join(templates_directory, "flashcard.css"))
+    face = face if face in ('front', 'back') else 'both'
+    key = get_render_key(card.question, card.correction, face)
+    content = RenderCache.get(key)
+    if content is None:
+        question, correction = generate_card_content(card)
+        content = get_template().render(question=question,
+                                  correction=correction,
+                                  display_question='none' if face == 'back' else 'block',
+                                  display_correction='none' if face == 'front' else 'block',
+                                  css_file_path=get_css_path())
+        RenderCache.put(key, content)
     return content
 
 
-def format_content(html) -> str:
+def generate_card_page() -> str:
     """
-    Replaces Latex expressions between $$ and lines beginning with 'file:///', using the functions:
-    - latex_to_mathml
-    - replace_img_paths
-    @param html: HTML file in string format
-    @return: HTML string with MathML formulas and HTML img tags
+    Creates the HTML string of a page without flashcard, whose content is set by the JavaScript functions of the
+    template: set_card(question_html, correction_html, face), set_face(face) and set_message(text).
+    See QFlashCardView.
     """
-    html = latex_to_mathml(html)
-    html = replace_img_paths(html)
-    html = replace_code(html)
-    return html
+    return get_template().render(question='', correction='', display_question='none', display_correction='none',
+                                 css_file_path=get_css_path())
 
 
-def latex_to_mathml(html: str) -> str:
+@Profiler.timed
+def generate_card_content(card: FlashCard) -> (str, str):
     """
-    Replaces Latex expressions between $$ with the corresponding MathML expression
-    @param html: HTML file in string format
-    @return: HTML string with Latex formulas turned to MathML
+    @return: HTML strings of the question and the correction of the flashcard, parsed by format_content
     """
-    html_split = html.split('$$')
-    for ind, chunk in enumerate(html_split):
-        if ind % 2 == 1:
-            html_split[ind] = latex2mathml.converter.convert(chunk)
-    return ''.join(html_split)
+    return format_cached(card.question), format_cached(card.correction)
 
 
-def replace_img_paths(html: str) -> str:
+def format_cached(html: str) -> str:
     """
-    Replaces the lines beginning with 'file:///[Image path]' by the corresponding HTML img tag
-    @param html: HTML file in string format
-    @return: HTML string with the appropriate img tags
+    Parses a question or a correction with format_content. The result is cached by content in RenderCache, except for
+    plain text, which is returned as is.
     """
-    return re.sub("file:///(.+)(\n|$)", r'<img src="\1">', html)
-
-
-def replace_code(html: str):
-    soup = BeautifulSoup(html, "html.parser")
-    tags = soup.findAll(re.compile(".+-code"))
-    tags: [bs4.element.Tag]
-    for tag in tags:
-        language = tag.name.split('-')[0]
-        lexer = get_lexer_by_name(language)
-        res = highlight(tag.text, lexer, HtmlFormatter())
-        tag.replaceWith(BeautifulSoup(res, "html.parser"))
-    return str(soup)
+    if markup_pattern.search(html) is None:
+        return html
+    key = get_content_key(html)
+    content = RenderCache.get(key)
+    if content is None:
+        content = format_content(html)
+        RenderCache.put(key, content)
+    return content
 
 
-if __name__ == '__main__':
+def get_render_key(question: str, correction: str, face: str) -> str:
+    """
+    @param face: 'front', 'back' or 'both'
+    @return: Key of the page in RenderCache
+    """
+    return RenderCache.get_key(question, correction, face,
+                               get_template_version() + get_assets_version(question) + get_assets_version(correction))
 
-    html_ = [
-        '<python-code>',
-        'def myfunc():',
-        '\t' + 'print(1)',
-        '</python-code>',
-        '<dax-code>',
-        'CALENDARAUTO()',
-        '</dax-code>'
-    ]
-    html_ = '\n'.join(html_)
-    print(replace_code(html_))
 
+def get_content_key(html: str) -> str:
+    """
+    @return: Key of the question or correction parsed by format_content in RenderCache
+    """
+    return RenderCache.get_key(html, '', 'content', get_template_version() + get_assets_version(html))
@@ -0,0 +1,96 @@
+"""
+Command line interface of the app, without GUI: it doesn't import PySide6.
+
+python -m learn list
+    Lists the decks, with their number of cards, of enabled cards and of cards to review
+python -m learn exam "Deck title" [--due]
+    Reviews the enabled cards of the deck in the terminal (see TerminalExam). The session is journaled, so it's resumed
+    if interrupted (see ExamCheckpoint). With --due, only the cards to review are picked.
+python -m learn exam "Deck title" --script answers.txt [--dry-run]
+    Replays the answers of the file, one per picked card (see TerminalExam.read_answers). '-' reads them from the
+    standard input. With --dry-run, the deck isn't saved, for instance for load tests.
+Decks are found by title or key, and saved with DeckManager.
+"""
+from config import create_directories
+from learn.deck import Deck, DeckView
+from learn.pickle import DeckManager
+from learn.quizz import Examiner, TerminalExam
+from typing import List
+import argparse
+import sys
+import time
+
+
+def find_deck(decks: List[Deck], name: str) -> Deck:
+    """
+    @param name: Title or key of the deck
+    """
+    found = [deck for deck in decks if deck.key == name] or [deck for deck in decks if deck.title == name]
+    if not found:
+        raise SystemExit("No deck '%s'. See: python -m learn list" % name)
+    if len(found) > 1:
+        raise SystemExit("Several decks are titled '%s', use their key instead. See: python -m learn list" % name)
+    return found[0]
+
+
+def get_exam_view(deck: Deck, due: bool) -> DeckView:
+    """
+    @return: View of the enabled cards of the deck, and only the cards to review if due is True
+    """
+    if not due:
+        return DeckView(deck, None, lambda card: card.enabled)
+    due_view = DeckView.due(deck, DeckManager.get_historian(deck), DeckManager.get_scheduler(deck))
+    return DeckView(deck, None, lambda card: card.enabled and due_view.is_selected(card))
+
+
+def list_decks(decks: List[Deck]) -> None:
+    print('%-36s  %-40s %8s %8s %10s' % ('Key', 'Title', 'Cards', 'Enabled', 'To review'))
+    for deck in sorted(decks, key=lambda deck_: deck_.title):
+        enabled = sum(1 for card in deck if card.enabled)
+        print('%-36s  %-40s %8d %8d %10d' % (deck.key, deck.title, len(deck), enabled, len(get_exam_view(deck, True))))
+
+
+def exam(deck: Deck, due: bool, script: str | None, dry_run: bool) -> None:
+    view = get_exam_view(deck, due)
+    if len(view) == 0:
+        raise SystemExit("No card to review in deck '%s'" % deck.title)
+    examiner = Examiner(view, DeckManager.get_historian(deck), DeckManager.get_time_tracker(deck),
+                        DeckManager.get_scheduler(deck), checkpoint=script is None)
+    terminal_exam = TerminalExam(examiner)
+    if script is None:
+        reviewed = terminal_exam.run()
+        print('\nReviewed %d cards' % reviewed)
+    else:
+        if script == '-':
+            answers = TerminalExam.read_answers(sys.stdin)
+        else:
+            with open(script, 'r') as file:
+                answers = TerminalExam.read_answers(file)
+        start = time.perf_counter()
+        reviewed = terminal_exam.replay(answers)
+        duration = time.perf_counter() - start
+        print("Replayed %d answers on deck '%s' in %.2fs (%.2f ms per card)" % (
+            reviewed, deck.title, duration, 1000 * duration / reviewed if reviewed else 0), file=sys.stderr)
+    if not dry_run:
+        DeckManager.save(deck)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m learn', description='Flashcards without GUI')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='Lists the decks')
+    exam_parser = commands.add_parser('exam', help='Reviews a deck in the terminal, or replays scripted answers')
+    exam_parser.add_argument('deck', help='Title or key of the deck')
+    exam_parser.add_argument('--due', action='store_true', help='Only picks the cards to review')
+    exam_parser.add_argument('--script', default=None,
+                             help="File of answers to replay, one per line: 'pass' or 'fail', and an optional "
+                                  "duration in seconds. '-' for the standard input")
+    exam_parser.add_argument('--dry-run', action='store_true', help="Doesn't save the deck")
+    args = parser.parse_args()
+
+    create_directories()
+    loaded_decks = DeckManager.load()
+    if args.command == 'list':
+        list_decks(loaded_decks)
+    else:
+        exam(find_deck(loaded_decks, args.deck), args.due, args.script, args.dry_run)
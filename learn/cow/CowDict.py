@@ -0,0 +1,138 @@
+from collections.abc import MutableMapping
+from itertools import count
+from typing import Any, Dict, Iterator, List
+
+
+class CowDict(MutableMapping):
+    """
+    Dictionary stored in shards, with copy-on-write snapshots.
+
+    Like CowList, snapshot() returns in O(1) a frozen view of the dictionary, and a change copies the shard of its key
+    if the shard is shared with a snapshot. Keys are distributed in the shards by hash. The number of shards is doubled
+    when they contain more than 2 * shard_size keys on average, so the copy of a shard stays small.
+
+    Keys are iterated shard by shard, not in insertion order.
+    """
+    shard_size = 256
+    # generations: Generation numbers, never given twice (see CowList)
+    generations = count()
+
+    def __init__(self, items=()) -> None:
+        # self.frozen: True for snapshots, which can't be changed
+        self.frozen = False
+        self.set_items(dict(items))
+
+    def set_items(self, items: Dict) -> None:
+        """
+        Replaces the items of the dictionary, without changing the shards shared with snapshots.
+        """
+        self.check_not_frozen()
+        shard_count = 1
+        while shard_count * CowDict.shard_size < len(items):
+            shard_count *= 2
+        # self.shards: Dictionaries of the items, by hash of their key modulo the number of shards
+        self.shards: List[Dict] = [{} for _ in range(shard_count)]
+        for key, value in items.items():
+            self.shards[hash(key) & (shard_count - 1)][key] = value
+        self.generation = next(CowDict.generations)
+        # self.shard_generations: Generation in which each shard was created or copied
+        self.shard_generations: List[int] = [self.generation] * shard_count
+        # self.shared: True if the lists shards and shard_generations are shared, and must be copied before a change
+        self.shared = False
+        self.length = len(items)
+
+    def snapshot(self) -> 'CowDict':
+        """
+        @return: Frozen view of the dictionary in its current state
+        """
+        if self.frozen:
+            return self
+        snapshot = CowDict.__new__(CowDict)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.frozen = True
+        self.shared = True
+        self.generation = next(CowDict.generations)
+        return snapshot
+
+    def __copy__(self) -> 'CowDict':
+        duplicate = CowDict.__new__(CowDict)
+        duplicate.__dict__.update(self.__dict__)
+        duplicate.frozen = False
+        duplicate.shared = True
+        duplicate.generation = next(CowDict.generations)
+        if not self.frozen:
+            self.shared = True
+            self.generation = next(CowDict.generations)
+        return duplicate
+
+    def get_changes(self, snapshot: 'CowDict') -> (Dict, List):
+        """
+        Compares the dictionary with one of its snapshots. Only the shards copied since the snapshot are compared,
+        unless the number of shards changed.
+        @return: Items set since the snapshot to a different value, and keys removed since the snapshot
+        """
+        if len(self.shards) == len(snapshot.shards):
+            pairs = [(shard, old_shard) for shard, old_shard in zip(self.shards, snapshot.shards)
+                     if shard is not old_shard]
+        else:
+            pairs = [(dict(self.items()), dict(snapshot.items()))]
+        changed, removed = {}, []
+        for shard, old_shard in pairs:
+            changed.update((key, value) for key, value in shard.items() if key not in old_shard or
+                           old_shard[key] != value)
+            removed.extend(key for key in old_shard if key not in shard)
+        return changed, removed
+
+    def check_not_frozen(self) -> None:
+        if self.frozen:
+            raise TypeError("A snapshot can't be changed")
+
+    def get_shard(self, key) -> Dict:
+        return self.shards[hash(key) & (len(self.shards) - 1)]
+
+    def get_writable_shard(self, key) -> Dict:
+        """
+        @return: The shard of the key, copied first if it's shared with a snapshot or a copy
+        """
+        self.check_not_frozen()
+        if self.shared:
+            self.shards, self.shard_generations = list(self.shards), list(self.shard_generations)
+            self.shared = False
+        shard_no = hash(key) & (len(self.shards) - 1)
+        if self.shard_generations[shard_no] != self.generation:
+            self.shards[shard_no] = dict(self.shards[shard_no])
+            self.shard_generations[shard_no] = self.generation
+        return self.shards[shard_no]
+
+    def __getitem__(self, key) -> Any:
+        return self.get_shard(key)[key]
+
+    def __setitem__(self, key, value: Any) -> None:
+        shard = self.get_writable_shard(key)
+        if key not in shard:
+            self.length += 1
+        shard[key] = value
+        if self.length > 2 * CowDict.shard_size * len(self.shards):
+            self.set_items(dict(self.items()))
+
+    def __delitem__(self, key) -> None:
+        if key not in self.get_shard(key):
+            raise KeyError(key)
+        del self.get_writable_shard(key)[key]
+        self.length -= 1
+
+    def __contains__(self, key) -> bool:
+        return key in self.get_shard(key)
+
+    def get(self, key, default=None) -> Any:
+        return self.get_shard(key).get(key, default)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator:
+        for shard in self.shards:
+            yield from shard
+
+    def __repr__(self) -> str:
+        return 'CowDict(%r)' % dict(self.items())
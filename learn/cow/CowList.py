@@ -0,0 +1,204 @@
+from collections.abc import MutableSequence
+from bisect import bisect_right
+from itertools import count
+from typing import Any, Iterable, Iterator, List
+
+
+class CowList(MutableSequence):
+    """
+    List stored in chunks, with copy-on-write snapshots.
+
+    snapshot() returns in O(1) a frozen view of the list: later changes of the list don't affect it, so it can be read
+    by another thread while the list is edited. The list and its snapshots share their chunks, and a chunk is copied
+    by the first change of the list that touches it after the snapshot. copy(cow_list) also shares the chunks.
+
+    To know which chunks can be changed in place, the list and its chunks have generation numbers: a chunk belongs to
+    the list if it was created or copied in the list's current generation. Each snapshot gives a new generation to the
+    list, so none of its chunks can be changed in place anymore.
+
+    Items are found by index with a bisection of the chunks' offsets. Chunks have between 1 and 2 * chunk_size items.
+    """
+    chunk_size = 512
+    # generations: Generation numbers, never given twice
+    generations = count()
+
+    def __init__(self, items: Iterable = ()) -> None:
+        # self.frozen: True for snapshots, which can't be changed
+        self.frozen = False
+        self.set_items(list(items))
+
+    def set_items(self, items: List) -> None:
+        """
+        Replaces the items of the list, without changing the chunks shared with snapshots.
+        """
+        self.check_not_frozen()
+        size = CowList.chunk_size
+        self.generation = next(CowList.generations)
+        # self.chunks: Lists of consecutive items
+        self.chunks: List[List] = [items[start:start + size] for start in range(0, len(items), size)]
+        # self.chunk_generations: Generation in which each chunk was created or copied
+        self.chunk_generations: List[int] = [self.generation] * len(self.chunks)
+        # self.shared: True if the lists chunks and chunk_generations are shared, and must be copied before a change
+        self.shared = False
+        # self.offsets: Index of the first item of each chunk. None if it needs to be recalculated.
+        self.offsets: List[int] | None = None
+        self.length = len(items)
+
+    def snapshot(self) -> 'CowList':
+        """
+        @return: Frozen view of the list in its current state
+        """
+        if self.frozen:
+            return self
+        snapshot = CowList.__new__(CowList)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.frozen = True
+        self.shared = True
+        self.generation = next(CowList.generations)
+        return snapshot
+
+    def __copy__(self) -> 'CowList':
+        duplicate = CowList.__new__(CowList)
+        duplicate.__dict__.update(self.__dict__)
+        duplicate.frozen = False
+        duplicate.shared = True
+        duplicate.generation = next(CowList.generations)
+        if not self.frozen:
+            self.shared = True
+            self.generation = next(CowList.generations)
+        return duplicate
+
+    def check_not_frozen(self) -> None:
+        if self.frozen:
+            raise TypeError("A snapshot can't be changed")
+
+    def unshare(self) -> None:
+        """
+        Copies the lists of chunks if they're shared, before they're changed. The chunks themselves aren't copied.
+        """
+        self.check_not_frozen()
+        if self.shared:
+            self.chunks, self.chunk_generations = list(self.chunks), list(self.chunk_generations)
+            self.shared = False
+
+    def get_writable_chunk(self, chunk_no: int) -> List:
+        """
+        @return: The chunk, copied first if it's shared with a snapshot or a copy
+        """
+        self.unshare()
+        if self.chunk_generations[chunk_no] != self.generation:
+            self.chunks[chunk_no] = list(self.chunks[chunk_no])
+            self.chunk_generations[chunk_no] = self.generation
+        return self.chunks[chunk_no]
+
+    def get_offsets(self) -> List[int]:
+        if self.offsets is None:
+            offsets, offset = [], 0
+            for chunk in self.chunks:
+                offsets.append(offset)
+                offset += len(chunk)
+            # Replaced instead of updated, since snapshots may share it
+            self.offsets = offsets
+        return self.offsets
+
+    def locate(self, index: int) -> (int, int):
+        """
+        @return: Number of the chunk containing the item at the index, and position of the item in the chunk
+        """
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('CowList index out of range')
+        offsets = self.get_offsets()
+        chunk_no = bisect_right(offsets, index) - 1
+        return chunk_no, index - offsets[chunk_no]
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return list(self)[index]
+        chunk_no, position = self.locate(index)
+        return self.chunks[chunk_no][position]
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self.set_items(items)
+            return
+        chunk_no, position = self.locate(index)
+        self.get_writable_chunk(chunk_no)[position] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.set_items(items)
+            return
+        chunk_no, position = self.locate(index)
+        chunk = self.get_writable_chunk(chunk_no)
+        del chunk[position]
+        if not chunk:
+            del self.chunks[chunk_no]
+            del self.chunk_generations[chunk_no]
+        self.length -= 1
+        self.offsets = None
+
+    def insert(self, index: int, value: Any) -> None:
+        """
+        Inserts the value before the index, like list.insert.
+        """
+        index = min(max(index if index >= 0 else self.length + index, 0), self.length)
+        self.unshare()
+        if not self.chunks:
+            self.chunks.append([])
+            self.chunk_generations.append(self.generation)
+        if index == self.length:
+            chunk_no, position = len(self.chunks) - 1, len(self.chunks[-1])
+        else:
+            chunk_no, position = self.locate(index)
+        chunk = self.get_writable_chunk(chunk_no)
+        chunk.insert(position, value)
+        size = CowList.chunk_size
+        if len(chunk) > 2 * size:
+            self.chunks[chunk_no:chunk_no + 1] = [chunk[:size], chunk[size:]]
+            self.chunk_generations[chunk_no:chunk_no + 1] = [self.generation, self.generation]
+        self.length += 1
+        self.offsets = None
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        items = list(self)
+        items.sort(key=key, reverse=reverse)
+        self.set_items(items)
+
+    def index(self, value: Any, start: int = 0, stop: int | None = None) -> int:
+        if start != 0 or stop is not None:
+            return super().index(value, start, stop)
+        offset = 0
+        for chunk in self.chunks:
+            try:
+                return offset + chunk.index(value)
+            except ValueError:
+                offset += len(chunk)
+        raise ValueError('%r is not in list' % (value,))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator:
+        for chunk in self.chunks:
+            yield from chunk
+
+    def __reversed__(self) -> Iterator:
+        for chunk in reversed(self.chunks):
+            yield from reversed(chunk)
+
+    def __contains__(self, value: Any) -> bool:
+        return any(value in chunk for chunk in self.chunks)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (CowList, list)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return 'CowList(%r)' % list(self)
@@ -0,0 +1,2 @@
+from .CowList import CowList
+from .CowDict import CowDict
@@ -0,0 +1,33 @@
+from learn.deck import FlashCard
+from learn.cow import CowList
+from typing import Dict, Iterator
+
+
+class CardsSnapshot:
+    """
+    Frozen view of the cards of a deck and of their serialized attributes, taken in O(1) by Deck.snapshot().
+
+    The cards are a snapshot of the deck's CowList. The cards themselves aren't copied: before a card of the deck is
+    edited, the deck keeps its former state in its snapshots still in use (see Deck.card_about_to_change). So the
+    snapshot can be read by another thread while the cards are edited, for instance to save the deck.
+    A card removed from the deck is no longer followed: if it's edited afterward, the snapshot reads its new state.
+    """
+    def __init__(self, cards: CowList) -> None:
+        # self.cards: Frozen list of the cards
+        self.cards = cards.snapshot()
+        # self.states: Former serialized attributes of the cards edited since the snapshot, by card id
+        self.states: Dict[int, Dict] = {}
+
+    def get_state(self, card: FlashCard) -> Dict:
+        """
+        @return: Serialized attributes of the card when the snapshot was taken
+        """
+        # The card is read first: if it's edited meanwhile, its former state is already in states
+        state = card.get_state()
+        return self.states.get(id(card), state)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.get_state(card) for card in self.cards)
+
+    def __len__(self) -> int:
+        return len(self.cards)
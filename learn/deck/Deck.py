@@ -1,36 +1,221 @@
-from learn.deck import FlashCard
-from typing import List, Iterator, Callable
+from learn.deck import FlashCard, CardsSnapshot
+from learn.cow import CowList
+from typing import List, Iterator, Callable, Dict
 from copy import copy
 from uuid import uuid4
+import hashlib
+import weakref
 
 
 class Deck:
     """
     A Deck consists a list of FlashCard objects with a title and a unique key.
+
+    A deck has an order-aware hash of its key and its cards' content hashes (see get_cards_hash). It's updated when
+    cards are added, removed or edited. The cards list should only be modified with this class' methods.
+
+    The cards are stored in a CowList, so snapshot() returns in O(1) a frozen view of the cards and their content, to
+    read from another thread.
+
+    A deck also counts its cards' questions, to find duplicates without going through the cards (see
+    rename_duplicate_cards). The counts are built on first use, then updated when cards are added, removed or edited.
+
+    Observers can be added to a deck (see add_observer), to be notified of its changes. For instance, to update a view
+    of the deck. An observer implements these methods, called with the deck as first argument:
+    - card_about_to_be_inserted(deck, index) and card_inserted(deck, index): Before and after a card is inserted
+    - card_about_to_be_removed(deck, index) and card_removed(deck, index): Before and after a card is removed
+    - card_changed(deck, card): After a card of the deck is edited, enabled or disabled
+    - deck_changed(deck): After the title changed
+    - deck_about_to_be_reset(deck) and deck_reset(deck): Before and after the whole cards list is replaced
     """
+    # serialized_attributes: Attributes written in json format (see JSONEncoder)
+    serialized_attributes = ('cards', 'title', 'key')
 
     def __init__(self, title: str, cards: List[FlashCard] = None) -> None:
-        self.cards: List[FlashCard] = [] if cards is None else cards
+        # self.observers: Objects notified of the deck's changes
+        self.observers = []
+        # self.cards_hash: Cached hash of the key and cards. None if it needs to be recalculated.
+        self.cards_hash: bytes | None = None
+        # self.question_counts: Dictionary between question and number of cards with it. None until first needed.
+        self.question_counts: Dict[str, int] | None = None
+        # self.suffix_counters: Dictionary between question and last suffix added to one of its duplicates
+        self.suffix_counters: Dict[str, int] = {}
+        # self.snapshots: Snapshots of the cards still in use, which keep the former state of edited cards
+        self.snapshots = weakref.WeakSet()
+        self.cards: CowList = CowList() if cards is None else cards
         self.title = title
         # self.key: Unique ID of the deck
         self.key = str(uuid4())
 
+    def __setattr__(self, name, value):
+        observers = self.__dict__.get('observers', [])
+        if name == 'cards':
+            value = value if isinstance(value, CowList) else CowList(value)
+            for observer in observers:
+                observer.deck_about_to_be_reset(self)
+            for card in self.__dict__.get('cards', []):
+                card.decks.pop(id(self), None)
+            for card in value:
+                card.decks[id(self)] = self
+            self.__dict__['question_counts'] = None
+        super().__setattr__(name, value)
+        if name in ('cards', 'key'):
+            self.cards_changed()
+        if name == 'cards':
+            for observer in observers:
+                observer.deck_reset(self)
+        elif name == 'title':
+            for observer in observers:
+                observer.deck_changed(self)
+
+    def add_observer(self, observer) -> None:
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def remove_observer(self, observer) -> None:
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def cards_changed(self, card: FlashCard | None = None) -> None:
+        """
+        Called when the cards of the deck change, to recalculate the deck's hash.
+        @param card: The edited card, if the change is an edit of one card. Observers are notified of it.
+        """
+        self.cards_hash = None
+        if card is not None:
+            for observer in self.observers:
+                observer.card_changed(self, card)
+
+    def card_about_to_change(self, card: FlashCard) -> None:
+        """
+        Called before a serialized attribute of a card of the deck changes, to keep its former state in the snapshots.
+        """
+        snapshots = list(self.snapshots)
+        if snapshots:
+            state = card.get_state()
+            for snapshot in snapshots:
+                snapshot.states.setdefault(id(card), state)
+
+    def snapshot(self) -> CardsSnapshot:
+        """
+        @return: Frozen view of the cards and their content. Later changes of the deck or its cards don't affect it.
+        """
+        snapshot = CardsSnapshot(self.cards)
+        self.snapshots.add(snapshot)
+        return snapshot
+
+    def get_cards_hash(self) -> bytes:
+        """
+        @return: Digest of the deck's key and of its cards' content hashes, in order
+        """
+        if self.cards_hash is None:
+            digest = hashlib.blake2b(self.key.encode('utf-8'), digest_size=16)
+            for card in self.cards:
+                digest.update(card.get_content_hash())
+            self.cards_hash = digest.digest()
+        return self.cards_hash
+
+    def get_content_hash(self) -> bytes:
+        """
+        @return: Digest of the deck's title and cards hash. Changes each time the deck would be saved differently.
+        """
+        return hashlib.blake2b(self.title.encode('utf-8') + self.get_cards_hash(), digest_size=16).digest()
+
+    def set_title(self, title: str) -> None:
+        self.title = title
+
+    def get_question_counts(self) -> Dict[str, int]:
+        if self.question_counts is None:
+            self.question_counts = {}
+            for card in self.cards:
+                self.question_counts[card.question] = self.question_counts.get(card.question, 0) + 1
+        return self.question_counts
+
+    def count_question(self, question: str, count: int) -> None:
+        """
+        Updates the count of cards with a question, if counts were built.
+        @param count: Number of cards added with the question (negative if removed)
+        """
+        if self.question_counts is None:
+            return
+        self.question_counts[question] = self.question_counts.get(question, 0) + count
+        if self.question_counts[question] <= 0:
+            del self.question_counts[question]
+
+    def question_changed(self, old_question: str | None, question: str) -> None:
+        """
+        Called when the question of a card of the deck changes, to update the question counts.
+        """
+        if old_question is not None:
+            self.count_question(old_question, -1)
+        self.count_question(question, 1)
+
+    def has_question(self, question: str) -> bool:
+        return question in self.get_question_counts()
+
+    def rename_duplicate_cards(self, cards: [FlashCard]) -> None:
+        """
+        Adds a suffix to the question of the cards having the same question as a card of the deck, or as a previous
+        card of the list. Used before inserting cards, so questions are unique in the deck.
+        See get_unique_questions.
+        """
+        for card, question in zip(cards, self.get_unique_questions(cards)):
+            if card.question != question:
+                card.question = question
+
+    def get_unique_questions(self, cards: [FlashCard]) -> List[str]:
+        """
+        Suffixes are numbered from the last one given for the same question, so checking a duplicate doesn't go
+        through all the previous suffixes. The cards aren't changed, for instance to rename them with undoable edits.
+        @return: Questions of the cards, with a suffix for those that are already in the deck, or in a previous card of
+        the list
+        """
+        questions = []
+        new_questions = set()
+        for card in cards:
+            name = question = card.question
+            if self.has_question(name) or name in new_questions:
+                count_duplicates = self.suffix_counters.get(name, 0)
+                while self.has_question(question) or question in new_questions:
+                    count_duplicates += 1
+                    question = name + '(%s)' % count_duplicates
+                self.suffix_counters[name] = count_duplicates
+            questions.append(question)
+            new_questions.add(question)
+        return questions
+
     def add_card(self, card: FlashCard):
-        self.cards.append(card)
+        self.insert_card(len(self.cards), card)
 
     def add_cards(self, cards: [FlashCard]):
         for card in cards:
             self.add_card(card)
 
     def remove_card(self, card: FlashCard) -> None:
-        self.cards.remove(card)
+        index = self.cards.index(card)
+        for observer in self.observers:
+            observer.card_about_to_be_removed(self, index)
+        del self.cards[index]
+        card.decks.pop(id(self), None)
+        self.count_question(card.question, -1)
+        self.cards_changed()
+        for observer in self.observers:
+            observer.card_removed(self, index)
 
     def remove_cards(self, cards: [FlashCard]) -> None:
         for card in cards:
             self.remove_card(card)
 
     def insert_card(self, index: int, card: FlashCard):
+        index = min(max(index if index >= 0 else len(self.cards) + index, 0), len(self.cards))
+        for observer in self.observers:
+            observer.card_about_to_be_inserted(self, index)
         self.cards.insert(index, card)
+        card.decks[id(self)] = self
+        self.count_question(card.question, 1)
+        self.cards_changed()
+        for observer in self.observers:
+            observer.card_inserted(self, index)
 
     def insert_cards(self, index: int, cards: [FlashCard]):
         for card_no, card in enumerate(cards):
@@ -43,10 +228,15 @@ class Deck:
         return self.cards[index]
 
     def __delitem__(self, index: int):
-        del self.cards[index]
+        self.remove_card(self.cards[index])
 
     def __setitem__(self, index: int, card: FlashCard):
+        self.cards[index].decks.pop(id(self), None)
+        self.count_question(self.cards[index].question, -1)
         self.cards[index] = card
+        card.decks[id(self)] = self
+        self.count_question(card.question, 1)
+        self.cards_changed(card)
 
     def __len__(self):
         return len(self.cards)
@@ -63,14 +253,7 @@ class Deck:
     def __eq__(self, other):
         if not issubclass(other.__class__, Deck):
             return False
-        if other.key != self.key:
-            return False
-        if len(self) != len(other):
-            return False
-        for card, other_card in zip(self, other):
-            if card != other_card:
-                return False
-        return True
+        return other.get_cards_hash() == self.get_cards_hash()
 
     def __ne__(self, other):
         return not self == other
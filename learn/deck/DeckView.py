@@ -0,0 +1,110 @@
+from learn.deck import Deck, FlashCard
+from typing import Callable, Iterator, Set
+from itertools import islice
+from datetime import datetime as dt
+
+
+class DeckView:
+    """
+    A live subset of a Deck's flashcards, without copy.
+
+    The subset is defined by a selection of card keys, and/or a predicate on the cards (for instance enabled or due
+    cards). It is evaluated lazily at each iteration, so the view follows the changes of the underlying deck.
+
+    A DeckView can be used as a Deck for reading: it has the same key and title, and the other attributes and methods
+    are those of the underlying deck. Membership is checked in constant time, but len() and indexing go through the
+    deck: iterate over the view once rather than indexing it in a loop.
+    """
+
+    def __init__(self, deck: Deck, keys: Set[str] | None = None,
+                 predicate: Callable[[FlashCard], bool] | None = None) -> None:
+        """
+        @param deck: Underlying deck
+        @param keys: Keys of the selected cards. If None, all the cards of the deck are selected.
+        @param predicate: Function returning True for the cards to keep. If None, all selected cards are kept.
+        """
+        self.deck = deck
+        self.keys = keys
+        self.predicate = predicate
+
+    @staticmethod
+    def due(deck: Deck, historian, scheduler, keys: Set[str] | None = None) -> 'DeckView':
+        """
+        Creates a view of the cards to review: never reviewed cards, and cards whose review interval has passed.
+        Last review dates are computed once, in one pass on the records.
+        @param deck: Underlying deck
+        @param historian: Historian of the deck
+        @param scheduler: Scheduler of the deck
+        @param keys: Keys of the selected cards. If None, all the cards of the deck are selected.
+        """
+        last_review = historian.get_last_review_dates()
+        now = dt.now()
+        return DeckView(deck, keys, lambda card: card.key not in last_review or
+                        now - last_review[card.key] >= scheduler.get_interval(card))
+
+    def is_selected(self, card: FlashCard) -> bool:
+        """
+        @return: True if card is in the selection and verifies the predicate. Doesn't check card is in the deck.
+        """
+        if self.keys is not None and card.key not in self.keys:
+            return False
+        return self.predicate is None or self.predicate(card)
+
+    def __iter__(self) -> Iterator[FlashCard]:
+        return (card for card in self.deck if self.is_selected(card))
+
+    def __contains__(self, item: FlashCard) -> bool:
+        """
+        Constant time: the card itself has to be in the deck, which is found from the decks it keeps track of, without
+        going through the deck. A copy of a card of the deck isn't in the view.
+        """
+        return (issubclass(item.__class__, FlashCard) and item.decks.get(id(self.deck)) is self.deck
+                and self.is_selected(item))
+
+    def __len__(self):
+        """
+        Linear time: the selection is evaluated on the whole deck at each call, as it follows the deck's changes.
+        """
+        return sum(1 for _ in self)
+
+    def __getitem__(self, index: int) -> FlashCard:
+        """
+        Linear time, like __len__: the selected cards are iterated until the index.
+        """
+        if index < 0:
+            return list(self)[index]
+        try:
+            return next(islice(self, index, None))
+        except StopIteration:
+            raise IndexError('DeckView index out of range')
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined by DeckView: key, title, deck methods...
+        if name == 'deck':
+            raise AttributeError(name)
+        return getattr(self.deck, name)
+
+    def __eq__(self, other):
+        if isinstance(other, DeckView):
+            return self.deck == other.deck and list(self) == list(other)
+        if issubclass(other.__class__, Deck):
+            return other.key == self.key and list(self) == list(other)
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.deck.key)
+
+    def __repr__(self):
+        str_list = ["DeckView-%s \'%s\'" % (self.deck.key, self.deck.title)]
+        for card in self:
+            str_list.append(' - ' + str(card))
+        return '\n'.join(str_list)
+
+    def to_deck(self) -> Deck:
+        """
+        @return: A Deck with the selected cards (not copied) and the same key
+        """
+        return self.deck.filter(self.is_selected)
@@ -1,17 +1,68 @@
 from uuid import uuid4
+from typing import Dict
+import hashlib
+import weakref
 
 
 class FlashCard:
     """
     A FlashCard is a question (front) and a correction (back).
+
+    A disabled card is kept in its deck, but not reviewed in exams.
+
+    Each card has a content hash of its key, question, correction and enabled state (see get_content_hash), updated
+    when they change. The decks containing the card are notified of the changes, to update their own hash. They're
+    also notified before a serialized attribute changes, to keep the card's former state in their snapshots.
     """
+    # content_attributes: Attributes included in the content hash
+    content_attributes = ('key', 'question', 'correction', 'enabled')
+    # serialized_attributes: Attributes written in json format (see JSONEncoder)
+    serialized_attributes = ('question', 'correction', 'key', 'enabled')
 
     def __init__(self, question: str, correction: str) -> None:
+        # self.decks: Decks containing the card, by id. They're notified when the card content changes.
+        self.decks = weakref.WeakValueDictionary()
+        # self.content_hash: Cached content hash. None if it needs to be recalculated.
+        self.content_hash: bytes | None = None
         self.question = question
         self.correction = correction
+        # self.enabled: False if the card shouldn't be reviewed
+        self.enabled = True
         # self.key: Unique id of the card
         self.key = str(uuid4())
 
+    def __setattr__(self, name, value):
+        old_value = self.__dict__.get(name)
+        if name in FlashCard.serialized_attributes and 'decks' in self.__dict__:
+            for deck in list(self.decks.values()):
+                deck.card_about_to_change(self)
+        super().__setattr__(name, value)
+        if name in FlashCard.content_attributes and 'decks' in self.__dict__:
+            self.content_hash = None
+            for deck in list(self.decks.values()):
+                if name == 'question':
+                    deck.question_changed(old_value, value)
+                deck.cards_changed(self)
+
+    def get_content_hash(self) -> bytes:
+        """
+        @return: Digest of the card's key, question, correction and enabled state
+        """
+        if self.content_hash is None:
+            content = '\0'.join([self.key, self.question, self.correction, '1' if self.enabled else '0'])
+            self.content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        return self.content_hash
+
+    def get_state(self) -> Dict:
+        """
+        @return: New dictionary of the card's serialized attributes
+        """
+        return {name: self.__dict__[name] for name in FlashCard.serialized_attributes if name in self.__dict__}
+
+    def set_content(self, question: str, correction: str) -> None:
+        self.question = question
+        self.correction = correction
+
     def __repr__(self):
         return 'FlashCard-%s' % self.key
 
@@ -24,13 +75,7 @@ class FlashCard:
     def __eq__(self, other):
         if not issubclass(other.__class__, FlashCard):
             return False
-        if other.key != self.key:
-            return False
-        if other.question != self.question:
-            return False
-        if other.correction != self.correction:
-            return False
-        return True
+        return other.get_content_hash() == self.get_content_hash()
 
     def __ne__(self, other):
         return not self == other
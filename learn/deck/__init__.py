@@ -1,2 +1,4 @@
 from .FlashCard import FlashCard
+from .CardsSnapshot import CardsSnapshot
 from .Deck import Deck
+from .DeckView import DeckView
@@ -0,0 +1,201 @@
+from config import data_directory, decks_directory, records_directory, picker_directory, pack_path, pack_mmap
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Tuple
+
+
+class DataPack:
+    """
+    Bundles all the files of the data directory (decks, records and picker files) in a single indexed file, to avoid
+    opening several files per deck at startup.
+
+    The pack file is structured as follows:
+    - A header: magic number, format version and number of entries
+    - An offset table: for each entry, its name (path relative to data_directory), offset and length in bytes
+    - The concatenated contents of the entries
+
+    The pack is only a read cache of the loose files: files are always written loose, and each write invalidates the
+    pack (see invalidate). Call schedule_repack after saving to rebuild it in a background thread.
+
+    Loaders read entries with read(...), which returns None if there is no valid pack or if the entry is not in it.
+    In this case, they should fall back to the loose file.
+    """
+    magic = b'BHPK'
+    version = 1
+    # header_format: Magic number, version, number of entries
+    header_format = '<4sHI'
+    # entry_format: Name length, offset and length of the entry's content
+    entry_format = '<HQQ'
+    # pack_directories: Directories whose files are bundled in the pack
+    pack_directories = [decks_directory, records_directory, picker_directory]
+
+    # index: Dictionary between entry name and (offset, length). None if pack isn't loaded.
+    index: Dict[str, Tuple[int, int]] | None = None
+    buffer: bytes | mmap.mmap | None = None
+    lock = threading.RLock()
+    # generation: Incremented at each invalidation, so that a repack started before a write is discarded
+    generation = 0
+    repack_thread: threading.Thread | None = None
+    repack_pending = False
+
+    @staticmethod
+    def entry_name(path: str) -> str:
+        """
+        @param path: Path of a file in data_directory
+        @return: Name of the corresponding entry in the pack
+        """
+        return os.path.relpath(path, data_directory).replace(os.sep, '/')
+
+    @staticmethod
+    def load() -> bool:
+        """
+        Reads the pack's header and offset table, if not already loaded.
+        If pack_mmap (config.py) is True, the pack is memory-mapped instead of being read in memory.
+        @return: True if a valid pack is loaded
+        """
+        with DataPack.lock:
+            if DataPack.index is not None:
+                return True
+            if not os.path.isfile(pack_path):
+                return False
+            with open(pack_path, 'rb') as file:
+                if pack_mmap and os.path.getsize(pack_path) > 0:
+                    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    buffer = file.read()
+            header_size = struct.calcsize(DataPack.header_format)
+            entry_size = struct.calcsize(DataPack.entry_format)
+            try:
+                magic, version, count = struct.unpack_from(DataPack.header_format, buffer, 0)
+                if magic != DataPack.magic or version != DataPack.version:
+                    raise ValueError('Unknown pack format')
+                index, position = {}, header_size
+                for _ in range(count):
+                    name_length, offset, length = struct.unpack_from(DataPack.entry_format, buffer, position)
+                    position += entry_size
+                    name = bytes(buffer[position:position + name_length]).decode('utf-8')
+                    position += name_length
+                    index[name] = (offset, length)
+            except (struct.error, ValueError, UnicodeDecodeError):
+                # Corrupted or outdated pack: loose files will be used
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+                return False
+            DataPack.index, DataPack.buffer = index, buffer
+            return True
+
+    @staticmethod
+    def read(path: str) -> str | None:
+        """
+        @param path: Path of a file in data_directory
+        @return: Content of the file from the pack, or None if there's no valid pack or the file isn't in it
+        """
+        with DataPack.lock:
+            if not DataPack.load():
+                return None
+            name = DataPack.entry_name(path)
+            if name not in DataPack.index:
+                return None
+            offset, length = DataPack.index[name]
+            return bytes(DataPack.buffer[offset:offset + length]).decode('utf-8')
+
+    @staticmethod
+    def list_directory(directory: str) -> List[str] | None:
+        """
+        @param directory: One of the directories in pack_directories
+        @return: File names of the directory in the pack, or None if there's no valid pack
+        """
+        with DataPack.lock:
+            if not DataPack.load():
+                return None
+            prefix = DataPack.entry_name(directory) + '/'
+            return [name[len(prefix):] for name in DataPack.index.keys() if name.startswith(prefix)]
+
+    @staticmethod
+    def close() -> None:
+        """
+        Releases the loaded pack. It will be loaded again on next read.
+        """
+        with DataPack.lock:
+            if isinstance(DataPack.buffer, mmap.mmap):
+                DataPack.buffer.close()
+            DataPack.index, DataPack.buffer = None, None
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Deletes the pack file. Must be called each time a file of pack_directories is written or deleted.
+        """
+        with DataPack.lock:
+            DataPack.generation += 1
+            DataPack.close()
+            if os.path.isfile(pack_path):
+                os.remove(pack_path)
+
+    @staticmethod
+    def write() -> bool:
+        """
+        Bundles the loose files of pack_directories in the pack file.
+        If a file was written during the operation, the pack is discarded.
+        @return: True if the pack was written
+        """
+        generation = DataPack.generation
+        # Reading loose files
+        ######################
+        entries: List[Tuple[bytes, bytes]] = []
+        for directory in DataPack.pack_directories:
+            for file_name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, file_name)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, 'rb') as file:
+                    entries.append((DataPack.entry_name(path).encode('utf-8'), file.read()))
+        # Building header and offset table
+        ###################################
+        table_size = sum(struct.calcsize(DataPack.entry_format) + len(name) for name, _ in entries)
+        offset = struct.calcsize(DataPack.header_format) + table_size
+        chunks = [struct.pack(DataPack.header_format, DataPack.magic, DataPack.version, len(entries))]
+        for name, content in entries:
+            chunks.append(struct.pack(DataPack.entry_format, len(name), offset, len(content)))
+            chunks.append(name)
+            offset += len(content)
+        chunks.extend(content for _, content in entries)
+        # Writing pack, if no file was written meanwhile
+        #################################################
+        temp_path = pack_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(b''.join(chunks))
+        with DataPack.lock:
+            if generation != DataPack.generation:
+                os.remove(temp_path)
+                return False
+            DataPack.close()
+            os.replace(temp_path, pack_path)
+        return True
+
+    @staticmethod
+    def schedule_repack() -> None:
+        """
+        Rebuilds the pack in a background thread. If a repack is ongoing, another one is done after it.
+        """
+        with DataPack.lock:
+            DataPack.repack_pending = True
+            if DataPack.repack_thread is not None:
+                return
+            DataPack.repack_thread = threading.Thread(target=DataPack.repack_loop, daemon=True)
+            DataPack.repack_thread.start()
+
+    @staticmethod
+    def repack_loop() -> None:
+        """
+        Target of the repack thread. Repacks until no repack is pending.
+        """
+        while True:
+            with DataPack.lock:
+                if not DataPack.repack_pending:
+                    DataPack.repack_thread = None
+                    return
+                DataPack.repack_pending = False
+            DataPack.write()
@@ -0,0 +1 @@
+from .DataPack import DataPack
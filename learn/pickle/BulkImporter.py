@@ -0,0 +1,212 @@
+import csv
+import heapq
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime as dt
+from typing import Iterator, List, Tuple, TextIO
+
+from learn.deck import Deck, FlashCard
+from learn.pickle import JSONEncoder
+from learn.pack import DataPack
+from config import decks_directory, records_directory, picker_directory, intervals, create_directories
+
+# date_format: Format of the dates in the imported review history, and in the records files
+date_format = '%d-%m-%Y %H:%M:%S'
+
+
+class BulkImporter:
+    """
+    Creates a deck from a large TSV/CSV collection of flashcards, without loading the whole collection in memory.
+
+    Each line of the file is a flashcard: question, correction, and optionally its review history.
+    The review history is a list of reviews separated by ';'. A review is written 'Date|DurationSeconds|Success', with
+    the date in format '%d-%m-%Y %H:%M:%S' and success as 1 or 0. For instance: '25-03-2024 19:26:48|5.2|1'.
+    In TSV files, new lines and tabs in questions and corrections are written '\\n' and '\\t'.
+
+    Cards are built in batches of batch_size, and written directly to the deck, records and interval boxes files
+    (see DeckManager, Historian and Scheduler classes), without going through DeckManager methods.
+    The records of each batch are sorted and written to a temporary file, then all of them are merged by date.
+    The files are written with the .tmp extension, and renamed once the whole collection is imported: an invalid row
+    or an I/O error leaves no partial deck.
+
+    Usage: python -m learn.pickle.BulkImporter collection.tsv "Deck title"
+    """
+
+    def __init__(self, title: str, batch_size: int = 10000) -> None:
+        """
+        @param title: Title of the created deck
+        @param batch_size: Number of flashcards held in memory at the same time
+        """
+        self.deck = Deck(title)
+        self.batch_size = batch_size
+        # Import statistics
+        self.card_count = 0
+        self.record_count = 0
+        self.duration = 0.
+
+    @staticmethod
+    def read_rows(file: TextIO, delimiter: str) -> Iterator[List[str]]:
+        """
+        @param file: Opened collection file
+        @param delimiter: '\\t' for TSV files, ',' for CSV files
+        @return: Iterator on the rows of the file, with TSV escape sequences replaced
+        """
+        if delimiter == '\t':
+            for line in file:
+                line = line.rstrip('\r\n')
+                if line:
+                    yield [field.replace('\\n', '\n').replace('\\t', '\t') for field in line.split('\t')]
+        else:
+            for row in csv.reader(file, delimiter=delimiter):
+                if row:
+                    yield row
+
+    @staticmethod
+    def parse_history(history: str) -> List[Tuple[dt, float, bool]]:
+        """
+        @param history: Reviews separated by ';', each one as 'Date|DurationSeconds|Success'
+        @return: List of reviews as (date, duration, success), sorted by date
+        """
+        reviews = []
+        for review in history.split(';'):
+            if not review.strip():
+                continue
+            date, duration, success = review.strip().split('|')
+            reviews.append((dt.strptime(date, date_format), float(duration), success.strip() in ('1', 'True')))
+        reviews.sort(key=lambda x: x[0])
+        return reviews
+
+    @staticmethod
+    def get_box(reviews: List[Tuple[dt, float, bool]]) -> int:
+        """
+        Replays the review history on the Leitner boxes: a success moves the card to the next box, a failure to the
+        first one.
+        @return: Box number of the card after its reviews
+        """
+        box = 0
+        for _, _, success in reviews:
+            box = min(box + 1, len(intervals) - 1) if success else 0
+        return box
+
+    def batches(self, rows: Iterator[List[str]]) -> Iterator[List[Tuple[FlashCard, List[Tuple[dt, float, bool]]]]]:
+        """
+        @param rows: Rows of the collection file
+        @return: Iterator on batches of (flashcard, reviews) of size batch_size
+        """
+        batch = []
+        for row in rows:
+            if len(row) < 2:
+                raise ValueError('Line %d: A question and a correction are needed' % (self.card_count + len(batch) + 1))
+            reviews = self.parse_history(row[2]) if len(row) > 2 else []
+            batch.append((FlashCard(row[0], row[1]), reviews))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def run(self, path: str, delimiter: str | None = None) -> Deck:
+        """
+        Imports the collection file as a new deck.
+        @param path: Path of the TSV/CSV file
+        @param delimiter: Fields' delimiter. If None, deduced from the file extension ('\\t' unless it's a .csv file).
+        @return: The created deck, without its cards (they are only written to the deck file)
+        """
+        start = time.perf_counter()
+        delimiter = delimiter if delimiter is not None else (',' if path.lower().endswith('.csv') else '\t')
+        paths = [os.path.join(picker_directory, self.deck.key + '.box'),
+                 os.path.join(records_directory, self.deck.key + '.csv'),
+                 os.path.join(decks_directory, self.deck.key + '.json')]
+        # The files are written next to their destination, and moved there once the import succeeded: the deck file
+        # last, so the deck isn't loaded without its data
+        temp_paths = [destination + '.tmp' for destination in paths]
+        try:
+            with tempfile.TemporaryDirectory() as temp_directory:
+                run_paths = self.write_batches(path, delimiter, temp_paths[2], temp_paths[0], temp_directory)
+                self.merge_records(run_paths, temp_paths[1])
+            for temp_path, destination in zip(temp_paths, paths):
+                if os.path.isfile(temp_path):
+                    os.replace(temp_path, destination)
+        finally:
+            for temp_path in temp_paths:
+                if os.path.isfile(temp_path):
+                    os.remove(temp_path)
+        DataPack.invalidate()
+        self.duration = time.perf_counter() - start
+        return self.deck
+
+    def write_batches(self, path: str, delimiter: str, deck_path: str, box_path: str, temp_directory: str) -> List[str]:
+        """
+        Writes the deck and boxes files as the batches come, and the sorted records of each batch in a temporary file.
+        @return: Paths of the batches' records files
+        """
+        run_paths = []
+        with open(path, 'r', encoding='utf-8', newline='') as file, \
+                open(deck_path, 'w') as deck_file, open(box_path, 'w') as box_file:
+            deck_file.write('{"cards": [')
+            box_file.write('{')
+            for batch in self.batches(self.read_rows(file, delimiter)):
+                records = []
+                for card, reviews in batch:
+                    separator = ', ' if self.card_count else ''
+                    deck_file.write(separator + json.dumps(card, cls=JSONEncoder))
+                    box_file.write(separator + '%s: %d' % (json.dumps(card.key), self.get_box(reviews)))
+                    records.extend((date, card.key, duration, success) for date, duration, success in reviews)
+                    self.card_count += 1
+                # Each batch's records are sorted in a temporary file
+                records.sort(key=lambda x: x[0])
+                run_paths.append(os.path.join(temp_directory, '%d.csv' % len(run_paths)))
+                with open(run_paths[-1], 'w', newline='') as run_file:
+                    csv.writer(run_file).writerows(
+                        (dt.strftime(date, date_format), key, duration, success)
+                        for date, key, duration, success in records)
+                self.record_count += len(records)
+            deck_file.write('], "title": %s, "key": %s, "__class__": "Deck"}' % (json.dumps(self.deck.title),
+                                                                                   json.dumps(self.deck.key)))
+            box_file.write('}')
+        return run_paths
+
+    def merge_records(self, run_paths: List[str], records_path: str) -> None:
+        """
+        Merges the sorted records of each batch in the deck's records file (see Historian class).
+        @param records_path: Path of the written records file
+        """
+        if self.record_count == 0:
+            return
+        run_files = [open(run_path, 'r', newline='') for run_path in run_paths]
+        runs = [csv.reader(run_file) for run_file in run_files]
+        try:
+            with open(records_path, 'w', newline='') as records_file:
+                writer = csv.writer(records_file, lineterminator='\n')
+                writer.writerow(['Date', 'CardKey', 'DurationSeconds', 'Success'])
+                writer.writerows(heapq.merge(*runs, key=lambda record: dt.strptime(record[0], date_format)))
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+    def report(self) -> str:
+        """
+        @return: Import statistics, with throughput in cards per second
+        """
+        throughput = self.card_count / self.duration if self.duration else 0
+        return "Imported %d cards and %d records in deck '%s' in %.2fs (%.0f cards/s)" % (
+            self.card_count, self.record_count, self.deck.title, self.duration, throughput)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Imports a TSV/CSV collection of flashcards as a new deck')
+    parser.add_argument('path', help='TSV/CSV file, with question, correction and optional review history columns')
+    parser.add_argument('title', help='Title of the created deck')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Number of cards held in memory at once')
+    parser.add_argument('--delimiter', default=None, help='Fields delimiter (default: from the file extension)')
+    args = parser.parse_args()
+
+    create_directories()
+    importer = BulkImporter(args.title, batch_size=args.batch_size)
+    importer.run(args.path, delimiter=args.delimiter)
+    print(importer.report(), file=sys.stderr)
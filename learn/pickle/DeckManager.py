@@ -1,13 +1,17 @@
 import json
 import os
 
-from learn.pickle import JSONEncoder, JSONDecoder
+from learn.pickle import JSONEncoder, JSONDecoder, DeckSnapshot
 from learn.deck import Deck, FlashCard
-from learn.quizz import TargetTimeTracker, Scheduler, Historian
+from learn.quizz import TargetTimeTracker, Scheduler, Historian, ExamCheckpoint
+from learn.pack import DataPack
+from learn.search import SearchIndex
+from learn.profiling import Profiler
 from typing import List
-from config import decks_directory
+from config import decks_directory, records_directory, picker_directory
 from typing import Dict, Set
 from copy import copy
+from datetime import datetime as dt
 
 
 class DeckManager:
@@ -18,12 +22,18 @@ class DeckManager:
     Also manages target times, review schedule and history of reviews of decks.
     Moving between decks or deleting flashcards should be done only with this class methods, and not with Deck class'
     methods.
+
+    Also builds a search index over the loaded decks' flashcards (see SearchIndex class), kept up to date on moves and
+    deletions. Edits and creations of flashcards need to be notified to the index.
     """
     time_tracker: Dict[str, TargetTimeTracker] = {}
     historian: Dict[str, Historian] = {}
     scheduler: Dict[str, Scheduler] = {}
     decks: [Deck] = None
     moved_cards: Set[str] = set()
+    index: SearchIndex = SearchIndex()
+    # saved_hashes: Dictionary between deck key and deck content hash when last loaded or saved
+    saved_hashes: Dict[str, bytes] = {}
 
     @staticmethod
     def has_moved_cards(deck: Deck):
@@ -40,7 +50,8 @@ class DeckManager:
     @staticmethod
     def get_historian(deck: Deck):
         if deck.key not in DeckManager.historian.keys():
-            DeckManager.historian[deck.key] = Historian(deck)
+            with Profiler.phase('history load'):
+                DeckManager.historian[deck.key] = Historian(deck)
         return DeckManager.historian[deck.key]
 
     @staticmethod
@@ -50,38 +61,127 @@ class DeckManager:
         return DeckManager.scheduler[deck.key]
 
     @staticmethod
+    def get_next_review_days(card: FlashCard, deck: Deck) -> int | None:
+        """
+        @return: Days until the next review of the card, negative if it's late. None if the card was never reviewed.
+        """
+        last_review = DeckManager.get_historian(deck).get_last_review_date(card)
+        if last_review is None:
+            return None
+        return DeckManager.get_scheduler(deck).get_interval(card).days - (dt.now() - last_review).days
+
+    @staticmethod
+    def get_next_reviews(deck: Deck) -> Dict[str, int | None]:
+        """
+        Computes the days until next review of all the cards of a deck at once, from the last review date of each card
+        (one pass on the deck's records) and the interval of its box.
+        @return: Dictionary between card key and days until next review, negative if late. None if never reviewed.
+        """
+        last_reviews = DeckManager.get_historian(deck).get_last_review_dates()
+        scheduler = DeckManager.get_scheduler(deck)
+        now = dt.now()
+        return {card.key: (scheduler.get_interval(card).days - (now - last_reviews[card.key]).days
+                           if card.key in last_reviews else None) for card in deck}
+
+    @staticmethod
+    @Profiler.timed
     def load() -> List[Deck]:
+        """
+        Loads the decks from the data pack if there is one (see DataPack class), else from the deck files.
+        """
         decks = []
-        for deck_file_path in os.listdir(decks_directory):
-            with open(os.path.join(decks_directory, deck_file_path), 'r') as deck_file:
-                decks.append(json.load(deck_file, cls=JSONDecoder))
+        packed_files = DataPack.list_directory(decks_directory)
+        # Other files, like the ones of an import in progress (see BulkImporter), aren't decks
+        if packed_files is not None:
+            for deck_file_path in packed_files:
+                if deck_file_path.endswith('.json'):
+                    decks.append(json.loads(DataPack.read(os.path.join(decks_directory, deck_file_path)),
+                                            cls=JSONDecoder))
+        else:
+            for deck_file_path in os.listdir(decks_directory):
+                if deck_file_path.endswith('.json'):
+                    with open(os.path.join(decks_directory, deck_file_path), 'r') as deck_file:
+                        decks.append(json.load(deck_file, cls=JSONDecoder))
         DeckManager.decks = list(decks)
+        DeckManager.saved_hashes = {deck.key: deck.get_content_hash() for deck in decks}
+        DeckManager.index = SearchIndex()
+        for deck in decks:
+            DeckManager.index.add_deck(deck)
         return decks
 
     @staticmethod
     def save(deck: Deck) -> None:
-        with open(os.path.join(decks_directory, deck.key + '.json'), 'w') as deck_file:
-            json.dump(deck, deck_file, cls=JSONEncoder)
-        DeckManager.get_historian(deck).save(iterate=(not DeckManager.has_moved_cards(deck)))
-        DeckManager.get_scheduler(deck).save()
-        DeckManager.get_time_tracker(deck).save()
-        DeckManager.moved_cards = set()
+        """
+        Saves the deck and its related data. The deck file is only written if the deck changed since last load or save.
+        """
+        DeckManager.write_snapshot(DeckManager.get_snapshot(deck))
+
+    @staticmethod
+    @Profiler.timed
+    def get_snapshot(deck: Deck, rewrite_records: bool = False) -> DeckSnapshot:
+        """
+        Takes a snapshot of the data of the deck written by save, without copying it. The snapshot doesn't change when
+        the deck is edited afterward, and can be written by another thread with write_snapshot.
+        @param rewrite_records: If True, all the records are copied to rewrite the records file, even if no card moved
+        """
+        content_hash = deck.get_content_hash()
+        content = None
+        if DeckManager.saved_hashes.get(deck.key) != content_hash:
+            content = JSONEncoder().default(deck)
+            content['cards'] = deck.snapshot()
+        historian = DeckManager.get_historian(deck)
+        iterate = not rewrite_records and not DeckManager.has_moved_cards(deck) and not historian.rewrite
+        DeckManager.moved_cards.discard(deck.key)
+        historian.rewrite = False
+        return DeckSnapshot(deck.key, content, content_hash, historian.records.snapshot(), historian.last_save, iterate,
+                            DeckManager.get_scheduler(deck).box.snapshot(),
+                            DeckManager.get_time_tracker(deck).target_time.snapshot(),
+                            ExamCheckpoint.get_size(deck.key))
+
+    @staticmethod
+    @Profiler.timed
+    def write_snapshot(snapshot: DeckSnapshot) -> None:
+        """
+        Writes the deck's data copied by get_snapshot. Can be called from another thread.
+        """
+        if snapshot.content is not None:
+            with open(os.path.join(decks_directory, snapshot.key + '.json'), 'w') as deck_file:
+                json.dump(snapshot.content, deck_file, cls=JSONEncoder)
+            DeckManager.saved_hashes[snapshot.key] = snapshot.content_hash
+            DataPack.invalidate()
+        records = Historian.select_records(snapshot.records, snapshot.last_save if snapshot.iterate else None)
+        Historian.write_records(snapshot.key, records, snapshot.iterate)
+        Scheduler.write_boxes(snapshot.key, snapshot.box)
+        TargetTimeTracker.write_target_times(snapshot.key, snapshot.target_time)
+        ExamCheckpoint.discard(snapshot.key, snapshot.checkpoint_size)
 
     @staticmethod
     def delete(deck: Deck):
         """
         Deletes the deck and all its related files. This operation cannot be undone.
         """
-        path = os.path.join(decks_directory, deck.key + '.json')
-        if os.path.isfile(path):
-            os.remove(path)
-        DeckManager.get_historian(deck).delete()
-        DeckManager.get_scheduler(deck).delete()
-        DeckManager.get_time_tracker(deck).delete()
+        DeckManager.saved_hashes.pop(deck.key, None)
+        DeckManager.delete_files(deck.key)
         DeckManager.remove(deck)
 
+    @staticmethod
+    def delete_files(deck_key: str) -> None:
+        """
+        Deletes the deck file, records, boxes, target times and exam journal of a deck. Can be called from another
+        thread.
+        """
+        paths = [os.path.join(decks_directory, deck_key + '.json'), os.path.join(records_directory, deck_key + '.csv'),
+                 os.path.join(picker_directory, deck_key + '.box'), os.path.join(picker_directory, deck_key + '.ttm')]
+        for path in paths:
+            if os.path.isfile(path):
+                os.remove(path)
+                DataPack.invalidate()
+        if os.path.isfile(ExamCheckpoint.get_path(deck_key)):
+            os.remove(ExamCheckpoint.get_path(deck_key))
+
     @staticmethod
     def remove(deck: Deck):
+        DeckManager.index.remove_deck(deck)
         if deck in DeckManager.time_tracker.keys():
             del DeckManager.time_tracker[deck.key]
         if deck in DeckManager.historian.keys():
@@ -115,6 +215,7 @@ class DeckManager:
         # Removing cards' data from origin
         ###################################
         DeckManager.remove_cards(cards, origin)
+        DeckManager.index.move_cards(cards, destination)
         DeckManager.moved_cards.add(origin.key)
         DeckManager.moved_cards.add(destination.key)
 
@@ -135,6 +236,7 @@ class DeckManager:
         historian_origin.remove_cards(cards)
         target_time_origin.remove_cards(cards)
         scheduler_origin.remove_cards(cards)
+        DeckManager.index.remove_cards(cards)
         for card in cards:
             origin.remove_card(card)
         DeckManager.moved_cards.add(origin.key)
@@ -0,0 +1,38 @@
+from learn.cow import CowList, CowDict
+from datetime import datetime as dt
+from typing import Dict
+
+
+class DeckSnapshot:
+    """
+    Frozen copy of the data of a deck written by DeckManager.save: the deck's json content, records, boxes and target
+    times.
+
+    It's taken with DeckManager.get_snapshot, and written with DeckManager.write_snapshot, possibly by another thread
+    while the deck keeps being edited. It isn't modified after its creation.
+    The cards, records, boxes and target times are copy-on-write snapshots (see Deck.snapshot, CowList and CowDict),
+    so taking a snapshot doesn't copy them. They're converted to the files' formats when written.
+    """
+    def __init__(self, key: str, content: Dict | None, content_hash: bytes, records: CowList, last_save: dt,
+                 iterate: bool, box: CowDict, target_time: CowDict, checkpoint_size: int | None = None) -> None:
+        """
+        @param key: Key of the deck
+        @param content: Deck attributes to write in json format with JSONEncoder, its cards as a CardsSnapshot. None if
+        the deck file is up to date.
+        @param content_hash: Content hash of the deck (see Deck.get_content_hash)
+        @param records: Snapshot of the records of the deck
+        @param last_save: Date of the last save of the records (see Historian.get_records_to_save)
+        @param iterate: If True, the records since last_save are appended to the records file, else all the records
+        replace it
+        @param checkpoint_size: Size of the deck's exam journal, discarded once the snapshot is written if it didn't
+        grow meanwhile (see ExamCheckpoint.discard)
+        """
+        self.key = key
+        self.content = content
+        self.content_hash = content_hash
+        self.records = records
+        self.last_save = last_save
+        self.iterate = iterate
+        self.box = box
+        self.target_time = target_time
+        self.checkpoint_size = checkpoint_size
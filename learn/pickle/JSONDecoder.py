@@ -21,6 +21,7 @@ class JSONDecoder(json.JSONDecoder):
         if dct['__class__'] == 'FlashCard':
             card = FlashCard(dct['question'], dct['correction'])
             card.key = dct['key']
+            card.enabled = dct.get('enabled', True)
             return card
         elif dct['__class__'] == 'Deck':
             deck = Deck(dct['title'], dct['cards'])
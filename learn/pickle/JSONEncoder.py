@@ -1,5 +1,6 @@
 import json
-from learn.deck import FlashCard, Deck
+from learn.deck import FlashCard, Deck, CardsSnapshot
+from learn.cow import CowList
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -10,14 +11,20 @@ class JSONEncoder(json.JSONEncoder):
         """
         Serializes objects when used with json. For instance: json.dumps(obj, cls=JSONEncoder)
         Adds a key '__class__' to distinguish dictionaries at decoding.
-        @param obj: Can be of type Deck or FlashCard in 'learning.deck' module, or any serializable object
+        Only the attributes listed in the class attribute 'serialized_attributes' are written.
+        @param obj: Can be of type Deck, FlashCard or CardsSnapshot in 'learning.deck' module, a CowList, or any
+        serializable object
         """
         if isinstance(obj, FlashCard):
-            attrs = obj.__dict__.copy()
+            attrs = obj.get_state()
             attrs['__class__'] = 'FlashCard'
             return attrs
+        elif isinstance(obj, CardsSnapshot):
+            return [dict(state, __class__='FlashCard') for state in obj]
+        elif isinstance(obj, CowList):
+            return list(obj)
         elif isinstance(obj, Deck):
-            attrs = obj.__dict__.copy()
+            attrs = {name: obj.__dict__[name] for name in obj.serialized_attributes if name in obj.__dict__}
             attrs['__class__'] = 'Deck'
             return attrs
         # Default behavior for all other types
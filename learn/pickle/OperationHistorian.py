@@ -1,107 +1,301 @@
 from learn.deck import Deck, FlashCard
 from learn.pickle import DeckManager
+from config import undo_memory_limit
+from typing import List, Tuple
 
 
 class OperationHistorian:
-    operation = []
-
-    @statisMethod
-    def add_operation(self, op):
-        pass
+    """
+    Undo/redo engine for the edit operations on decks.
+
+    An edit is an Operation object, which stores only what's needed to apply and reverse it (moved cards and their
+    positions, old and new texts...), not copies of decks.
+    - Call execute(...) to apply an operation and record it
+    - Call undo() and redo() to reverse and apply again the recorded operations
+
+    Consecutive operations are merged into one step if the last one allows it (see Operation.merge), for instance
+    consecutive edits of the same flashcard.
+    The history is capped by the estimated memory of the operations: undo_memory_limit bytes (config.py). The oldest
+    operations are forgotten first.
+    """
+    undo_stack: List['Operation'] = []
+    redo_stack: List['Operation'] = []
+    # memory: Estimated memory of the operations in both stacks, in bytes
+    memory: int = 0
+    # can_merge: False after undo/redo, to avoid merging an operation into one done before
+    can_merge: bool = True
+
+    @staticmethod
+    def execute(operation: 'Operation') -> None:
+        """
+        Applies an operation and adds it to the history.
+        """
+        operation.execute()
+        OperationHistorian.add_operation(operation)
+
+    @staticmethod
+    def add_operation(operation: 'Operation') -> None:
+        """
+        Adds an already applied operation to the history. Clears the operations that were undone.
+        """
+        OperationHistorian.memory -= sum(op.size() for op in OperationHistorian.redo_stack)
+        OperationHistorian.redo_stack = []
+        undo_stack = OperationHistorian.undo_stack
+        if OperationHistorian.can_merge and undo_stack:
+            last_size = undo_stack[-1].size()
+            if undo_stack[-1].merge(operation):
+                OperationHistorian.memory += undo_stack[-1].size() - last_size
+                return
+        undo_stack.append(operation)
+        OperationHistorian.memory += operation.size()
+        OperationHistorian.can_merge = True
+        # Forgetting oldest operations
+        while OperationHistorian.memory > undo_memory_limit and len(undo_stack) > 1:
+            OperationHistorian.memory -= undo_stack.pop(0).size()
+
+    @staticmethod
+    def undo() -> bool:
+        """
+        Reverses the last operation.
+        @return: False if there was no operation to undo
+        """
+        if not OperationHistorian.undo_stack:
+            return False
+        operation = OperationHistorian.undo_stack.pop()
+        operation.reverse()
+        OperationHistorian.redo_stack.append(operation)
+        OperationHistorian.can_merge = False
+        return True
+
+    @staticmethod
+    def redo() -> bool:
+        """
+        Applies again the last undone operation.
+        @return: False if there was no operation to redo
+        """
+        if not OperationHistorian.redo_stack:
+            return False
+        operation = OperationHistorian.redo_stack.pop()
+        operation.execute()
+        OperationHistorian.undo_stack.append(operation)
+        OperationHistorian.can_merge = False
+        return True
+
+    @staticmethod
+    def clear() -> None:
+        OperationHistorian.undo_stack = []
+        OperationHistorian.redo_stack = []
+        OperationHistorian.memory = 0
 
 
 class Operation:
-    def execute(self):
+    """
+    An edit operation that can be applied and reversed several times, alternately.
+    """
+    def execute(self) -> None:
         pass
 
-    def reverse(self):
+    def reverse(self) -> None:
         pass
 
+    def merge(self, operation: 'Operation') -> bool:
+        """
+        Merges an operation done after this one into this one, if possible.
+        @return: True if the operation was merged
+        """
+        return False
+
+    def size(self) -> int:
+        """
+        @return: Estimated memory used by the operation, in bytes
+        """
+        return 64
+
+
+def get_positions(cards: [FlashCard], deck: Deck) -> List[int]:
+    """
+    @return: Indexes of the cards in the deck, in one pass on the deck
+    """
+    indexes = {id(card): ind for ind, card in enumerate(deck.cards)}
+    return [indexes[id(card)] for card in cards]
+
+
+def get_runs(cards: [FlashCard], positions: [int]) -> List[Tuple[int, List[FlashCard]]]:
+    """
+    @return: Cards grouped in runs of consecutive positions, as (first position, cards), sorted by position
+    """
+    runs = []
+    for position, card in sorted(zip(positions, cards), key=lambda x: x[0]):
+        if runs and runs[-1][0] + len(runs[-1][1]) == position:
+            runs[-1][1].append(card)
+        else:
+            runs.append((position, [card]))
+    return runs
+
 
 class MoveCards(Operation):
+    """
+    Moves cards between decks, with their related data (see DeckManager.move_cards).
+    Reversing puts them back at their initial positions.
+    """
     def __init__(self, cards: [FlashCard], origin: Deck, destination: Deck, index_destination=None):
-        self.cards = cards
+        self.cards = list(cards)
         self.origin = origin
         self.destination = destination
-        self.index_destination = index_destination
-        self.index_origin = origin.cards.index(cards[0])
+        self.index_destination = len(destination) if index_destination is None else index_destination
+        self.positions = get_positions(self.cards, origin)
 
     def execute(self):
-        DeckManager.move_cards(self.cards, self.origin, self.destination, index_destination=self.index_destination)
+        DeckManager.move_cards(list(self.cards), self.origin, self.destination,
+                               index_destination=self.index_destination)
 
     def reverse(self):
-        DeckManager.move_cards(self.cards, self.destination, self.origin, index_destination=self.index_origin)
+        for position, cards in get_runs(self.cards, self.positions):
+            DeckManager.move_cards(cards, self.destination, self.origin, index_destination=position)
 
+    def size(self):
+        return 64 + 16 * len(self.cards)
 
-class Cut(Operation):
-    def __init__(self, move_cards: MoveCards):
-        self.cards = move_cards.cards
-        self.origin = move_cards.origin
-        self.index_origin = origin.cards.index(cards[0])
 
+class RemoveCards(Operation):
+    """
+    Removes cards and their related data (see DeckManager.remove_cards).
+    The records, box and target time of the cards are kept, to restore them on reverse.
+    """
+    def __init__(self, cards: [FlashCard], origin: Deck):
+        self.cards = list(cards)
+        self.origin = origin
+        self.positions = get_positions(self.cards, origin)
+        self.records = []
+        self.boxes = {}
+        self.target_times = {}
 
-class Copy(Operation):
-    def __init__(self, move_cards: MoveCards):
-        self.cards = move_cards.cards
-        self.origin = move_cards.origin
+    def execute(self):
+        keys = set(card.key for card in self.cards)
+        self.records = [record for record in DeckManager.get_historian(self.origin).records if record[1].key in keys]
+        scheduler, time_tracker = DeckManager.get_scheduler(self.origin), DeckManager.get_time_tracker(self.origin)
+        self.boxes = {key: scheduler.box[key] for key in keys if key in scheduler.box}
+        self.target_times = {key: time_tracker.target_time[key] for key in keys if key in time_tracker.target_time}
+        DeckManager.remove_cards(list(self.cards), self.origin)
 
+    def reverse(self):
+        for position, cards in get_runs(self.cards, self.positions):
+            self.origin.insert_cards(position, cards)
+        DeckManager.get_historian(self.origin).restore_records(self.records)
+        DeckManager.get_scheduler(self.origin).box.update(self.boxes)
+        DeckManager.get_time_tracker(self.origin).target_time.update(self.target_times)
+        DeckManager.index.add_cards(self.cards, self.origin)
+        # Records file needs to be rewritten on next save
+        DeckManager.moved_cards.add(self.origin.key)
 
-class Paste(Operation):
-    def __init__(self, move_cards: MoveCards):
-        self.cards = move_cards.cards
-        self.destination = move_cards.destination
-        self.index_destination = move_cards.index_destination
+    def size(self):
+        return 64 + 16 * len(self.cards) + 64 * len(self.records)
 
 
 class AddCards(Operation):
+    """
+    Inserts new cards in a deck. Reversing removes them with their related data.
+    """
     def __init__(self, cards: [FlashCard], destination: Deck, index_destination=None):
-        self.cards = cards
+        self.cards = list(cards)
         self.destination = destination
-        self.index_destination = index_destination
+        self.index_destination = len(destination) if index_destination is None else index_destination
 
     def execute(self):
-        self.destination.insert_cards(self.index_destination, card)
+        self.destination.insert_cards(self.index_destination, self.cards)
+        DeckManager.index.add_cards(self.cards, self.destination)
 
     def reverse(self):
-        self.destination.remove_cards(card)
+        DeckManager.remove_cards(list(self.cards), self.destination)
 
+    def size(self):
+        return 64 + sum(16 + len(card.question) + len(card.correction) for card in self.cards)
 
-class AddDeck(Operation):
-    def __init__(self, cards: [FlashCard], destination: Deck, index_destination=None):
-        self.cards = cards
-        self.destination = destination
-        self.index_destination = index_destination
+
+class OperationGroup(Operation):
+    """
+    Several operations done in one step. For instance, emptying the clipboard and cutting cards.
+    """
+    def __init__(self, operations: [Operation]):
+        self.operations = list(operations)
 
     def execute(self):
-        self.destination.insert_cards(self.index_destination, card)
+        for operation in self.operations:
+            operation.execute()
 
     def reverse(self):
-        self.destination.remove_cards(card)
+        for operation in reversed(self.operations):
+            operation.reverse()
+
+    def size(self):
+        return 64 + sum(operation.size() for operation in self.operations)
 
 
 class EditFlashCard(Operation):
+    """
+    Changes the question and correction of a flashcard. Consecutive edits of the same card are merged.
+    """
     def __init__(self, card: FlashCard, question: str, correction: str):
         self.card = card
+        self.old_question, self.old_correction = card.question, card.correction
         self.question, self.correction = question, correction
 
     def execute(self):
-        question_, correction_ = self.card.question, self.card.correction
-        self.card.question, self.card.correction = self.question, self.correction
-        self.question, self.correction = question_, correction_
+        self.card.set_content(self.question, self.correction)
+        DeckManager.index.update_card(self.card)
+
+    def reverse(self):
+        self.card.set_content(self.old_question, self.old_correction)
+        DeckManager.index.update_card(self.card)
+
+    def merge(self, operation: Operation) -> bool:
+        if not isinstance(operation, EditFlashCard) or operation.card is not self.card:
+            return False
+        self.question, self.correction = operation.question, operation.correction
+        return True
+
+    def size(self):
+        return 64 + len(self.question) + len(self.correction) + len(self.old_question) + len(self.old_correction)
+
+
+class ToggleEnabled(Operation):
+    """
+    Disables the enabled flashcards, and enables the disabled ones. Reversing toggles them again.
+    """
+    def __init__(self, cards: [FlashCard]):
+        self.cards = list(cards)
+
+    def execute(self):
+        for card in self.cards:
+            card.enabled = not card.enabled  # The decks are notified by the card
 
     def reverse(self):
         self.execute()
 
+    def size(self):
+        return 64 + 8 * len(self.cards)
+
 
 class EditDeckTitle(Operation):
+    """
+    Changes the title of a deck. Consecutive edits of the same deck's title are merged.
+    """
     def __init__(self, deck: Deck, title: str):
         self.deck = deck
+        self.old_title = deck.title
         self.title = title
 
     def execute(self):
-        title_ = self.deck.title
-        self.deck.title = self.title
-        self.title = title_
+        self.deck.set_title(self.title)
 
     def reverse(self):
-        self.execute()
+        self.deck.set_title(self.old_title)
+
+    def merge(self, operation: Operation) -> bool:
+        if not isinstance(operation, EditDeckTitle) or operation.deck is not self.deck:
+            return False
+        self.title = operation.title
+        return True
+
+    def size(self):
+        return 64 + len(self.title) + len(self.old_title)
@@ -1,3 +1,5 @@
 from .JSONEncoder import JSONEncoder
 from .JSONDecoder import JSONDecoder
+from .DeckSnapshot import DeckSnapshot
 from .DeckManager import DeckManager
+from .OperationHistorian import OperationHistorian
@@ -0,0 +1,166 @@
+from config import profile_directory
+from contextlib import contextmanager, nullcontext
+from datetime import datetime as dt
+from functools import wraps
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class Profiler:
+    """
+    Profiling mode of the app, enabled by the --profile option of app.py or the environment variable BYHEART_PROFILE.
+
+    Records:
+    - Phases: wall time of named steps (imports, deck load, history load, tree build...), with Profiler.phase(name).
+      Phases can be nested.
+    - Events: time elapsed since the start of the app when something first happened (first paint, first card
+      render...), with Profiler.mark(name).
+    - Calls: count and durations of the calls of the functions decorated by Profiler.timed.
+    Optionally, the memory allocated by Python during each phase (see tracemalloc, which slows the app down), and a
+    cProfile dump of the main thread.
+
+    write_report() writes the report in profile_directory (config.py), with the cProfile dump next to it.
+
+    When the profiling mode is off, Profiler.timed returns the function itself, and phase and mark do nothing: so
+    enable() has to be called before the modules using Profiler.timed are imported.
+    """
+    enabled: bool = False
+    # memory: True if the memory allocations are traced
+    memory: bool = False
+    # start: Time when profiling started, from time.perf_counter
+    start: float = 0.
+    # phases: (name, depth, start, duration, allocated) of each phase, in order of start. Times in seconds since start,
+    # allocated is the memory in bytes allocated by Python and not freed during the phase, or None.
+    phases: List[Tuple[str, int, float, float, int | None]] = []
+    # depth: Number of phases in progress in the main thread
+    depth: int = 0
+    # events: Time in seconds since start of the first occurrence of each event
+    events: Dict[str, float] = {}
+    # calls: Number of calls, total and maximum durations in seconds, by function name
+    calls: Dict[str, List] = {}
+    # cprofile: cProfile.Profile instance, if enabled
+    cprofile = None
+    lock = threading.Lock()
+
+    @staticmethod
+    def enable(memory: bool = False, cprofile: bool = False) -> None:
+        """
+        @param memory: If True, traces the memory allocated during each phase
+        @param cprofile: If True, profiles the main thread with cProfile
+        """
+        Profiler.enabled = True
+        Profiler.start = time.perf_counter()
+        Profiler.memory = memory
+        if memory:
+            import tracemalloc
+            tracemalloc.start()
+        if cprofile:
+            import cProfile
+            Profiler.cprofile = cProfile.Profile()
+            Profiler.cprofile.enable()
+
+    @staticmethod
+    def phase(name: str):
+        """
+        @return: Context manager recording the phase, if profiling is enabled
+        """
+        if not Profiler.enabled:
+            return nullcontext()
+        return Profiler.record_phase(name)
+
+    @staticmethod
+    @contextmanager
+    def record_phase(name: str):
+        if Profiler.memory:
+            import tracemalloc
+            allocated = tracemalloc.get_traced_memory()[0]
+        index = len(Profiler.phases)
+        start = time.perf_counter()
+        Profiler.phases.append((name, Profiler.depth, start - Profiler.start, 0., None))
+        Profiler.depth += 1
+        try:
+            yield
+        finally:
+            Profiler.depth -= 1
+            duration = time.perf_counter() - start
+            if Profiler.memory:
+                allocated = tracemalloc.get_traced_memory()[0] - allocated
+            else:
+                allocated = None
+            Profiler.phases[index] = (name, Profiler.depth, start - Profiler.start, duration, allocated)
+
+    @staticmethod
+    def mark(name: str) -> None:
+        """
+        Records the time of the first occurrence of the event, if profiling is enabled.
+        """
+        if Profiler.enabled and name not in Profiler.events:
+            Profiler.events[name] = time.perf_counter() - Profiler.start
+
+    @staticmethod
+    def timed(function: Callable) -> Callable:
+        """
+        Decorator recording the durations of the function's calls, if profiling was enabled when it was decorated.
+        """
+        if not Profiler.enabled:
+            return function
+        name = function.__qualname__
+
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                Profiler.add_call(name, time.perf_counter() - start)
+        return timed_function
+
+    @staticmethod
+    def add_call(name: str, duration: float) -> None:
+        with Profiler.lock:
+            calls = Profiler.calls.setdefault(name, [0, 0., 0.])
+            calls[0] += 1
+            calls[1] += duration
+            calls[2] = max(calls[2], duration)
+
+    @staticmethod
+    def get_report() -> str:
+        lines = ['Profile of %s' % dt.now().strftime('%d-%m-%Y %H:%M:%S'), '', 'Phases']
+        header = '%10s %10s' % ('start ms', 'ms')
+        if Profiler.memory:
+            header += ' %12s' % 'allocated KB'
+        lines.append(header + '  phase')
+        for name, depth, start, duration, allocated in Profiler.phases:
+            line = '%10.1f %10.1f' % (start * 1000, duration * 1000)
+            if Profiler.memory:
+                line += ' %12.0f' % (allocated / 1024)
+            lines.append(line + '  ' + '  ' * depth + name)
+        lines += ['', 'Events', '%10s  event' % 'ms']
+        for name, time_ in sorted(Profiler.events.items(), key=lambda item: item[1]):
+            lines.append('%10.1f  %s' % (time_ * 1000, name))
+        lines += ['', 'Calls', '%10s %10s %10s %10s  function' % ('count', 'total ms', 'mean ms', 'max ms')]
+        with Profiler.lock:
+            calls = sorted(Profiler.calls.items(), key=lambda item: -item[1][1])
+        for name, (count, total, maximum) in calls:
+            lines.append('%10d %10.1f %10.3f %10.1f  %s' % (count, total * 1000, total * 1000 / count,
+                                                             maximum * 1000, name))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def write_report() -> str | None:
+        """
+        Writes the report, and the cProfile dump if enabled, in profile_directory (config.py).
+        @return: Path of the report, or None if profiling is disabled
+        """
+        if not Profiler.enabled:
+            return None
+        os.makedirs(profile_directory, exist_ok=True)
+        path = os.path.join(profile_directory, 'profile-%s' % dt.now().strftime('%Y%m%d-%H%M%S'))
+        if Profiler.cprofile is not None:
+            Profiler.cprofile.disable()
+            Profiler.cprofile.dump_stats(path + '.prof')
+        with open(path + '.txt', 'w') as file:
+            file.write(Profiler.get_report())
+        return path + '.txt'
@@ -0,0 +1,186 @@
+from learn.deck import FlashCard
+from learn.cow import CowDict
+from config import checkpoint_directory
+from datetime import datetime as dt
+import json
+import os
+import threading
+from typing import Dict, List, Set
+
+
+class ExamCheckpoint:
+    """
+    Journal of an exam session, to resume it after an interruption: closed exam window, crash of the app...
+
+    The journal of a deck is a file of checkpoint_directory (config.py) with the .ckpt extension, with one json object
+    per line. Each line is an incremental checkpoint:
+    - records: Records added since the previous checkpoint, as [Date, CardKey, DurationSeconds, Success]
+    - box, target_time: Boxes and target times changed since the previous checkpoint, by card key
+    - box_removed, target_time_removed: Keys of the cards whose box or target time was removed
+    - pending: Key of the card picked but not returned yet, or None
+    The changes of boxes and target times are found by comparing the Scheduler and TargetTimeTracker dictionaries with
+    their snapshots at the previous checkpoint: only the parts changed since are compared (see CowDict.get_changes).
+    A line is appended by write(), only if something changed. A line cut by a crash is ignored.
+
+    restore() replays the journal on the deck's historian, scheduler and time tracker, and returns the pending card.
+    The journal is discarded once the deck is saved (see DeckManager.get_snapshot and discard), if it was restored or
+    written by this process: the journal of an interrupted session is kept until the session is resumed.
+    """
+    extension = '.ckpt'
+    date_format = '%d-%m-%Y %H:%M:%S'
+    # journals: Keys of the decks whose journal was restored or written by this process, so it's in the saved data
+    journals: Set[str] = set()
+    # lock: Prevents a journal from being discarded by the save thread while a checkpoint is written
+    lock = threading.Lock()
+
+    def __init__(self, examiner) -> None:
+        """
+        @param examiner: Examiner of the session
+        """
+        self.examiner = examiner
+        self.path = ExamCheckpoint.get_path(examiner.deck.key)
+        # self.records: Records added since the last checkpoint
+        self.records: List = []
+        # self.box, self.target_time: Snapshots of the boxes and target times at the last checkpoint
+        self.box = examiner.scheduler.box.snapshot()
+        self.target_time = examiner.time_tracker.target_time.snapshot()
+        # self.pending: Key of the pending card at the last checkpoint
+        self.pending: str | None = None
+
+    @staticmethod
+    def get_path(deck_key: str) -> str:
+        return os.path.join(checkpoint_directory, deck_key + ExamCheckpoint.extension)
+
+    def add_record(self, record) -> None:
+        """
+        Adds a record to the next checkpoint.
+        @param record: Record as a tuple (Date, Card, DurationSeconds, Success)
+        """
+        self.records.append(record)
+
+    def write(self, pending: FlashCard | None) -> bool:
+        """
+        Appends the changes since the last checkpoint to the journal, if any.
+        @param pending: Card picked but not returned yet
+        @return: True if a checkpoint was written
+        """
+        scheduler, time_tracker = self.examiner.scheduler, self.examiner.time_tracker
+        box, box_removed = scheduler.box.get_changes(self.box)
+        target_time, target_time_removed = time_tracker.target_time.get_changes(self.target_time)
+        checkpoint = {'records': [[dt.strftime(date, ExamCheckpoint.date_format), card.key, duration, success]
+                                  for date, card, duration, success in self.records],
+                      'box': box, 'target_time': target_time, 'box_removed': box_removed,
+                      'target_time_removed': target_time_removed}
+        checkpoint = {name: value for name, value in checkpoint.items() if value}
+        pending = None if pending is None else pending.key
+        with ExamCheckpoint.lock:
+            # The pending card is written again if the journal was discarded by a save
+            if not checkpoint and pending == self.pending and (pending is None or os.path.isfile(self.path)):
+                return False
+            checkpoint['pending'] = pending
+            with open(self.path, 'a') as file:
+                # Starting with a new line, so a line cut by a crash doesn't merge with this one
+                file.write('\n' + json.dumps(checkpoint))
+            ExamCheckpoint.journals.add(self.examiner.deck.key)
+        self.records = []
+        self.box, self.target_time = scheduler.box.snapshot(), time_tracker.target_time.snapshot()
+        self.pending = pending
+        return True
+
+    def restore(self) -> FlashCard | None:
+        """
+        Replays the journal on the historian, scheduler and time tracker of the session. Records already in the
+        historian are skipped, as well as cards no longer in the deck.
+        @return: The card pending when the journal was last written, if it's still in the deck
+        """
+        checkpoints = ExamCheckpoint.read(self.path)
+        if not checkpoints:
+            return None
+        ExamCheckpoint.journals.add(self.examiner.deck.key)
+        historian = self.examiner.historian
+        scheduler, time_tracker = self.examiner.scheduler, self.examiner.time_tracker
+        cards = {card.key: card for card in historian.deck}
+        records = []
+        for checkpoint in checkpoints:
+            for date, key, duration, success in checkpoint.get('records', []):
+                if key in cards:
+                    records.append((dt.strptime(date, ExamCheckpoint.date_format), cards[key], duration, success))
+        if records:
+            oldest = min(date for date, _, _, _ in records)
+            known = set()
+            for date, card, _, _ in reversed(historian.records):
+                if date < oldest:
+                    break
+                known.add((date, card.key))
+            records = [record for record in records if (record[0], record[1].key) not in known]
+            if records:
+                historian.restore_records(records)
+        ExamCheckpoint.replay(checkpoints, 'box', scheduler.box, cards)
+        ExamCheckpoint.replay(checkpoints, 'target_time', time_tracker.target_time, cards)
+        self.box, self.target_time = scheduler.box.snapshot(), time_tracker.target_time.snapshot()
+        pending = checkpoints[-1].get('pending')
+        self.pending = pending
+        return cards.get(pending) if pending is not None else None
+
+    @staticmethod
+    def replay(checkpoints: List[Dict], name: str, values: CowDict, cards: Dict[str, FlashCard]) -> None:
+        """
+        Applies the changes of the checkpoints to the boxes or target times.
+        @param name: 'box' or 'target_time'
+        @param values: Boxes or target times of the deck
+        @param cards: Cards of the deck by key. The values of the other cards aren't restored.
+        """
+        changed, removed = {}, set()
+        for checkpoint in checkpoints:
+            for key, value in checkpoint.get(name, {}).items():
+                changed[key] = value
+                removed.discard(key)
+            for key in checkpoint.get(name + '_removed', []):
+                changed.pop(key, None)
+                removed.add(key)
+        for key, value in changed.items():
+            if key in cards:
+                values[key] = value
+        for key in removed:
+            values.pop(key, None)
+
+    @staticmethod
+    def read(path: str) -> List[Dict]:
+        """
+        @return: Checkpoints of the journal
+        """
+        checkpoints = []
+        try:
+            with open(path, 'r') as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        checkpoints.append(json.loads(line))
+                    except ValueError:
+                        pass  # Line cut by a crash
+        except OSError:
+            pass
+        return checkpoints
+
+    @staticmethod
+    def get_size(deck_key: str) -> int | None:
+        """
+        @return: Size in bytes of the deck's journal, or None if there is none
+        """
+        try:
+            return os.path.getsize(ExamCheckpoint.get_path(deck_key))
+        except OSError:
+            return None
+
+    @staticmethod
+    def discard(deck_key: str, size: int | None) -> None:
+        """
+        Deletes the deck's journal once the deck is saved, if no checkpoint was written since the save started. Else,
+        the journal is kept to replay the last checkpoints: replaying the saved ones changes nothing. The journal of
+        another process's session, not restored yet, isn't in the saved data: it's kept too.
+        @param size: Size of the journal when the deck's data was taken for the save (see get_size)
+        """
+        with ExamCheckpoint.lock:
+            if deck_key in ExamCheckpoint.journals and size is not None and ExamCheckpoint.get_size(deck_key) == size:
+                os.remove(ExamCheckpoint.get_path(deck_key))
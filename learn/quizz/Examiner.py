@@ -1,6 +1,8 @@
-from learn.deck import FlashCard, Deck
-from learn.quizz import Historian, TargetTimeTracker, Scheduler, Picker
+from learn.deck import FlashCard, Deck, DeckView
+from learn.quizz import Historian, TargetTimeTracker, Scheduler, Picker, ExamCheckpoint
+from learn.profiling import Profiler
 import time
+from typing import List, Tuple
 
 
 class Examiner:
@@ -9,49 +11,123 @@ class Examiner:
 
     To do a review:
     - Call pick_card() to get a flashcard
+    - Call card_displayed() when the flashcard is visible to the user
     - During this card's review, you can know how much time has passed with get_duration()
     - Call return_card(...) with the review information to end the review and save it
 
     To know if a review is ongoing, call has_picked_card
+
+    The response time is measured with the monotonic clock time.perf_counter, from the call of card_displayed, so the
+    time to pick and display the card isn't counted as the user's. This render latency, between pick_card and
+    card_displayed, is recorded separately (see render_latencies). Without call of card_displayed, the response time is
+    measured from pick_card.
+
+    With checkpoint=True, the session is journaled to be resumed if interrupted (see ExamCheckpoint): a checkpoint is
+    written at each pick and return of a card, and by end(). Call save_checkpoint() to write one periodically. When the
+    examiner is created, the journal of a previous session on the deck is replayed, and its pending card is picked
+    first.
     """
 
-    def __init__(self, deck: Deck, historian: Historian, time_tracker: TargetTimeTracker, scheduler: Scheduler) -> None:
+    def __init__(self, deck: Deck | DeckView, historian: Historian, time_tracker: TargetTimeTracker,
+                 scheduler: Scheduler, checkpoint: bool = False) -> None:
         """
-        @param deck: Deck to pick flashcards from.
+        @param deck: Deck to pick flashcards from. Can be a DeckView, to review a subset of a deck.
+        @param checkpoint: If True, the session is journaled, and a previous session on the deck is resumed
         """
-        self.deck: Deck = deck
+        self.deck: Deck | DeckView = deck
         self.historian = historian
         self.time_tracker = time_tracker
         self.scheduler = scheduler
         self.picker: Picker = Picker(self.deck, self.historian, self.time_tracker, self.scheduler)
-        # start: Time at which the current FlashCard was given. If none, contains 0
+        # start: Time at which the current FlashCard was displayed, or picked if not displayed yet. If none, contains 0
         self.start: float = 0
+        # displayed: True if card_displayed was called for the current FlashCard
+        self.displayed: bool = False
+        # render_latencies: Durations in seconds between the pick and the display of the flashcards, with their keys
+        self.render_latencies: List[Tuple[str, float]] = []
+        self.card: FlashCard | None = None
+        # checkpoint: Journal of the session, or None if it's not journaled
+        self.checkpoint: ExamCheckpoint | None = None
+        # pending_card: Card of an interrupted session, picked first
+        self.pending_card: FlashCard | None = None
+        if checkpoint:
+            self.checkpoint = ExamCheckpoint(self)
+            pending_card = self.checkpoint.restore()
+            if pending_card is not None and pending_card in self.deck:
+                self.pending_card = pending_card
 
     def pick_card(self) -> FlashCard:
         """
         @return: Picked FlashCard
         """
-        card = self.picker.pick_card()
-        self.start = time.time()
+        if self.pending_card is not None and self.pending_card in self.deck:
+            card = self.pending_card
+        else:
+            card = self.picker.pick_card()
+        self.pending_card = None
+        self.start = time.perf_counter()
+        self.displayed = False
+        self.card = card
+        self.save_checkpoint()
         return card
 
+    def card_displayed(self) -> None:
+        """
+        Starts the response time of the picked card, and records the render latency. Only the first call after the
+        pick is taken into account.
+        """
+        if self.start == 0 or self.displayed:
+            return
+        now = time.perf_counter()
+        self.render_latencies.append((self.card.key, now - self.start))
+        self.start = now
+        self.displayed = True
+
+    def get_render_latency(self) -> float | None:
+        """
+        @return: Average render latency in seconds of the displayed flashcards, or None if there is none
+        """
+        if not self.render_latencies:
+            return None
+        return sum(latency for _, latency in self.render_latencies) / len(self.render_latencies)
+
     def get_duration(self) -> float:
         """
-        @return: Duration in seconds since current card was picked
+        @return: Duration in seconds since current card was displayed, or picked if it's not displayed yet
         """
-        return time.time() - self.start
+        return time.perf_counter() - self.start
 
-    def return_card(self, card: FlashCard, success: bool) -> None:
+    @Profiler.timed
+    def return_card(self, card: FlashCard, success: bool, duration: float | None = None) -> None:
         """
         Saves a record for the picked card and reinitializes start time.
         @param card: The flashcard that was being evaluated.
         @param success: True if the response to the flashcard's question was correct.
+        @param duration: Response time in seconds to record instead of the measured one, for replayed sessions
         """
-        self.historian.add_record(card, self.get_duration(), success)
+        self.historian.add_record(card, self.get_duration() if duration is None else duration, success)
         self.start = 0
+        self.displayed = False
+        if self.checkpoint is not None:
+            self.checkpoint.add_record(self.historian.records[-1])
+            self.save_checkpoint()
+
+    @Profiler.timed
+    def save_checkpoint(self) -> bool:
+        """
+        Writes a checkpoint of the session if it's journaled and something changed since the last one.
+        @return: True if a checkpoint was written
+        """
+        if self.checkpoint is None:
+            return False
+        return self.checkpoint.write(self.card if self.has_picked_card() else self.pending_card)
 
     def end(self) -> None:
-        """Writes the flashcards' response records, target times, and interval boxes"""
+        """
+        Ends the session. If it's journaled, writes a last checkpoint: the card being reviewed, if any, is pending in
+        the journal, to be picked first when the session is resumed.
+        """
+        self.save_checkpoint()
         self.start = 0
 
     def has_picked_card(self) -> bool:
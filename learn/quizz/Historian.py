@@ -1,9 +1,13 @@
 from learn.deck import FlashCard, Deck
 import hashlib
 import os
-from datetime import datetime as dt
-import pandas as pd
+from datetime import datetime as dt, timedelta
 from config import records_directory
+from learn.pack import DataPack
+from learn.cow import CowList
+from learn.profiling import Profiler
+from io import StringIO
+import csv
 from typing import List, Tuple, Dict
 
 
@@ -17,14 +21,24 @@ class Historian:
     - Save flashcard review records
     - Get records in Pandas DataFrame format
     - Write records to a csv file
-    - Read records from csv file to Pandas DataFrame
+    - Read records from csv file
+
+    The csv files are read and written with the csv module: pandas is only imported by get_records, as it takes most of
+    the app's import time.
 
     This class' methods don't take any file path as argument.
     The directories where records are stored are defined in config.py.
 
     There's one record file per deck.
     Given a deck with key 'deck_key', the record file will be named 'deck_key.csv'
+
+    Records are stored in a CowList: records.snapshot() is a frozen copy taken in O(1), to write from another thread.
+    The date of the last record of each card is kept up to date by the methods adding and removing records, so it's
+    found without going through the records (see get_last_review_date).
     """
+    # columns: Header of the records files
+    columns = ['Date', 'CardKey', 'DurationSeconds', 'Success']
+    date_format = '%d-%m-%Y %H:%M:%S'
 
     def __init__(self, deck: Deck) -> None:
         # One record is defined a tuple of 4 variables:
@@ -32,24 +46,70 @@ class Historian:
         # - Card: FlashCard object.
         # - DurationSeconds: Time taken to answer flashcard.
         # - Success: Boolean for the correctness of the answer.
-        self.records: List[Tuple[dt, FlashCard, float, bool]] = self.read_records(deck).to_numpy().tolist()
+        self.records: CowList = CowList(self.read_records(deck))
         self.deck: Deck = deck
+        # self.last_reviews: Date of the last record of each card, by card key
+        self.last_reviews: Dict[str, dt] = {}
+        self.update_last_reviews(self.records)
+        # self.last_save: Date of the records added since the records file was read. After the last read record, which
+        # can be dated in the current second if the file was just written, by another session for instance.
         self.last_save = dt.now().replace(microsecond=0)
+        if self.records and self.records[-1][0] >= self.last_save:
+            self.last_save = self.records[-1][0] + timedelta(seconds=1)
+        # self.rewrite: True if records older than last_save were added, so the records file needs to be rewritten
+        self.rewrite = False
 
     def add_record(self, card: FlashCard, duration: float, success: bool) -> None:
         """
-        Saves a flashcard test. Duration in rounded to the tenth of second, and datetime of test to the second.
+        Saves a flashcard test. Duration in rounded to the tenth of second, and datetime of test to the second, not
+        before last_save so that the record is saved.
         @param card: The flashcard that was being tested
         @param duration: Duration in seconds of the test
         @param success: True if the response to the flashcard was correct, False otherwise
         """
-        self.records.append((dt.now().replace(microsecond=0), card, round(duration, 1), success))
+        self.records.append((max(dt.now().replace(microsecond=0), self.last_save), card, round(duration, 1), success))
+        self.last_reviews[card.key] = self.records[-1][0]
 
-    def add_records(self, records: pd.DataFrame):
-        self.records.extend(records.to_numpy().tolist())
+    def add_records(self, records: 'pd.DataFrame'):
+        records = records.to_numpy().tolist()
+        self.records.extend(records)
         self.records.sort(key=lambda x: x[0])
+        self.update_last_reviews(records)
+        self.rewrite = True
+
+    def restore_records(self, records: List[Tuple[dt, FlashCard, float, bool]]) -> None:
+        """
+        Adds back records that were removed, for instance when undoing the removal of cards, or that weren't saved
+        (see ExamCheckpoint).
+        @param records: Records as tuples (Date, Card, DurationSeconds, Success)
+        """
+        self.records.extend(records)
+        self.records.sort(key=lambda x: x[0])
+        self.update_last_reviews(records)
+        self.rewrite = True
+
+    def update_last_reviews(self, records) -> None:
+        """
+        @param records: Records added, in any order
+        """
+        last_reviews = self.last_reviews
+        for date, card, _, _ in records:
+            if card.key not in last_reviews or last_reviews[card.key] < date:
+                last_reviews[card.key] = date
+
+    def get_last_review_dates(self) -> Dict[str, dt]:
+        """
+        @return: Dictionary between card key and date of its last record, copied so it doesn't change with the records
+        """
+        return dict(self.last_reviews)
+
+    def get_last_review_date(self, card: FlashCard) -> dt | None:
+        """
+        @return: Date of the last record of the card, or None if it has no record
+        """
+        return self.last_reviews.get(card.key)
 
-    def get_records(self) -> pd.DataFrame:
+    def get_records(self) -> 'pd.DataFrame':
         """
         The returned dataframe has 4 fields:
         - Date: Date of creation of the record, as datetime object.
@@ -58,7 +118,8 @@ class Historian:
         - Success: Boolean for the correctness of the answer.
         @return: The dataframe of all the flashcards' records for the current deck.
         """
-        return pd.DataFrame(self.records, columns=['Date', 'Card', 'DurationSeconds', 'Success'])
+        import pandas as pd
+        return pd.DataFrame(list(self.records), columns=['Date', 'Card', 'DurationSeconds', 'Success'])
 
     def save(self, iterate=True) -> None:
         """
@@ -68,23 +129,40 @@ class Historian:
         @param iterate: If True, adds records created after this instance creation to file.
         Else, overwrites file with all records
         """
-        df = self.get_records()
-        df = df.loc[df['Date'] >= self.last_save] if iterate else df
-        # Casting object columns to text
-        df['Date'] = df['Date'].map(lambda dt_obj: dt.strftime(dt_obj, '%d-%m-%Y %H:%M:%S'))
-        # from tabulate import tabulate
-        # print(tabulate(df, headers=df.columns))
-        df['Card'] = df['Card'].map(lambda card: card.key)
-        df = df.rename(columns={'Card': 'CardKey'})
-
-        # Writing records to file
-        file_path = os.path.join(records_directory, self.deck.key + '.csv')
-        if iterate:
-            # noinspection PyTypeChecker
-            df.to_csv(file_path, header=(not os.path.isfile(file_path)), index=False, mode='a')
-        else:
-            # noinspection PyTypeChecker
-            df.to_csv(file_path, index=False)
+        Historian.write_records(self.deck.key, self.get_records_to_save(iterate), iterate)
+
+    def get_records_to_save(self, iterate=True) -> List[Tuple[dt, str, float, bool]]:
+        """
+        @param iterate: See save
+        @return: Copy of the records written by save, with card keys instead of FlashCard objects. To be written later
+        or by another thread with write_records.
+        """
+        return Historian.select_records(self.records, self.last_save if iterate else None)
+
+    @staticmethod
+    def select_records(records: CowList, since: dt | None = None) -> List[Tuple[dt, str, float, bool]]:
+        """
+        @param records: Records of a deck, or a snapshot of them
+        @param since: If not None, only the records created since this date are selected
+        @return: The records to write with write_records, with card keys instead of FlashCard objects
+        """
+        return [(date, card.key, duration, success) for date, card, duration, success in records
+                if since is None or date >= since]
+
+    @staticmethod
+    def write_records(deck_key: str, records: List[Tuple[dt, str, float, bool]], iterate=True) -> None:
+        """
+        Writes records returned by get_records_to_save to the csv file of the deck. See save.
+        """
+        file_path = os.path.join(records_directory, deck_key + '.csv')
+        header = not iterate or not os.path.isfile(file_path)
+        with open(file_path, 'a' if iterate else 'w', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            if header:
+                writer.writerow(Historian.columns)
+            writer.writerows((dt.strftime(date, Historian.date_format), key, duration, success)
+                             for date, key, duration, success in records)
+        DataPack.invalidate()
 
     @staticmethod
     def get_card(key: str, deck: Deck, dict_card: Dict[str, FlashCard] = None) -> FlashCard | None:
@@ -103,7 +181,8 @@ class Historian:
         raise Exception('Key %s is not in Deck %s' % (key, deck))
 
     @staticmethod
-    def read_records(deck: Deck) -> pd.DataFrame:
+    @Profiler.timed
+    def read_records(deck: Deck) -> List[Tuple[dt, FlashCard, float, bool]]:
         """
         Reads the deck's flashcards' records from csv file.
         One record is defined a tuple of 4 variables:
@@ -111,16 +190,23 @@ class Historian:
         - Card: FlashCard object.
         - DurationSeconds: Time taken to answer flashcard.
         - Success: Boolean for the correctness of the answer.
+        The data pack is used if it contains the file.
         """
         # noinspection PyTypeChecker
         path: str = os.path.join(records_directory, deck.key + '.csv')
-        if not os.path.isfile(path):
-            return pd.DataFrame({'Date': [], 'Card': [], 'DurationSeconds': [], 'Success': []})
-        df = pd.read_csv(path).rename(columns={'CardKey': 'Card'})
-        df['Date'] = df['Date'].map(lambda dt_str: dt.strptime(dt_str, '%d-%m-%Y %H:%M:%S'))
+        packed = DataPack.read(path)
+        if packed is not None:
+            rows = list(csv.reader(StringIO(packed)))
+        elif os.path.isfile(path):
+            with open(path, 'r', newline='') as file:
+                rows = list(csv.reader(file))
+        else:
+            return []
         dict_card = {}
-        df['Card'] = df['Card'].map(lambda key: Historian.get_card(key, deck, dict_card))
-        return df
+        # Durations are read as pandas did: integers if written as such
+        return [(dt.strptime(date, Historian.date_format), Historian.get_card(key, deck, dict_card),
+                 int(duration) if duration.isdigit() else float(duration), success == 'True')
+                for date, key, duration, success in rows[1:]]
 
     def delete(self):
         """Deletes the deck's records file"""
@@ -128,9 +214,12 @@ class Historian:
         path: str = os.path.join(records_directory, self.deck.key + '.csv')
         if os.path.isfile(path):
             os.remove(path)
+            DataPack.invalidate()
 
     def remove_cards(self, cards: [FlashCard]):
-        self.records = list(filter(lambda record: record[1] not in cards, self.records))
+        self.records = CowList(filter(lambda record: record[1] not in cards, self.records))
+        for card in cards:
+            self.last_reviews.pop(card.key, None)
 
     def remove_card(self, card: FlashCard):
         self.remove_cards([card])
@@ -1,11 +1,11 @@
 import random
-import pandas as pd
-from learn.deck import Deck, FlashCard
+from learn.deck import Deck, DeckView, FlashCard
 from learn.quizz import Historian, TargetTimeTracker, Scheduler
 from random import choice
 import json
 import os
 from datetime import datetime
+from learn.profiling import Profiler
 from config import sample_size, warmup_size, factor_max
 
 total_size = sample_size + warmup_size
@@ -19,13 +19,14 @@ class Picker:
     the lower score. Call this method each time a new record is added, otherwise it won't work properly.
     """
 
-    def __init__(self, deck: Deck, historian: Historian, time_tracker: TargetTimeTracker, scheduler: Scheduler) -> None:
+    def __init__(self, deck: Deck | DeckView, historian: Historian, time_tracker: TargetTimeTracker,
+                 scheduler: Scheduler) -> None:
         self.deck = deck
         self.historian = historian
         self.time_tracker = time_tracker
         self.scheduler = scheduler
 
-    def score(self, card: FlashCard, records: pd.DataFrame = None) -> int:
+    def score(self, card: FlashCard, records: 'pd.DataFrame' = None) -> int:
         """
         Gets the score for a card. Also manages the target response time.
 
@@ -74,7 +75,7 @@ class Picker:
                 return 3  # Exceeded target time on last streak
             return 4
 
-    def score_last_card(self, records_card: pd.DataFrame) -> int | None:
+    def score_last_card(self, records_card: 'pd.DataFrame') -> int | None:
         """
         Calculates the score for a card when it was the last picked card.
         @param records_card: Records filtered for that card.
@@ -109,6 +110,7 @@ class Picker:
             self.set_target_time(card, None)
             return -1
 
+    @Profiler.timed
     def pick_card(self):
         """
         Attributes a score to each card and picks the one with the lower score.
@@ -128,7 +130,28 @@ class Picker:
             card = scores[0][0]
         return card
 
-    def lt_target_time(self, record_card: pd.Series) -> bool:
+    @Profiler.timed
+    def rank_cards(self) -> [FlashCard]:
+        """
+        Estimates the order in which the cards are likely to be picked, for instance to prepare them in advance.
+
+        Unlike pick_card, it doesn't score the cards, so it's fast and has no side effect on the target times and
+        boxes. The order is:
+        - Cards without target time, in alphabetical order of their keys, as pick_card picks them
+        - Other cards, by date of next scheduled review: cards late for review first
+        """
+        last_dates = self.historian.get_last_review_dates()
+        no_target_time, scheduled = [], []
+        for card in self.deck:
+            if self.get_target_time(card) is None or card.key not in last_dates:
+                no_target_time.append(card)
+            else:
+                scheduled.append((last_dates[card.key] + self.scheduler.get_interval(card), card))
+        no_target_time.sort(key=lambda card: card.key)
+        scheduled.sort(key=lambda x: x[0])
+        return no_target_time + [card for _, card in scheduled]
+
+    def lt_target_time(self, record_card: 'pd.Series') -> bool:
         """
         @return: True if record beneath target time.
         @param record_card: Series with fields 'Date', 'Card', 'DurationSeconds' and 'Success'
@@ -136,7 +159,7 @@ class Picker:
         target_time = self.get_target_time(record_card['Card'])
         return record_card['DurationSeconds'] < 2 * target_time - target_time * factor_max
 
-    def gt_target_time(self, record_card: pd.Series):
+    def gt_target_time(self, record_card: 'pd.Series'):
         """
         @return: True if record exceeded target time.
         @param record_card: Series with fields 'Date', 'Card', 'DurationSeconds' and 'Success'
@@ -145,7 +168,7 @@ class Picker:
         return record_card['DurationSeconds'] > target_time * factor_max
 
     @staticmethod
-    def last_sample_success(records_card: pd.DataFrame) -> bool:
+    def last_sample_success(records_card: 'pd.DataFrame') -> bool:
         """
         @return: True if last 'sample_size' success values are true
         @param records_card: Dataframe with fields 'Date', 'Card', 'DurationSeconds' and 'Success' for one card
@@ -153,7 +176,7 @@ class Picker:
         return records_card.iloc[-sample_size:]['Success'].sum() == sample_size
 
     @staticmethod
-    def get_last_streak(records_card: pd.DataFrame) -> pd.DataFrame:
+    def get_last_streak(records_card: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         @return: Filtered dataframe for last records that were registered in a row.
         @param records_card: Dataframe with fields 'Date', 'Card', 'DurationSeconds' and 'Success' for one card
@@ -163,7 +186,7 @@ class Picker:
             count += 1
         return records_card.iloc[-count:]
 
-    def init_target_time(self, records_card: pd.DataFrame) -> None:
+    def init_target_time(self, records_card: 'pd.DataFrame') -> None:
         """
         Recalculates the target time, as the average of the last 'sample_size' records duration
         @param records_card: Dataframe with fields 'Date', 'Card', 'DurationSeconds' and 'Success' for one card
@@ -188,6 +211,8 @@ class Picker:
 
 
 if __name__ == '__main__':
+    import pandas as pd
+
     df = pd.DataFrame({'Success': [True, False, True, False, True, True, True], 'Card': [1]*7})
     print(df['Success'].iloc[-3:].sum())
     df.apply(lambda x: print(x), axis=1)
@@ -0,0 +1,70 @@
+from bisect import bisect_left, insort
+from typing import Dict, List
+
+
+class ReviewAggregate:
+    """
+    Incrementally maintained summary of the next reviews of a deck's enabled flashcards:
+    - The minimum number of days until next review (see get_min)
+    - The number of due cards: cards never reviewed, or whose next review is today or late (see due_count)
+
+    The days of each card are set with set_days and removed with discard, in O(log N): the aggregate counts the cards
+    by number of days, and keeps the distinct numbers of days sorted.
+    """
+
+    def __init__(self, days: Dict[str, int | None] = None) -> None:
+        """
+        @param days: Dictionary between card key and days until next review (None if never reviewed)
+        """
+        # self.days: Dictionary between card key and days until next review
+        self.days: Dict[str, int | None] = {}
+        # self.counts: Dictionary between number of days and number of cards with those days until next review
+        self.counts: Dict[int, int] = {}
+        # self.sorted_days: Numbers of days of self.counts, sorted
+        self.sorted_days: List[int] = []
+        # self.due_count: Number of cards never reviewed or with 0 or less days until next review
+        self.due_count = 0
+        for key, card_days in (days or {}).items():
+            self.set_days(key, card_days)
+
+    def set_days(self, key: str, days: int | None) -> None:
+        """
+        Sets the days until next review of a card, replacing its previous value if it had one.
+        @param key: Key of the card
+        @param days: Days until next review, or None if the card was never reviewed
+        """
+        self.discard(key)
+        self.days[key] = days
+        if days is None or days <= 0:
+            self.due_count += 1
+        if days is None:
+            return
+        if days not in self.counts:
+            self.counts[days] = 0
+            insort(self.sorted_days, days)
+        self.counts[days] += 1
+
+    def discard(self, key: str) -> None:
+        """
+        Removes a card from the aggregate, for instance when it's disabled or removed from the deck.
+        """
+        if key not in self.days:
+            return
+        days = self.days.pop(key)
+        if days is None or days <= 0:
+            self.due_count -= 1
+        if days is None:
+            return
+        self.counts[days] -= 1
+        if self.counts[days] == 0:
+            del self.counts[days]
+            del self.sorted_days[bisect_left(self.sorted_days, days)]
+
+    def get_min(self) -> int | None:
+        """
+        @return: Minimum days until next review of the cards, or None if no card was reviewed
+        """
+        return self.sorted_days[0] if self.sorted_days else None
+
+    def __len__(self):
+        return len(self.days)
@@ -1,5 +1,7 @@
 from learn.deck import Deck, FlashCard
 from config import picker_directory, intervals
+from learn.pack import DataPack
+from learn.cow import CowDict
 import os
 import json
 from typing import Dict
@@ -20,6 +22,8 @@ class Scheduler:
 
     Flashcard-box associations are saved as json dictionaries, with the .box extension, in the picker_directory
     (defined in config.py)
+
+    Boxes are stored in a CowDict: box.snapshot() is a frozen copy taken in O(1), to write from another thread.
     """
     def __init__(self, deck: Deck):
         """
@@ -27,7 +31,7 @@ class Scheduler:
         """
         self.deck = deck
         # box: Dictionary between flashcard key and box number
-        self.box: Dict[str, int] = self.read_interval_boxes(self.deck)
+        self.box: CowDict = CowDict(self.read_interval_boxes(self.deck))
         for card in self.deck:
             if self.get_interval(card) is None:
                 self.reset_box(card)
@@ -83,16 +87,28 @@ class Scheduler:
         """
         Saves the flashcards' boxes to the picker_directory (defined in config.py) with the .box extension.
         """
-        with open(os.path.join(picker_directory, self.deck.key + '.box'), 'w') as file:
-            json.dump(self.box, file)
+        Scheduler.write_boxes(self.deck.key, self.box)
+
+    @staticmethod
+    def write_boxes(deck_key: str, box: CowDict) -> None:
+        """
+        Writes boxes to the .box file of a deck. Used to save a snapshot of the boxes from another thread.
+        """
+        with open(os.path.join(picker_directory, deck_key + '.box'), 'w') as file:
+            json.dump(dict(box.items()), file)
+        DataPack.invalidate()
 
     @staticmethod
     def read_interval_boxes(deck: Deck) -> Dict[str, int]:
         """
         @param deck: Deck for which reading the interval boxes
         Reads the flashcards' boxes from the picker_directory (defined in config.py) with the .box extension.
+        The data pack is used if it contains the file.
         """
         file_path = os.path.join(picker_directory, deck.key + '.box')
+        packed = DataPack.read(file_path)
+        if packed is not None:
+            return json.loads(packed)
         if not os.path.isfile(file_path):
             return {}
         with open(file_path, 'r') as file:
@@ -114,3 +130,4 @@ class Scheduler:
         file_path = os.path.join(picker_directory, self.deck.key + '.box')
         if os.path.isfile(file_path):
             os.remove(file_path)
+            DataPack.invalidate()
@@ -1,5 +1,7 @@
 from learn.deck import Deck, FlashCard
 from config import picker_directory
+from learn.pack import DataPack
+from learn.cow import CowDict
 import os
 import json
 from typing import Dict
@@ -16,11 +18,14 @@ class TargetTimeTracker:
 
     Flashcard-target time associations are saved as json dictionaries, with the .ttm extension, in the picker_directory
     (defined in config.py)
+
+    Target times are stored in a CowDict: target_time.snapshot() is a frozen copy taken in O(1), to write from another
+    thread.
     """
     def __init__(self, deck: Deck):
         self.deck = deck
         # target_time: Dictionary between flashcard key and target time in seconds
-        self.target_time: Dict[str, float] = self.read_target_times(self.deck)
+        self.target_time: CowDict = CowDict(self.read_target_times(self.deck))
 
     def get_target_time(self, card: FlashCard) -> float | None:
         """
@@ -41,16 +46,28 @@ class TargetTimeTracker:
         """
         Saves the flashcards' target times to the picker_directory (defined in config.py) with the .ttm extension.
         """
-        with open(os.path.join(picker_directory, self.deck.key + '.ttm'), 'w') as file:
-            json.dump(self.target_time, file)
+        TargetTimeTracker.write_target_times(self.deck.key, self.target_time)
+
+    @staticmethod
+    def write_target_times(deck_key: str, target_time: CowDict) -> None:
+        """
+        Writes target times to the .ttm file of a deck. Used to save a snapshot of the target times from another thread.
+        """
+        with open(os.path.join(picker_directory, deck_key + '.ttm'), 'w') as file:
+            json.dump(dict(target_time.items()), file)
+        DataPack.invalidate()
 
     @staticmethod
     def read_target_times(deck: Deck) -> Dict[str, float]:
         """
         @param deck: Deck for which reading the target times
         Reads the flashcards' target times from the picker_directory (defined in config.py) with the .ttm extension.
+        The data pack is used if it contains the file.
         """
         file_path = os.path.join(picker_directory, deck.key + '.ttm')
+        packed = DataPack.read(file_path)
+        if packed is not None:
+            return json.loads(packed)
         if not os.path.isfile(file_path):
             return {}
         with open(file_path, 'r') as file:
@@ -63,6 +80,7 @@ class TargetTimeTracker:
         file_path = os.path.join(picker_directory, self.deck.key + '.ttm')
         if os.path.isfile(file_path):
             os.remove(file_path)
+            DataPack.invalidate()
 
     def remove_card(self, card: FlashCard):
         self.remove_cards([card])
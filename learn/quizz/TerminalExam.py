@@ -0,0 +1,127 @@
+from learn.quizz import Examiner
+import html
+import re
+import sys
+from typing import List, TextIO, Tuple
+
+# img_pattern: Lines of images, displayed as 'file:///' lines in the app (see format_content)
+img_pattern = re.compile("file:///(.+)(\n|$)")
+line_break_pattern = re.compile(r'<br\s*/?>|</p>|</div>', re.IGNORECASE)
+tag_pattern = re.compile(r'</?[A-Za-z][^<>]*>')
+
+
+class TerminalExam:
+    """
+    Exam on a deck in a terminal, the headless counterpart of QtExam. See python -m learn.
+
+    - run() is the interactive session: the question of each picked card is printed as plain text (see to_text), the
+    user presses Enter to see the correction, then answers whether it was correct. The response time is measured until
+    the correction is shown.
+    - replay(answers) is a non-interactive session: each answer is the success of a picked card, and optionally its
+    response time. For instance, to script load tests.
+
+    The session is driven by an Examiner, created and saved by the caller (see DeckManager).
+    """
+    # answers: Accepted answers, by success
+    answers = {True: ('y', 'yes', 'pass', '1'), False: ('n', 'no', 'fail', '0')}
+
+    def __init__(self, examiner: Examiner, input_file: TextIO = sys.stdin, output_file: TextIO = sys.stdout) -> None:
+        self.examiner = examiner
+        self.input_file = input_file
+        self.output_file = output_file
+
+    @staticmethod
+    def to_text(content: str) -> str:
+        """
+        @param content: Question or correction of a flashcard, which can contain HTML elements
+        @return: The content as plain text: without HTML tags, and with the images as '[Image: path]'. Latex expressions
+        are kept between $$.
+        """
+        content = img_pattern.sub(lambda match: '[Image: %s]%s' % match.groups(), content)
+        content = line_break_pattern.sub('\n', content)
+        return html.unescape(tag_pattern.sub('', content))
+
+    def write(self, text: str) -> None:
+        self.output_file.write(text)
+        self.output_file.flush()
+
+    def read(self, prompt: str) -> str | None:
+        """
+        @return: The line entered by the user, lower case and stripped, or None at the end of the input
+        """
+        self.write(prompt)
+        line = self.input_file.readline()
+        return line.strip().lower() if line else None
+
+    def run(self) -> int:
+        """
+        Reviews cards until the user quits, with q or Ctrl+C, or the input ends. The card being reviewed when the user
+        quits isn't recorded.
+        @return: Number of reviewed cards
+        """
+        reviewed = 0
+        try:
+            while True:
+                card = self.examiner.pick_card()
+                self.write('\n[%d] Question:\n%s\n' % (reviewed + 1, self.to_text(card.question)))
+                self.examiner.card_displayed()
+                if self.read('Press Enter to show the correction (q to quit) ') in (None, 'q'):
+                    break
+                duration = self.examiner.get_duration()
+                self.write('Correction:\n%s\n' % self.to_text(card.correction))
+                success = self.read_success()
+                if success is None:
+                    break
+                self.examiner.return_card(card, success, duration)
+                reviewed += 1
+        except KeyboardInterrupt:
+            pass
+        self.examiner.end()
+        return reviewed
+
+    def read_success(self) -> bool | None:
+        """
+        @return: True if the user answered the card correctly, or None if they quit
+        """
+        while True:
+            answer = self.read('Correct? [y]es / [n]o / [q]uit ')
+            if answer in (None, 'q'):
+                return None
+            for success, answers in TerminalExam.answers.items():
+                if answer in answers:
+                    return success
+
+    def replay(self, answers: List[Tuple[bool, float | None]]) -> int:
+        """
+        Picks a card for each answer and records it, without input.
+        @param answers: Success of each picked card, and response time in seconds or None to record the measured one
+        @return: Number of reviewed cards
+        """
+        for success, duration in answers:
+            card = self.examiner.pick_card()
+            self.examiner.card_displayed()
+            self.examiner.return_card(card, success, duration)
+        self.examiner.end()
+        return len(answers)
+
+    @staticmethod
+    def read_answers(file: TextIO) -> List[Tuple[bool, float | None]]:
+        """
+        Reads the answers of replay. Each line is an answer: 'pass' or 'fail' (or y/n, 1/0), optionally followed by the
+        response time in seconds, like 'pass 3.5'. Empty lines and lines starting with # are ignored.
+        """
+        answers = []
+        for line_no, line in enumerate(file, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            success = [success for success, values in TerminalExam.answers.items() if fields[0].lower() in values]
+            error = ValueError("Line %d: expected 'pass' or 'fail', and an optional duration" % line_no)
+            if not success or len(fields) > 2:
+                raise error
+            try:
+                duration = float(fields[1]) if len(fields) > 1 else None
+            except ValueError:
+                raise error from None
+            answers.append((success[0], duration))
+        return answers
@@ -2,4 +2,7 @@ from .TargetTimeTracker import TargetTimeTracker
 from .Scheduler import Scheduler
 from .Picker import Picker
 from .Historian import Historian
+from .ExamCheckpoint import ExamCheckpoint
 from .Examiner import Examiner
+from .ReviewAggregate import ReviewAggregate
+from .TerminalExam import TerminalExam
@@ -0,0 +1,168 @@
+from config import asset_cache_directory, asset_display_size
+from learn.profiling import Profiler
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Dict, List
+
+
+class AssetCache:
+    """
+    Store of the images displayed in flashcards, at display size.
+
+    Call get_url(path) for a 'file:///path' line of a flashcard (see format_content): the first time, the image is
+    read, and its display version is written in asset_cache_directory (config.py), named after the digest of the
+    image's content. Images larger than asset_display_size (config.py) are scaled down with Pillow, the others are
+    copied as is. So QtWebEngine doesn't decode and scale the original photos each time a card is displayed.
+
+    The sources are tracked by modification time and size, so only a stat of the source is needed once its display
+    version exists: get_signature(path) is part of the RenderCache keys of the contents with images, so a changed image
+    gets new pages. A source that is missing is displayed from the store if it was stored before.
+
+    The index of the stored sources is read on first use, and written by save(). Display versions are content
+    addressed, so several processes can add the same image (see PreRenderer): they write the same file.
+    """
+    directory: str = asset_cache_directory
+    display_size: (int, int) = asset_display_size
+    # entries: [modification time in ns, size, display file name] by source path
+    entries: Dict[str, List] | None = None
+    # modified: True if the entries changed since they were read or written
+    modified: bool = False
+    lock = threading.RLock()
+
+    @staticmethod
+    def get_source(path: str) -> str:
+        """
+        @param path: Path following 'file:///' in a flashcard
+        @return: Path of the image file, as QtWebEngine reads the 'file:///' URL
+        """
+        return path if os.path.isabs(path) else '/' + path
+
+    @staticmethod
+    def get_signature(path: str) -> str:
+        """
+        @param path: Path following 'file:///' in a flashcard
+        @return: Modification time and size of the image, or 'missing'
+        """
+        try:
+            stat = os.stat(AssetCache.get_source(path))
+        except OSError:
+            return 'missing'
+        return '%d-%d' % (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def get_url(path: str) -> str:
+        """
+        @param path: Path following 'file:///' in a flashcard
+        @return: URL of the display version of the image, added to the store if needed. The path itself if the image
+        can't be read and wasn't stored before.
+        """
+        source = AssetCache.get_source(path)
+        try:
+            stat = os.stat(source)
+        except OSError:
+            stat = None
+        with AssetCache.lock:
+            entry = AssetCache.get_entries().get(source)
+        if entry is not None and (stat is None or entry[:2] == [stat.st_mtime_ns, stat.st_size]):
+            display_path = os.path.join(AssetCache.directory, entry[2])
+            if os.path.isfile(display_path):
+                return Path(display_path).as_uri()
+        if stat is None:
+            return path
+        try:
+            name = AssetCache.add(source)
+        except OSError:
+            return path
+        with AssetCache.lock:
+            AssetCache.get_entries()[source] = [stat.st_mtime_ns, stat.st_size, name]
+            AssetCache.modified = True
+        return Path(os.path.join(AssetCache.directory, name)).as_uri()
+
+    @staticmethod
+    @Profiler.timed
+    def add(source: str) -> str:
+        """
+        Writes the display version of the image in the store, if it's not there yet.
+        @return: File name of the display version
+        """
+        with open(source, 'rb') as file:
+            content = file.read()
+        extension = os.path.splitext(source)[1].lower()
+        name = hashlib.blake2b(content, digest_size=16).hexdigest() + '-%dx%d' % AssetCache.display_size + extension
+        display_path = os.path.join(AssetCache.directory, name)
+        if os.path.isfile(display_path):
+            return name
+        os.makedirs(AssetCache.directory, exist_ok=True)
+        # Named after the process and thread, as the same image can be added by several processes
+        temp_path = '%s.%d-%d.tmp' % (display_path, os.getpid(), threading.get_ident())
+        if not AssetCache.write_scaled(source, temp_path):
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, display_path)
+        return name
+
+    @staticmethod
+    def write_scaled(source: str, path: str) -> bool:
+        """
+        Writes the image scaled down to display_size, if it's larger.
+        @return: False if the image doesn't need to be scaled, or can't be by Pillow (animation, vector image...)
+        """
+        from PIL import Image, ImageOps, UnidentifiedImageError
+        try:
+            with Image.open(source) as image:
+                width, height = AssetCache.display_size
+                if (image.width <= width and image.height <= height) or getattr(image, 'is_animated', False):
+                    return False
+                image_format = image.format
+                # The orientation is applied, as the EXIF data isn't kept
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail((width, height))
+                if image_format == 'JPEG':
+                    image.save(path, format=image_format, quality=90)
+                else:
+                    image.save(path, format=image_format)
+        except (UnidentifiedImageError, ValueError, OSError):
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        return True
+
+    @staticmethod
+    def get_entries() -> Dict[str, List]:
+        """
+        Reads the index on first call. It's ignored if it was written for another display size.
+        """
+        if AssetCache.entries is None:
+            try:
+                with open(os.path.join(AssetCache.directory, 'index.json'), 'r', encoding='utf-8') as file:
+                    content = json.load(file)
+            except (OSError, ValueError):
+                content = {}
+            if content.get('display_size') == list(AssetCache.display_size):
+                AssetCache.entries = content['entries']
+            else:
+                AssetCache.entries = {}
+            AssetCache.modified = False
+        return AssetCache.entries
+
+    @staticmethod
+    def save() -> None:
+        """
+        Writes the index, if the entries changed.
+        """
+        with AssetCache.lock:
+            if not AssetCache.modified:
+                return
+            content = {'display_size': list(AssetCache.display_size), 'entries': dict(AssetCache.entries)}
+            AssetCache.modified = False
+        path = os.path.join(AssetCache.directory, 'index.json')
+        try:
+            os.makedirs(AssetCache.directory, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump(content, file)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass  # The index is only a cache
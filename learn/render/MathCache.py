@@ -0,0 +1,154 @@
+from config import math_cache_path, math_cache_size
+from collections import OrderedDict
+from learn.profiling import Profiler
+import json
+import os
+import threading
+from typing import List
+
+
+class MathCache:
+    """
+    Cache of the MathML conversions of Latex expressions, shared by all flashcards.
+
+    Call convert(latex) instead of latex2mathml.converter.convert. The least recently used expressions are forgotten
+    when the cache exceeds math_cache_size characters (config.py).
+    The cache is read from math_cache_path (config.py) on first use, and written by save(). It's ignored if it was
+    written by another version of latex2mathml.
+
+    Call warm(contents) when a deck is opened, to convert the Latex expressions of its flashcards in a background
+    thread.
+    """
+    # entries: MathML expressions by Latex expression, the least recently used first
+    entries: OrderedDict | None = None
+    # size: Number of characters of the entries
+    size: int = 0
+    max_size: int = math_cache_size
+    path: str = math_cache_path
+    # version: Version of latex2mathml, read on first use (see get_version)
+    version: str | None = None
+    # modified: True if the entries changed since they were read or written
+    modified: bool = False
+    lock = threading.RLock()
+    # pending: Latex expressions waiting to be converted by the warming thread
+    pending: List[str] = []
+    thread: threading.Thread | None = None
+
+    @staticmethod
+    @Profiler.timed
+    def convert(latex: str) -> str:
+        """
+        @return: MathML expression of the Latex expression, from the cache if possible
+        """
+        with MathCache.lock:
+            entries = MathCache.get_entries()
+            if latex in entries:
+                entries.move_to_end(latex)
+                return entries[latex]
+        import latex2mathml.converter
+        mathml = latex2mathml.converter.convert(latex)
+        MathCache.put(latex, mathml)
+        return mathml
+
+    @staticmethod
+    def put(latex: str, mathml: str) -> None:
+        with MathCache.lock:
+            entries = MathCache.get_entries()
+            if latex in entries:
+                return
+            entries[latex] = mathml
+            MathCache.size += len(latex) + len(mathml)
+            while MathCache.size > MathCache.max_size and len(entries) > 1:
+                old_latex, old_mathml = entries.popitem(last=False)
+                MathCache.size -= len(old_latex) + len(old_mathml)
+            MathCache.modified = True
+
+    @staticmethod
+    def get_entries() -> OrderedDict:
+        """
+        Reads the cache file on first call.
+        """
+        if MathCache.entries is None:
+            MathCache.entries = OrderedDict()
+            MathCache.size = 0
+            try:
+                with open(MathCache.path, 'r', encoding='utf-8') as file:
+                    content = json.load(file)
+            except (OSError, ValueError):
+                content = {}
+            if content.get('version') == MathCache.get_version():
+                for latex, mathml in content['entries']:
+                    MathCache.put(latex, mathml)
+            MathCache.modified = False
+        return MathCache.entries
+
+    @staticmethod
+    def get_version() -> str:
+        """
+        @return: Version of latex2mathml, read once: the package is only imported to convert an expression
+        """
+        if MathCache.version is None:
+            from importlib.metadata import version
+            MathCache.version = version('latex2mathml')
+        return MathCache.version
+
+    @staticmethod
+    def save() -> None:
+        """
+        Writes the cache file, if the entries changed.
+        """
+        with MathCache.lock:
+            if not MathCache.modified:
+                return
+            content = {'version': MathCache.get_version(), 'entries': list(MathCache.entries.items())}
+            MathCache.modified = False
+        try:
+            with open(MathCache.path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump(content, file)
+            os.replace(MathCache.path + '.tmp', MathCache.path)
+        except OSError:
+            pass  # The file is only a cache
+
+    @staticmethod
+    def warm(contents: [str]) -> None:
+        """
+        Converts in a background thread the Latex expressions between $$ in the contents that are not in cache.
+        @param contents: Questions and corrections of flashcards
+        """
+        with MathCache.lock:
+            entries = MathCache.get_entries()
+            missing = set()
+            for content in contents:
+                if '$$' in content:
+                    missing.update(latex for latex in content.split('$$')[1::2] if latex not in entries)
+            if not missing:
+                return
+            MathCache.pending.extend(missing)
+            if MathCache.thread is None:
+                MathCache.thread = threading.Thread(target=MathCache.convert_pending, daemon=True)
+                MathCache.thread.start()
+
+    @staticmethod
+    def convert_pending() -> None:
+        """
+        Converts the pending Latex expressions, then writes the cache file. Run by the warming thread.
+        """
+        while True:
+            with MathCache.lock:
+                if not MathCache.pending:
+                    MathCache.thread = None
+                    break
+                latex = MathCache.pending.pop()
+            try:
+                MathCache.convert(latex)
+            except Exception:
+                pass  # The error is raised when the flashcard is displayed
+        MathCache.save()
+
+    @staticmethod
+    def clear() -> None:
+        with MathCache.lock:
+            MathCache.entries = OrderedDict()
+            MathCache.size = 0
+            MathCache.pending = []
+            MathCache.modified = True
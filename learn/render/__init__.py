@@ -0,0 +1,4 @@
+from .MathCache import MathCache
+from .AssetCache import AssetCache
+from .content_html import format_content, format_contents, format_version, get_assets_version, markup_pattern, \
+    img_pattern
@@ -0,0 +1,195 @@
+from learn.profiling import Profiler
+from learn.render import MathCache, AssetCache
+from functools import lru_cache
+import re
+
+"""
+Contains functions to parse the questions and corrections of flashcards to HTML, used by gui/deck/flash_card_html.py.
+Use format_content(...) to parse a question or a correction.
+
+Doesn't import the gui package, nor Qt: format_contents(...) runs in PreRenderer's processes. BeautifulSoup and pygments
+are imported on first use.
+"""
+
+# format_version: To increment when the output of format_content changes, so cached pages are not used anymore
+format_version = 1
+
+# markup_pattern: What format_content needs to process
+markup_pattern = re.compile(r'\$\$|file:///|[<>&]')
+img_pattern = re.compile("file:///(.+)(\n|$)")
+code_tag_pattern = re.compile(".+-code")
+# ascii_spaces: Whitespace characters of the text nodes collapsed by the HTML parser (see collapse_whitespace)
+ascii_spaces = str.maketrans('', '', ' \n\t\x0c\r')
+
+
+def get_assets_version(html: str) -> str:
+    """
+    @return: Signatures of the images of the question or correction, so its pages are generated again once they change
+    (see AssetCache)
+    """
+    if 'file:///' not in html:
+        return ''
+    return ''.join(' ' + AssetCache.get_signature(path) for path, _ in img_pattern.findall(html))
+
+
+def format_contents(contents: [str]) -> [str]:
+    """
+    Parses several questions or corrections with format_content, without cache. Used by PreRenderer's processes.
+    """
+    return [format_content(html) for html in contents]
+
+
+@Profiler.timed
+def format_content(html) -> str:
+    """
+    Replaces Latex expressions between $$, lines beginning with 'file:///' and code tags, using the functions:
+    - latex_to_mathml
+    - replace_img_paths
+    - replace_code
+
+    The content is scanned once for what needs to be formatted. Plain text is returned as is, and the HTML parser of
+    replace_code is only used for content with HTML tags or entities, or with code: the output is the same as
+    parsing any content, including the whitespace-only text nodes collapsed by the parser (see
+    collapse_whitespace). Formulas are converted and parsed once (see MathCache and serialize_element).
+    @param html: HTML file in string format
+    @return: HTML string with MathML formulas, HTML img tags and highlighted code
+    """
+    tokens = set(markup_pattern.findall(html))
+    if not tokens:
+        return collapse_whitespace(html)
+    # serialized: True while the formatted content can be serialized as the HTML parser would, without parsing it
+    serialized = not tokens & {'<', '>', '&'}
+    if '$$' in tokens:
+        html_split = html.split('$$')
+        html_split[1::2] = [MathCache.convert(latex) for latex in html_split[1::2]]
+        html = ''.join(html_split)
+        if serialized:
+            # Formulas serialized as the HTML parser would, each one being parsed once
+            elements = [serialize_element(mathml) for mathml in html_split[1::2]]
+            serialized = None not in elements
+    if 'file:///' in tokens:
+        # The HTML parser escapes some characters of the img tags' paths
+        serialized = serialized and not any(set(AssetCache.get_url(path)) & set('<>&"')
+                                            for path, _ in img_pattern.findall(html))
+    if not serialized:
+        return replace_code(replace_img_paths(html) if 'file:///' in tokens else html)
+    if '$$' in tokens:
+        html_split[1::2] = elements
+    else:
+        html_split = [html]
+    # Texts around the formulas
+    for ind in range(0, len(html_split), 2):
+        html_split[ind] = serialize_text(html_split[ind])
+    return ''.join(html_split)
+
+
+def serialize_text(text: str) -> str:
+    """
+    @param text: Content without formula, HTML tags nor entities
+    @return: The text serialized as the HTML parser would, with the lines of images replaced by img tags
+    """
+    if 'file:///' not in text:
+        return collapse_whitespace(text)
+    # parts: Texts, and the path and line end of each image between them
+    parts = img_pattern.split(text)
+    parts[::3] = [collapse_whitespace(part) for part in parts[::3]]
+    parts[1::3] = ['<img src="%s"/>' % AssetCache.get_url(path) for path in parts[1::3]]
+    parts[2::3] = [''] * len(parts[2::3])
+    return ''.join(parts)
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    @param text: Text node, between HTML elements or at the start or end of the content
+    @return: The text node as serialized by the HTML parser: a node of ASCII whitespace only is replaced by a line
+    break if it contains one, else by a space
+    """
+    if not text or text.translate(ascii_spaces):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+@lru_cache(maxsize=4096)
+def serialize_element(html: str) -> str | None:
+    """
+    @return: The HTML string serialized by the HTML parser of replace_code, or None if it's not a single HTML element
+    """
+    from bs4 import BeautifulSoup, Tag
+    soup = BeautifulSoup(html, "html.parser")
+    if len(soup.contents) != 1 or not isinstance(soup.contents[0], Tag):
+        return None
+    return str(soup)
+
+
+def latex_to_mathml(html: str) -> str:
+    """
+    Replaces Latex expressions between $$ with the corresponding MathML expression, converted once (see MathCache)
+    @param html: HTML file in string format
+    @return: HTML string with Latex formulas turned to MathML
+    """
+    html_split = html.split('$$')
+    for ind, chunk in enumerate(html_split):
+        if ind % 2 == 1:
+            html_split[ind] = MathCache.convert(chunk)
+    return ''.join(html_split)
+
+
+def replace_img_paths(html: str) -> str:
+    """
+    Replaces the lines beginning with 'file:///[Image path]' by the corresponding HTML img tag, showing the display
+    version of the image (see AssetCache)
+    @param html: HTML file in string format
+    @return: HTML string with the appropriate img tags
+    """
+    return img_pattern.sub(lambda match: '<img src="%s">' % AssetCache.get_url(match.group(1)), html)
+
+
+def replace_code(html: str):
+    """
+    Highlights the code in tags named after the language, like <python-code>, with pygments.
+    The HTML string is parsed and serialized with BeautifulSoup.
+    """
+    from bs4 import BeautifulSoup, Tag
+    from pygments import highlight
+    soup = BeautifulSoup(html, "html.parser")
+    tags = soup.findAll(code_tag_pattern)
+    tags: [Tag]
+    for tag in tags:
+        language = tag.name.split('-')[0]
+        res = highlight(tag.text, get_lexer(language), get_formatter())
+        tag.replaceWith(BeautifulSoup(res, "html.parser"))
+    return str(soup)
+
+
+@lru_cache(maxsize=None)
+def get_lexer(language: str):
+    """
+    @return: Pygments lexer of the language, created once per language
+    """
+    from pygments.lexers import get_lexer_by_name
+    return get_lexer_by_name(language)
+
+
+@lru_cache(maxsize=None)
+def get_formatter():
+    """
+    @return: Pygments formatter shared by all code tags
+    """
+    from pygments.formatters import HtmlFormatter
+    return HtmlFormatter()
+
+
+if __name__ == '__main__':
+
+    html_ = [
+        '<python-code>',
+        'def myfunc():',
+        '\t' + 'print(1)',
+        '</python-code>',
+        '<dax-code>',
+        'CALENDARAUTO()',
+        '</dax-code>'
+    ]
+    html_ = '\n'.join(html_)
+    print(replace_code(html_))
+
@@ -0,0 +1,205 @@
+from learn.deck import Deck, FlashCard
+from learn.profiling import Profiler
+from bisect import bisect_left, insort
+from typing import Dict, List, Set, Tuple
+import re
+
+
+class SearchIndex:
+    """
+    Full-text index over the questions and corrections of the flashcards of several decks.
+
+    It is made of:
+    - A trigram index, for substring queries of 3 characters or more
+    - A word index with sorted words, for word prefix queries
+
+    Use search(...) to get the matching flashcards, ranked by relevance.
+
+    The index is updated card by card: add_card, update_card, remove_card... Only the decks added with add_deck are
+    indexed, so cards moved to another deck are removed from the index (see move_cards).
+    """
+
+    def __init__(self) -> None:
+        # decks: Dictionary between indexed deck key and deck
+        self.decks: Dict[str, Deck] = {}
+        # cards: Dictionary between card key and (card, deck)
+        self.cards: Dict[str, Tuple[FlashCard, Deck]] = {}
+        # texts: Dictionary between card key and indexed (question, correction), lower case
+        self.texts: Dict[str, Tuple[str, str]] = {}
+        # trigrams: Dictionary between trigram and keys of the cards containing it
+        self.trigrams: Dict[str, Set[str]] = {}
+        # words: Dictionary between word and keys of the cards containing it
+        self.words: Dict[str, Set[str]] = {}
+        # sorted_words: Words of the index in alphabetical order, for prefix queries
+        self.sorted_words: List[str] = []
+
+    @staticmethod
+    def get_trigrams(text: str) -> Set[str]:
+        return {text[ind:ind + 3] for ind in range(len(text) - 2)}
+
+    @staticmethod
+    def get_words(text: str) -> Set[str]:
+        return set(re.findall(r'\w+', text))
+
+    def add_deck(self, deck: Deck) -> None:
+        """
+        Indexes a deck and all its cards. If the deck was already indexed, only the changed cards are re-indexed.
+        """
+        self.decks[deck.key] = deck
+        for card in deck:
+            self.add_card(card, deck)
+
+    def remove_deck(self, deck: Deck) -> None:
+        """
+        Removes a deck and all its cards from the index.
+        """
+        if deck.key not in self.decks:
+            return
+        del self.decks[deck.key]
+        for key in [key for key, (_, card_deck) in self.cards.items() if card_deck.key == deck.key]:
+            self.remove_key(key)
+
+    def add_card(self, card: FlashCard, deck: Deck) -> None:
+        """
+        Indexes a card. If it was already indexed with the same content, only updates the card and deck objects.
+        @param card: Card to index
+        @param deck: Deck containing the card
+        """
+        if deck.key not in self.decks:
+            return
+        texts = (card.question.lower(), card.correction.lower())
+        if card.key in self.texts:
+            if self.texts[card.key] == texts:
+                self.cards[card.key] = (card, deck)
+                return
+            self.remove_key(card.key)
+        self.cards[card.key] = (card, deck)
+        self.texts[card.key] = texts
+        for trigram in self.get_trigrams(texts[0]) | self.get_trigrams(texts[1]):
+            self.trigrams.setdefault(trigram, set()).add(card.key)
+        for word in self.get_words(texts[0]) | self.get_words(texts[1]):
+            if word not in self.words:
+                self.words[word] = set()
+                insort(self.sorted_words, word)
+            self.words[word].add(card.key)
+
+    def add_cards(self, cards: [FlashCard], deck: Deck) -> None:
+        for card in cards:
+            self.add_card(card, deck)
+
+    def update_card(self, card: FlashCard) -> None:
+        """
+        Re-indexes a card after its question or correction was edited.
+        """
+        if card.key in self.cards:
+            self.add_card(card, self.cards[card.key][1])
+
+    def remove_card(self, card: FlashCard) -> None:
+        if card.key in self.cards:
+            self.remove_key(card.key)
+
+    def remove_cards(self, cards: [FlashCard]) -> None:
+        for card in cards:
+            self.remove_card(card)
+
+    def move_cards(self, cards: [FlashCard], destination: Deck) -> None:
+        """
+        Updates the deck of cards moved to destination. If destination isn't indexed, cards are removed from index.
+        """
+        if destination.key not in self.decks:
+            self.remove_cards(cards)
+        else:
+            self.add_cards(cards, destination)
+
+    def remove_key(self, key: str) -> None:
+        """
+        Removes a card from the index.
+        @param key: Key of the card
+        """
+        question, correction = self.texts.pop(key)
+        del self.cards[key]
+        for trigram in self.get_trigrams(question) | self.get_trigrams(correction):
+            self.trigrams[trigram].discard(key)
+            if not self.trigrams[trigram]:
+                del self.trigrams[trigram]
+        for word in self.get_words(question) | self.get_words(correction):
+            self.words[word].discard(key)
+            if not self.words[word]:
+                del self.words[word]
+                del self.sorted_words[bisect_left(self.sorted_words, word)]
+
+    def prefix_candidates(self, prefix: str) -> Set[str]:
+        """
+        @return: Keys of the cards containing a word beginning with prefix
+        """
+        keys = set()
+        ind = bisect_left(self.sorted_words, prefix)
+        while ind < len(self.sorted_words) and self.sorted_words[ind].startswith(prefix):
+            keys |= self.words[self.sorted_words[ind]]
+            ind += 1
+        return keys
+
+    def substring_candidates(self, query: str) -> Set[str]:
+        """
+        @return: Keys of the cards containing all the trigrams of query. Some may not contain query itself.
+        """
+        postings = sorted((self.trigrams.get(trigram, set()) for trigram in self.get_trigrams(query)), key=len)
+        if not postings:
+            return set()
+        keys = set(postings[0])
+        for posting in postings[1:]:
+            keys &= posting
+            if not keys:
+                break
+        return keys
+
+    @staticmethod
+    def rank(text: str, query: str) -> Tuple[int, int] | None:
+        """
+        @return: (match type, position) of query in text, or None if no match. Match types, from best to worst:
+        - 0: text begins with query
+        - 1: a word of text begins with query
+        - 2: query is inside a word of text
+        """
+        position = text.find(query)
+        if position == -1:
+            return None
+        if position == 0:
+            return 0, 0
+        word_start = re.search(r'(?<!\w)' + re.escape(query), text)
+        if word_start is not None:
+            return 1, word_start.start()
+        return 2, position
+
+    @Profiler.timed
+    def search(self, query: str, limit: int = 100) -> List[Tuple[FlashCard, Deck]]:
+        """
+        Searches for cards whose question or correction contain the query, case-insensitive.
+        Queries shorter than 3 characters only match beginnings of words.
+
+        Results are ranked by match type (see rank method), matches in questions first, then by position of the match.
+        @param query: Text to search
+        @param limit: Maximum number of results
+        @return: List of (card, deck), the best matches first
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+        if len(query) < 3:
+            candidates = self.prefix_candidates(query)
+        else:
+            candidates = self.substring_candidates(query)
+        ranked = []
+        for key in candidates:
+            ranks = []
+            for field_no, text in enumerate(self.texts[key]):
+                rank = self.rank(text, query)
+                if rank is not None and (len(query) >= 3 or rank[0] != 2):
+                    ranks.append((3 * field_no + rank[0], rank[1], len(text)))
+            if ranks:  # Else, trigrams match but not the whole query
+                ranked.append((min(ranks), key))
+        ranked.sort()
+        return [self.cards[key] for _, key in ranked[:limit]]
+
+    def __len__(self):
+        return len(self.cards)
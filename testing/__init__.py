@@ -0,0 +1,4 @@
+# The tests read and write the data directories, created by the app at startup
+from config import create_directories
+
+create_directories()
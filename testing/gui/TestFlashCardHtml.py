@@ -0,0 +1,77 @@
+import unittest
+import re
+from bs4 import BeautifulSoup
+import latex2mathml.converter
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from learn.render import format_content
+
+
+def reference_format_content(html: str) -> str:
+    """
+    format_content as 3 passes on the whole content, each card being parsed by BeautifulSoup
+    """
+    html_split = html.split('$$')
+    for ind, chunk in enumerate(html_split):
+        if ind % 2 == 1:
+            html_split[ind] = latex2mathml.converter.convert(chunk)
+    html = ''.join(html_split)
+    html = re.sub("file:///(.+)(\n|$)", r'<img src="\1">', html)
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.findAll(re.compile(".+-code")):
+        res = highlight(tag.text, get_lexer_by_name(tag.name.split('-')[0]), HtmlFormatter())
+        tag.replaceWith(BeautifulSoup(res, "html.parser"))
+    return str(soup)
+
+
+corpus = [
+    '',
+    'What is the capital of France?',
+    'Paris\nLine 2\r\nLine 3\ttab',
+    'Accents: é à ü, quotes: " \' `',
+    'Formula $$x^2 + y^2 = z^2$$ inline',
+    '$$\\frac{a}{b}$$ and $$\\sqrt{2}$$ and $$a < b$$',
+    '$$\\sum_{i=0}^{n} i = \\frac{n(n+1)}{2}$$',
+    '$$\\alpha \\leq \\beta$$',
+    '$$\\left( x \\right) \\cdot y$$',
+    '$$a + b - c$$',
+    '$$\\text{some text}$$\n$$\\{x \\mid x > 0\\}$$',
+    '$$\\mathbb{R}^n$$ & $$\\int_0^1 f$$',
+    '$$x$$ $$x$$ $$y$$',
+    'Unclosed $$x',
+    'file:///images/picture.png',
+    'Before\nfile:///images/pic ture.png\nAfter',
+    'file:///a&b.png',
+    'file:///"quoted".png',
+    'file:///image.png $$x$$',
+    'A <b>bold</b> text<br>and a break',
+    'Entities: &amp; &lt; &gt; & alone, 1 > 0',
+    '<p class=x>Unquoted attribute</p>',
+    '<ul><li>One<li>Two</ul>',
+    '<python-code>\ndef f(x):\n\treturn x < 1\n</python-code>',
+    'Text\n<python-code>print(1)</python-code>\n$$x$$\nfile:///a.png',
+    '<sql-code>SELECT * FROM t WHERE a > 1</sql-code>',
+    # Whitespace-only text nodes, collapsed by the HTML parser
+    '\t\t',
+    ' \r\n ',
+    '$$x$$\n\n$$y$$',
+    '$$a$$\r\n$$b$$',
+    'Q:\n$$x$$\n  \n$$y$$',
+    '$$x$$   ',
+    '\tfile:///a.png\n\t\nfile:///b.png',
+    'file:///a.png\n \n$$x$$\x0c',
+]
+
+
+class TestFlashCardHtml(unittest.TestCase):
+    def testFormatContent(self):
+        for html in corpus:
+            self.assertEqual(format_content(html), reference_format_content(html), html)
+
+    def testPlainContent(self):
+        self.assertIs(format_content(corpus[1]), corpus[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import tempfile
+import time
+from unittest.mock import patch
+from learn.deck import FlashCard
+from gui.deck import RenderCache, PreRenderer
+from gui.deck.flash_card_html import generate_card_content
+
+
+class TestPreRenderer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(RenderCache, directory=self.directory.name, disk_keys=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        RenderCache.clear()
+        self.cards = [FlashCard('Q%d $$x^%d$$' % (ind, ind), 'R%d' % ind) for ind in range(20)]
+
+    def wait(self):
+        while PreRenderer.is_running():
+            time.sleep(0.01)
+
+    def testAdd(self):
+        PreRenderer.add(self.cards)
+        self.wait()
+        misses = RenderCache.misses
+        for card in self.cards:
+            generate_card_content(card)
+        self.assertEqual(RenderCache.misses, misses)
+
+    def testCancel(self):
+        PreRenderer.add(self.cards)
+        PreRenderer.cancel()
+        self.wait()
+        self.assertEqual(len(PreRenderer.queued), 0)
+
+    def tearDown(self):
+        PreRenderer.shutdown(wait=True)
+        RenderCache.clear()
+        self.directory.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
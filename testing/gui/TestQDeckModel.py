@@ -0,0 +1,56 @@
+import unittest
+from learn.deck import FlashCard, Deck
+from gui.deck import QDeckModel
+from PySide6.QtCore import QCoreApplication
+
+
+class TestQDeckModel(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.cards = [FlashCard("Q%d?" % i, "R%d" % i) for i in range(600)]
+        self.deck = Deck("MyDeck", self.cards)
+        self.model = QDeckModel([self.deck, Deck("Empty")])
+        self.deck_index = self.model.index(0, 0)
+
+    def testFetchMore(self):
+        self.assertEqual(self.model.rowCount(self.deck_index), 0)
+        self.assertTrue(self.model.hasChildren(self.deck_index))
+        self.model.fetchMore(self.deck_index)
+        self.assertEqual(self.model.rowCount(self.deck_index), QDeckModel.fetch_size)
+        card_index = self.model.card_index(self.cards[-1], self.deck)
+        self.assertEqual(self.model.rowCount(self.deck_index), len(self.cards))
+        self.assertIs(self.model.item(card_index), self.cards[-1])
+        self.assertEqual(self.model.parent(card_index), self.deck_index)
+        self.assertFalse(self.model.canFetchMore(self.deck_index))
+
+    def testDeckChanges(self):
+        self.model.fetchMore(self.deck_index)
+        card = self.cards[3]
+        self.deck.remove_card(card)
+        self.assertEqual(self.model.rowCount(self.deck_index), QDeckModel.fetch_size - 1)
+        self.deck.insert_card(0, card)
+        self.assertEqual(self.model.rowCount(self.deck_index), QDeckModel.fetch_size)
+        self.assertEqual(self.model.data(self.model.index(0, 0, self.deck_index)), card.question)
+        self.deck.add_card(FlashCard("New?", "R"))  # After the fetched rows
+        self.assertEqual(self.model.rowCount(self.deck_index), QDeckModel.fetch_size)
+        self.deck.title = "Renamed"
+        self.assertEqual(self.model.data(self.deck_index), "Renamed")
+
+    def testReviewAggregate(self):
+        self.assertEqual(self.model.get_aggregate(self.deck).due_count, 600)
+        for card in self.cards[:100]:
+            card.enabled = False
+        self.assertEqual(self.model.get_aggregate(self.deck).due_count, 500)
+        self.deck.remove_card(self.cards[200])
+        self.assertEqual(self.model.get_aggregate(self.deck).due_count, 499)
+
+    def testDecks(self):
+        deck = Deck("New")
+        self.model.insert_deck(1, deck)
+        self.assertIs(self.model.item(self.model.index(1, 0)), deck)
+        self.model.remove_deck(deck)
+        self.assertEqual(self.model.rowCount(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
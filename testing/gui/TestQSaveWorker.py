@@ -0,0 +1,42 @@
+import unittest
+from learn.deck import FlashCard, Deck
+from learn.pickle import DeckManager
+from gui import QSaveWorker
+from PySide6.QtCore import QCoreApplication
+from config import decks_directory
+import os
+
+
+class TestQSaveWorker(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.deck = Deck("MyDeck", [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)])
+        self.deck.key = 'test'
+        self.worker = QSaveWorker()
+        self.progress = []
+        self.worker.progress.connect(lambda written, total: self.progress.append((written, total)))
+
+    def testSave(self):
+        self.worker.save([self.deck])
+        self.worker.save([self.deck])  # Merged with the previous save if it isn't written yet
+        self.deck[0].question = 'Edited'  # After the copy
+        self.worker.wait()
+        self.app.processEvents()
+        self.assertTrue(self.progress)
+        with open(os.path.join(decks_directory, 'test.json')) as file:
+            self.assertNotIn('Edited', file.read())
+
+    def testDelete(self):
+        self.worker.save([self.deck])
+        self.worker.wait()
+        self.worker.save([], [self.deck])
+        self.worker.wait()
+        self.assertFalse(os.path.exists(os.path.join(decks_directory, 'test.json')))
+
+    def tearDown(self):
+        self.worker.wait()
+        DeckManager.delete(self.deck)
+
+
+if __name__ == '__main__':
+    unittest.main()
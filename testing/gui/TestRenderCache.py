@@ -0,0 +1,39 @@
+import unittest
+import tempfile
+from unittest.mock import patch
+from gui.deck import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(RenderCache, directory=self.directory.name, disk_keys=None, max_entries=2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        RenderCache.clear()
+        self.keys = [RenderCache.get_key('Q%d' % ind, 'R', 'front', 'v1') for ind in range(3)]
+
+    def testKey(self):
+        self.assertNotEqual(RenderCache.get_key('Q', 'R', 'front', 'v1'), RenderCache.get_key('Q', 'R', 'both', 'v1'))
+        self.assertNotEqual(RenderCache.get_key('Q', 'R', 'front', 'v1'), RenderCache.get_key('Q', 'R', 'front', 'v2'))
+        self.assertNotEqual(RenderCache.get_key('Q', 'R', 'front', 'v1'), RenderCache.get_key('Q', 'R2', 'front', 'v1'))
+
+    def testTiers(self):
+        for ind, key in enumerate(self.keys):
+            self.assertIsNone(RenderCache.get(key))
+            RenderCache.put(key, '<p>%d</p>' % ind)
+        self.assertNotIn(self.keys[0], RenderCache.entries)  # Least recently used
+        self.assertEqual(RenderCache.get(self.keys[0]), '<p>0</p>')  # From disk
+        RenderCache.clear()
+        RenderCache.disk_keys = None
+        self.assertEqual(RenderCache.get(self.keys[2]), '<p>2</p>')
+        RenderCache.clear(disk=True)
+        self.assertIsNone(RenderCache.get(self.keys[2]))
+
+    def tearDown(self):
+        RenderCache.clear()
+        self.directory.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,2 +1,5 @@
-from .TestQFlashCard import TestQFlashCard
-from .TestQDeck import TestQDeck
+from .TestQDeckModel import TestQDeckModel
+from .TestRenderCache import TestRenderCache
+from .TestPreRenderer import TestPreRenderer
+from .TestFlashCardHtml import TestFlashCardHtml
+from .TestQSaveWorker import TestQSaveWorker
@@ -0,0 +1,64 @@
+import unittest
+import tempfile
+import os
+from unittest.mock import patch
+from PIL import Image
+from learn.render import AssetCache, format_content, get_assets_version
+
+
+class TestAssetCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(AssetCache, directory=os.path.join(self.directory.name, 'assets'),
+                                 display_size=(100, 50), entries=None, modified=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = os.path.join(self.directory.name, 'photo.jpg')
+        Image.new('RGB', (400, 100), 'red').save(self.path)
+        # Path as written after 'file:///' in a flashcard
+        self.card_path = self.path.lstrip('/')
+
+    def getDisplayImage(self) -> Image.Image:
+        url = AssetCache.get_url(self.card_path)
+        self.assertTrue(url.startswith('file://'))
+        return Image.open(os.path.join(AssetCache.directory, os.path.basename(url)))
+
+    def testScaled(self):
+        with self.getDisplayImage() as image:
+            self.assertEqual(image.size, (100, 25))
+        # Stored once, and found again from the index
+        AssetCache.save()
+        AssetCache.entries = None
+        name = os.path.basename(AssetCache.get_url(self.card_path))
+        self.assertEqual(sorted(os.listdir(AssetCache.directory)), sorted([name, 'index.json']))
+
+    def testSmallImage(self):
+        Image.new('RGB', (20, 10), 'blue').save(self.path)
+        with self.getDisplayImage() as image:
+            self.assertEqual(image.size, (20, 10))
+
+    def testChangedImage(self):
+        html = 'Question\nfile:///' + self.card_path
+        version = get_assets_version(html)
+        url = AssetCache.get_url(self.card_path)
+        self.assertIn('<img src="%s"/>' % url, format_content(html))
+        Image.new('RGB', (300, 300), 'green').save(self.path)
+        os.utime(self.path, ns=(0, 0))
+        self.assertNotEqual(get_assets_version(html), version)
+        self.assertNotEqual(AssetCache.get_url(self.card_path), url)
+        with self.getDisplayImage() as image:
+            self.assertEqual(image.size, (50, 50))
+
+    def testMissingImage(self):
+        url = AssetCache.get_url(self.card_path)
+        os.remove(self.path)
+        # Displayed from the store
+        self.assertEqual(AssetCache.get_url(self.card_path), url)
+        self.assertEqual(AssetCache.get_url('missing.png'), 'missing.png')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import json
+import tempfile
+from learn.pickle import JSONDecoder, DeckManager
+from learn.pickle.BulkImporter import BulkImporter
+from learn.quizz import Historian, Scheduler
+from config import decks_directory
+
+
+class TestBulkImporter(unittest.TestCase):
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8')
+        for i in range(25):
+            history = '' if i % 2 else '\t25-03-2024 19:26:%02d|%.1f|1;24-03-2024 10:00:00|3|0' % (i, i / 2)
+            self.file.write('Q%d?\\nLine 2\tR%d%s\n' % (i, i, history))
+        self.file.close()
+        self.importer = BulkImporter('Imported', batch_size=10)
+        key = self.importer.run(self.file.name).key
+        with open(os.path.join(decks_directory, key + '.json'), 'r') as deck_file:
+            self.deck = json.load(deck_file, cls=JSONDecoder)
+
+    def testImport(self):
+        deck = self.deck
+        self.assertEqual(len(deck), 25)
+        self.assertEqual(deck.title, 'Imported')
+        self.assertEqual(deck[3].question, 'Q3?\nLine 2')
+        self.assertEqual(deck[3].correction, 'R3')
+        records = Historian(deck).get_records()
+        self.assertEqual(len(records), 26)
+        self.assertTrue(records['Date'].is_monotonic_increasing)
+        self.assertEqual(len(records[records['Card'] == deck[4]]), 2)
+        scheduler = Scheduler(deck)
+        self.assertEqual(scheduler.get_box(deck[4]), 1)
+        self.assertEqual(scheduler.get_box(deck[5]), 0)
+        self.assertEqual(self.importer.card_count, 25)
+        self.assertEqual(self.importer.record_count, 26)
+
+    def testInvalidRow(self):
+        with open(self.file.name, 'a', encoding='utf-8') as file:
+            file.write('Q without correction\n')
+        importer = BulkImporter('Invalid', batch_size=10)
+        with self.assertRaises(ValueError):
+            importer.run(self.file.name)
+        self.assertNotIn(importer.deck.key, [deck.key for deck in DeckManager.load()])
+        self.assertEqual([name for name in os.listdir(decks_directory) if importer.deck.key in name], [])
+
+    def tearDown(self):
+        os.remove(self.file.name)
+        DeckManager.delete(self.deck)
+
+
+if __name__ == '__main__':
+    unittest.main()
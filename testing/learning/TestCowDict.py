@@ -0,0 +1,42 @@
+import unittest
+from learn.cow import CowDict
+
+
+class TestCowDict(unittest.TestCase):
+    def setUp(self):
+        self.items = {'K%d' % i: i for i in range(4 * CowDict.shard_size)}
+        self.cow_dict = CowDict(self.items)
+
+    def testDictOperations(self):
+        for i in range(4 * CowDict.shard_size, 12 * CowDict.shard_size):
+            self.cow_dict['K%d' % i] = self.items['K%d' % i] = i
+        del self.cow_dict['K3']
+        del self.items['K3']
+        self.cow_dict.update({'K4': -1})
+        self.items.update({'K4': -1})
+        self.assertEqual(self.cow_dict, self.items)
+        self.assertEqual(len(self.cow_dict), len(self.items))
+        self.assertNotIn('K3', self.cow_dict.keys())
+        self.assertEqual(self.cow_dict.get('K3', -2), -2)
+        self.assertRaises(KeyError, self.cow_dict.__delitem__, 'K3')
+
+    def testSnapshot(self):
+        snapshot = self.cow_dict.snapshot()
+        self.cow_dict['K0'] = -1
+        self.cow_dict['New'] = -2
+        del self.cow_dict['K1']
+        self.assertEqual(snapshot, self.items)
+        # Only the shards of the changed keys are copied
+        changed = {hash(key) & (len(snapshot.shards) - 1) for key in ('K0', 'New', 'K1')}
+        self.assertEqual({shard_no for shard_no, (shard, snapshot_shard)
+                          in enumerate(zip(self.cow_dict.shards, snapshot.shards)) if shard is not snapshot_shard},
+                         changed)
+        self.assertEqual(self.cow_dict.get_changes(snapshot), ({'K0': -1, 'New': -2}, ['K1']))
+        self.assertRaises(TypeError, snapshot.__setitem__, 'K0', 0)
+        for i in range(4 * CowDict.shard_size, 12 * CowDict.shard_size):
+            self.cow_dict['K%d' % i] = i
+        self.assertEqual(snapshot, self.items)
+
+
+if __name__ == '__main__':
+    unittest.main()
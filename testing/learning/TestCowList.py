@@ -0,0 +1,57 @@
+import unittest
+from learn.cow import CowList
+from copy import copy
+
+
+class TestCowList(unittest.TestCase):
+    def setUp(self):
+        self.items = list(range(3 * CowList.chunk_size + 10))
+        self.cow_list = CowList(self.items)
+
+    def assertCowListEqual(self, cow_list: CowList, items: list, msg=None):
+        self.assertEqual(len(cow_list), len(items), msg)
+        self.assertEqual(list(cow_list), items, msg)
+        self.assertEqual([cow_list[index] for index in range(len(items))], items, msg)
+
+    def testListOperations(self):
+        operations = [lambda lst: lst.insert(5, -1), lambda lst: lst.insert(-3, -2), lambda lst: lst.append(-3),
+                      lambda lst: lst.__delitem__(700), lambda lst: lst.__setitem__(-1, -4),
+                      lambda lst: lst.extend(range(2 * CowList.chunk_size)), lambda lst: lst.remove(100),
+                      lambda lst: lst.pop(0), lambda lst: lst.sort(key=lambda item: -item)]
+        for operation in operations:
+            operation(self.items)
+            operation(self.cow_list)
+            self.assertCowListEqual(self.cow_list, self.items)
+        self.assertEqual(self.cow_list.index(3), self.items.index(3))
+        self.assertIn(-4, self.cow_list)
+        self.assertEqual(list(reversed(self.cow_list)), list(reversed(self.items)))
+        self.assertEqual(self.cow_list[10:20], self.items[10:20])
+        self.assertEqual(self.cow_list, self.items)
+        for _ in range(len(self.items)):
+            del self.cow_list[0]
+        self.assertCowListEqual(self.cow_list, [])
+
+    def testSnapshot(self):
+        snapshot = self.cow_list.snapshot()
+        self.cow_list.insert(0, -1)
+        self.cow_list[CowList.chunk_size * 2] = -2
+        del self.cow_list[-1]
+        self.assertCowListEqual(snapshot, list(range(3 * CowList.chunk_size + 10)))
+        # Only the chunks changed since the snapshot are copied
+        shared = [chunk is snapshot_chunk for chunk, snapshot_chunk in zip(self.cow_list.chunks, snapshot.chunks)]
+        self.assertEqual(shared, [False, False, True, False])
+        self.assertRaises(TypeError, snapshot.append, 0)
+
+    def testCopy(self):
+        cow_list = copy(self.cow_list)
+        cow_list.append(-1)
+        self.cow_list[0] = -2
+        self.assertEqual(cow_list[0], 0)
+        self.assertEqual(self.cow_list[-1], 3 * CowList.chunk_size + 9)
+        cow_list = copy(self.cow_list.snapshot())
+        cow_list.append(-1)
+        self.assertEqual(cow_list[-1], -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import os
+from learn.deck import FlashCard, Deck
+from learn.pack import DataPack
+from learn.quizz import Scheduler, TargetTimeTracker
+from config import pack_path, picker_directory
+
+
+class TestDataPack(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck("MyDeck", [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)])
+        self.deck.key = 'test_pack'
+        self.scheduler = Scheduler(self.deck)
+        self.time_tracker = TargetTimeTracker(self.deck)
+        for ind, card in enumerate(self.deck):
+            for i in range(ind):
+                self.scheduler.next_box(card)
+            self.time_tracker.set_target_time(card, ind * 3 / 2)
+        self.scheduler.save()
+        self.time_tracker.save()
+
+    def testWriteRead(self):
+        self.assertTrue(DataPack.write())
+        self.assertTrue(os.path.isfile(pack_path))
+        with open(os.path.join(picker_directory, self.deck.key + '.box'), 'r') as file:
+            self.assertEqual(DataPack.read(os.path.join(picker_directory, self.deck.key + '.box')), file.read())
+        self.assertIn(self.deck.key + '.ttm', DataPack.list_directory(picker_directory))
+        self.assertIsNone(DataPack.read(os.path.join(picker_directory, 'unknown.box')))
+        self.assertEqual(Scheduler.read_interval_boxes(self.deck), self.scheduler.box)
+        self.assertEqual(TargetTimeTracker.read_target_times(self.deck), self.time_tracker.target_time)
+
+    def testInvalidate(self):
+        DataPack.write()
+        self.scheduler.reset_box(self.deck[5])
+        self.scheduler.save()
+        self.assertFalse(os.path.isfile(pack_path))
+        self.assertIsNone(DataPack.read(os.path.join(picker_directory, self.deck.key + '.box')))
+        self.assertEqual(Scheduler.read_interval_boxes(self.deck), self.scheduler.box)
+
+    def tearDown(self):
+        self.scheduler.delete()
+        self.time_tracker.delete()
+        DataPack.invalidate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,12 +21,72 @@ class TestDeck(unittest.TestCase):
             self.assertEqual(card.correction, self.deck.cards[i].correction)
             self.assertNotEqual(card.key, self.deck.cards[i].key)
 
+    def testSnapshot(self):
+        snapshot = self.deck.snapshot()
+        self.deck[0].question = "Edited?"
+        self.deck[1].set_content("Edited 1?", "Edited 1")
+        self.deck.remove_card(self.cards[2])
+        self.deck.add_card(FlashCard("New?", "R"))
+        states = list(snapshot)
+        self.assertEqual([state['question'] for state in states], ["Q%d?" % i for i in range(10)])
+        self.assertEqual(states[1]['correction'], "R1")
+        self.assertEqual(self.deck[0].question, "Edited?")
+        self.assertEqual(len(self.deck), 10)
+        self.assertEqual(self.deck[-1].question, "New?")
+
     def testEq(self):
         self.assertEqual(self.deck, self.deck)
         self.assertNotEqual(self.deck, copy(self.deck))
         func = lambda x: int(x.correction[-1]) % 2 == 0
         self.assertNotEqual(self.deck.filter(func), self.deck)
 
+    def testContentHash(self):
+        cards_hash = self.deck.get_cards_hash()
+        self.cards[3].correction = "Edited"
+        self.assertNotEqual(self.deck.get_cards_hash(), cards_hash)
+        self.cards[3].correction = "R3"
+        self.assertEqual(self.deck.get_cards_hash(), cards_hash)
+        card = self.deck[1]
+        self.deck.remove_card(card)
+        self.deck.insert_card(0, card)
+        self.assertNotEqual(self.deck.get_cards_hash(), cards_hash)
+        content_hash = self.deck.get_content_hash()
+        self.deck.title = "Renamed"
+        self.assertNotEqual(self.deck.get_content_hash(), content_hash)
+
+    def testObservers(self):
+        events = []
+
+        class Observer:
+            def __getattr__(self, name):
+                return lambda deck, *args: events.append((name,) + args)
+
+        self.deck.add_observer(Observer())
+        card = self.deck[2]
+        self.deck.remove_card(card)
+        self.deck.insert_card(0, card)
+        card.enabled = False
+        self.deck.title = "Renamed"
+        self.assertEqual(events, [('card_about_to_be_removed', 2), ('card_removed', 2),
+                                  ('card_about_to_be_inserted', 0), ('card_inserted', 0),
+                                  ('card_changed', card), ('deck_changed',)])
+
+    def testRenameDuplicateCards(self):
+        cards = [FlashCard("Q1?", "R"), FlashCard("Q1?", "R"), FlashCard("New?", "R")]
+        self.deck.rename_duplicate_cards(cards)
+        self.assertEqual([card.question for card in cards], ["Q1?(1)", "Q1?(2)", "New?"])
+        self.deck.add_cards(cards)
+        self.deck[3].question = "Edited?"
+        self.assertTrue(self.deck.has_question("Edited?"))
+        self.assertFalse(self.deck.has_question("Q3?"))
+        self.deck.remove_card(cards[2])
+        card = FlashCard("New?", "R")
+        self.deck.rename_duplicate_cards([card])
+        self.assertEqual(card.question, "New?")
+        card = FlashCard("Q1?", "R")
+        self.deck.rename_duplicate_cards([card])
+        self.assertEqual(card.question, "Q1?(3)")
+
 
 if __name__ == '__main__':
     unittest.main()
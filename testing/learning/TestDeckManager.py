@@ -67,6 +67,29 @@ class TestDeckManager(unittest.TestCase):
             self.assertNotIn(card.key, scheduler.box.keys())
             self.assertNotIn(card.key, time_tracker.target_time.keys())
 
+    def testNextReviews(self):
+        DeckManager.historian[self.deck.key] = self.historian
+        DeckManager.scheduler[self.deck.key] = self.scheduler
+        days = DeckManager.get_next_reviews(self.deck)
+        self.assertEqual(len(days), len(self.deck))
+        for card in self.deck:
+            self.assertEqual(days[card.key], DeckManager.get_next_review_days(card, self.deck))
+        self.assertEqual(days[self.deck[0].key], intervals[1].days)
+
+    def testSnapshot(self):
+        DeckManager.historian[self.deck.key] = self.historian
+        DeckManager.scheduler[self.deck.key] = self.scheduler
+        DeckManager.time_tracker[self.deck.key] = self.time_tracker
+        DeckManager.saved_hashes.pop(self.deck.key, None)
+        snapshot = DeckManager.get_snapshot(self.deck)
+        question = self.deck[0].question
+        self.deck[0].question = 'Edited'
+        self.scheduler.next_box(self.deck[0])
+        DeckManager.write_snapshot(snapshot)
+        deck = [deck for deck in DeckManager.load() if deck.key == self.deck.key][0]
+        self.assertEqual(deck[0].question, question)
+        self.assertEqual(Scheduler(deck).get_box(deck[0]), 1)
+
     def tearDown(self):
         DeckManager.delete(self.deck)
         DeckManager.delete(self.deck_transfer)
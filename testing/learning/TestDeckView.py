@@ -0,0 +1,50 @@
+import unittest
+from learn.deck import FlashCard, Deck, DeckView
+from learn.quizz import Historian, TargetTimeTracker, Scheduler, Picker
+
+
+class TestDeckView(unittest.TestCase):
+    def setUp(self):
+        self.cards = [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)]
+        self.deck = Deck("MyDeck", list(self.cards))
+        self.keys = set(card.key for card in self.cards[:6])
+        self.view = DeckView(self.deck, self.keys, lambda x: int(x.correction[-1]) % 2 == 0)
+
+    def testSubset(self):
+        self.assertEqual(list(self.view), [self.cards[0], self.cards[2], self.cards[4]])
+        self.assertEqual(len(self.view), 3)
+        self.assertEqual(self.view[1], self.cards[2])
+        self.assertEqual(self.view.key, self.deck.key)
+        self.assertEqual(self.view.title, self.deck.title)
+        self.assertIn(self.cards[2], self.view)
+        self.assertNotIn(self.cards[3], self.view)
+        self.assertNotIn(self.cards[8], self.view)
+
+    def testLive(self):
+        self.deck.remove_card(self.cards[2])
+        self.assertEqual(list(self.view), [self.cards[0], self.cards[4]])
+        self.assertNotIn(self.cards[2], self.view)
+        self.cards[1].correction = 'R0'
+        self.assertIn(self.cards[1], self.view)
+        # Cards of other decks aren't in the view
+        other_deck = Deck("Other", [self.cards[2], FlashCard("Q0?", "R0")])
+        self.assertNotIn(self.cards[2], DeckView(self.deck))
+        self.assertNotIn(other_deck[1], DeckView(self.deck))
+        self.assertIn(self.cards[2], DeckView(other_deck))
+
+    def testDue(self):
+        historian = Historian(self.deck)
+        scheduler = Scheduler(self.deck)
+        historian.add_record(self.cards[0], 2, True)
+        view = DeckView.due(self.deck, historian, scheduler)
+        self.assertNotIn(self.cards[0], view)
+        self.assertEqual(len(view), 9)
+
+    def testPicker(self):
+        historian = Historian(self.deck)
+        picker = Picker(self.view, historian, TargetTimeTracker(self.deck), Scheduler(self.deck))
+        self.assertIn(picker.pick_card(), self.view)
+
+
+if __name__ == '__main__':
+    unittest.main()
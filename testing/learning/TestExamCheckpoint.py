@@ -0,0 +1,85 @@
+import unittest
+import os
+from learn.deck import FlashCard, Deck
+from learn.quizz import Historian, TargetTimeTracker, Scheduler, Examiner, ExamCheckpoint
+from learn.pickle import DeckManager
+
+
+class TestExamCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck("MyDeck", [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)])
+        self.examiner = self.get_examiner()
+
+    def get_examiner(self) -> Examiner:
+        """
+        @return: Examiner of a new session, with the data of the deck read again as after a restart
+        """
+        return Examiner(self.deck, Historian(self.deck), TargetTimeTracker(self.deck), Scheduler(self.deck),
+                        checkpoint=True)
+
+    def testResume(self):
+        card = self.examiner.pick_card()
+        self.examiner.return_card(card, True)
+        self.examiner.scheduler.set_box(self.deck[3], 2)
+        pending = self.examiner.pick_card()
+        self.examiner.time_tracker.set_target_time(card, 3.5)
+        self.examiner.save_checkpoint()
+        # Interrupted without end()
+        examiner = self.get_examiner()
+        self.assertEqual(len(examiner.historian.records), 1)
+        self.assertEqual(examiner.historian.records[0][1], card)
+        self.assertEqual(examiner.scheduler.get_box(self.deck[3]), 2)
+        self.assertEqual(examiner.time_tracker.get_target_time(card), 3.5)
+        self.assertEqual(examiner.pick_card(), pending)
+        # The records aren't restored twice
+        examiner.end()
+        self.assertEqual(len(self.get_examiner().historian.records), 1)
+
+    def testTimerCheckpoint(self):
+        self.examiner.pick_card()
+        self.assertFalse(self.examiner.save_checkpoint())  # Nothing changed
+        self.examiner.scheduler.set_box(self.deck[0], 1)
+        self.assertTrue(self.examiner.save_checkpoint())
+        # A line cut by a crash is ignored
+        with open(ExamCheckpoint.get_path(self.deck.key), 'a') as file:
+            file.write('\n{"records": [["01-01')
+        self.examiner.scheduler.set_box(self.deck[1], 3)
+        self.examiner.end()
+        examiner = self.get_examiner()
+        self.assertEqual(examiner.scheduler.get_box(self.deck[0]), 1)
+        self.assertEqual(examiner.scheduler.get_box(self.deck[1]), 3)
+
+    def testDiscard(self):
+        card = self.examiner.pick_card()
+        self.examiner.return_card(card, False)
+        self.examiner.end()
+        DeckManager.historian[self.deck.key] = self.examiner.historian
+        DeckManager.scheduler[self.deck.key] = self.examiner.scheduler
+        DeckManager.time_tracker[self.deck.key] = self.examiner.time_tracker
+        DeckManager.save(self.deck)
+        self.assertFalse(os.path.isfile(ExamCheckpoint.get_path(self.deck.key)))
+        self.assertEqual(len(Historian(self.deck).records), 1)
+
+    def testSaveWithoutResume(self):
+        for _ in range(3):
+            self.examiner.return_card(self.examiner.pick_card(), True)
+        # Crash, then the deck is saved by a new process without resuming the session
+        ExamCheckpoint.journals.discard(self.deck.key)
+        for data in (DeckManager.historian, DeckManager.scheduler, DeckManager.time_tracker):
+            data.pop(self.deck.key, None)
+        DeckManager.save(self.deck)
+        self.assertTrue(os.path.isfile(ExamCheckpoint.get_path(self.deck.key)))
+        # The session is resumed later: the journal is in the saved data, then discarded
+        examiner = Examiner(self.deck, DeckManager.get_historian(self.deck), DeckManager.get_time_tracker(self.deck),
+                            DeckManager.get_scheduler(self.deck), checkpoint=True)
+        self.assertEqual(len(examiner.historian.records), 3)
+        DeckManager.save(self.deck)
+        self.assertFalse(os.path.isfile(ExamCheckpoint.get_path(self.deck.key)))
+        self.assertEqual(len(Historian(self.deck).records), 3)
+
+    def tearDown(self):
+        DeckManager.delete(self.deck)
+
+
+if __name__ == '__main__':
+    unittest.main()
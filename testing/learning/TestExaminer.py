@@ -0,0 +1,36 @@
+import unittest
+import time
+from learn.deck import FlashCard, Deck
+from learn.quizz import Historian, TargetTimeTracker, Scheduler, Examiner
+
+
+class TestExaminer(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck("MyDeck", [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)])
+        self.historian = Historian(self.deck)
+        self.examiner = Examiner(self.deck, self.historian, TargetTimeTracker(self.deck), Scheduler(self.deck))
+
+    def testRenderLatency(self):
+        card = self.examiner.pick_card()
+        time.sleep(0.05)
+        self.examiner.card_displayed()
+        self.examiner.card_displayed()  # Ignored: the card is already displayed
+        self.assertEqual(len(self.examiner.render_latencies), 1)
+        self.assertEqual(self.examiner.render_latencies[0][0], card.key)
+        self.assertGreaterEqual(self.examiner.get_render_latency(), 0.05)
+        self.assertLess(self.examiner.get_duration(), 0.05)
+        self.examiner.return_card(card, True)
+        self.assertLess(self.historian.records[-1][2], 0.05)
+        self.assertFalse(self.examiner.has_picked_card())
+
+    def testNotDisplayed(self):
+        card = self.examiner.pick_card()
+        time.sleep(0.02)
+        self.assertGreaterEqual(self.examiner.get_duration(), 0.02)
+        self.examiner.return_card(card, False)
+        self.examiner.card_displayed()  # Ignored: no picked card
+        self.assertIsNone(self.examiner.get_render_latency())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,13 @@ class TestFlashCard(unittest.TestCase):
         self.assertEqual(self.card, self.card)
         self.assertNotEqual(self.card, copy(self.card))
 
+    def testContentHash(self):
+        content_hash = self.card.get_content_hash()
+        self.card.question = "Who?"
+        self.assertNotEqual(self.card.get_content_hash(), content_hash)
+        self.card.question = "What?"
+        self.assertEqual(self.card.get_content_hash(), content_hash)
+
 
 if __name__ == '__main__':
     unittest.main()
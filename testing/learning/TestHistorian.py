@@ -2,6 +2,7 @@ import unittest
 from learn.deck import FlashCard, Deck
 from learn.quizz import Historian
 from copy import copy
+from datetime import timedelta
 from pandas.testing import assert_frame_equal
 import pandas as pd
 
@@ -21,6 +22,23 @@ class TestHistorian(unittest.TestCase):
         card = self.deck.cards[5]
         self.assertEqual(self.historian.get_card(card.key, self.deck), card)
 
+    def testLastReviewDates(self):
+        dates = self.historian.get_last_review_dates()
+        self.assertEqual(set(dates.keys()), {self.deck.cards[ind].key for ind in (1, 2, 8)})
+        self.assertEqual(dates[self.deck.cards[2].key], self.historian.records[2][0])
+        self.assertEqual(self.historian.get_last_review_date(self.deck.cards[8]), self.historian.records[3][0])
+        self.assertIsNone(self.historian.get_last_review_date(self.deck.cards[0]))
+        # Kept up to date when records are added or removed
+        card = self.deck.cards[0]
+        old_date = self.historian.records[0][0] - timedelta(days=3)
+        self.historian.restore_records([(old_date, card, 3, True), (old_date - timedelta(days=1), card, 3, False)])
+        self.assertEqual(self.historian.get_last_review_date(card), old_date)
+        self.historian.add_record(card, 1, True)
+        self.assertEqual(self.historian.get_last_review_date(card), self.historian.records[-1][0])
+        self.historian.remove_cards([card, self.deck.cards[8]])
+        self.assertIsNone(self.historian.get_last_review_date(card))
+        self.assertEqual(set(self.historian.get_last_review_dates()), {self.deck.cards[ind].key for ind in (1, 2)})
+
     def testWriteReadRecords(self):
         self.historian.save()
         self.historian.save()
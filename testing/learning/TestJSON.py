@@ -13,6 +13,9 @@ class TestJSON(unittest.TestCase):
     def testEncodeDecode(self):
         deck_str = json.dumps(self.deck, cls=JSONEncoder)
         self.assertEqual(json.loads(deck_str, cls=JSONDecoder), self.deck)
+        self.cards[4].enabled = False
+        deck_str = json.dumps(self.deck, cls=JSONEncoder)
+        self.assertFalse(json.loads(deck_str, cls=JSONDecoder)[4].enabled)
 
 
 if __name__ == '__main__':
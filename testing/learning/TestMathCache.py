@@ -0,0 +1,45 @@
+import unittest
+import tempfile
+import os
+import time
+from unittest.mock import patch
+import latex2mathml.converter
+from learn.render import MathCache
+
+
+class TestMathCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(MathCache, path=os.path.join(self.directory.name, 'math_cache.json'), entries=None,
+                                 size=0, max_size=10 ** 6, modified=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def testConvert(self):
+        self.assertEqual(MathCache.convert('x^2'), latex2mathml.converter.convert('x^2'))
+        self.assertIn('x^2', MathCache.entries)
+        MathCache.save()
+        MathCache.entries = None
+        self.assertIn('x^2', MathCache.get_entries())
+
+    def testSize(self):
+        MathCache.convert('a')
+        MathCache.max_size = MathCache.size + 1
+        MathCache.convert('b')
+        self.assertEqual(list(MathCache.entries), ['b'])
+        self.assertLessEqual(MathCache.size, MathCache.max_size)
+
+    def testWarm(self):
+        MathCache.warm(['Q $$\\frac{1}{2}$$ and $$y$$', 'No formula'])
+        while MathCache.thread is not None:
+            time.sleep(0.01)
+        self.assertEqual(set(MathCache.entries), {'\\frac{1}{2}', 'y'})
+        self.assertTrue(os.path.exists(MathCache.path))
+
+    def tearDown(self):
+        MathCache.clear()
+        self.directory.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from learn.deck import FlashCard, Deck
+from learn.pickle import DeckManager, OperationHistorian
+from learn.pickle.OperationHistorian import MoveCards, RemoveCards, AddCards, EditFlashCard, OperationGroup, \
+    ToggleEnabled
+import config
+
+
+class TestOperationHistorian(unittest.TestCase):
+    def setUp(self):
+        OperationHistorian.clear()
+        self.cards = [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)]
+        self.deck = Deck("Origin", list(self.cards))
+        self.other_deck = Deck("Destination", [FlashCard("Other", "Card")])
+        scheduler = DeckManager.get_scheduler(self.deck)
+        historian = DeckManager.get_historian(self.deck)
+        for ind, card in enumerate(self.deck):
+            scheduler.set_box(card, ind % 4)
+            historian.add_record(card, ind, True)
+
+    def testMoveCards(self):
+        cards = [self.cards[1], self.cards[2], self.cards[6]]
+        OperationHistorian.execute(MoveCards(cards, self.deck, self.other_deck))
+        self.assertEqual(self.other_deck.cards[1:], cards)
+        self.assertTrue(OperationHistorian.undo())
+        self.assertEqual(self.deck.cards, self.cards)
+        self.assertEqual(len(self.other_deck), 1)
+        self.assertEqual(DeckManager.get_scheduler(self.deck).get_box(self.cards[6]), 2)
+        self.assertTrue(OperationHistorian.redo())
+        self.assertEqual(self.other_deck.cards[1:], cards)
+        self.assertFalse(OperationHistorian.redo())
+
+    def testRemoveCards(self):
+        cards = [self.cards[0], self.cards[7]]
+        OperationHistorian.execute(RemoveCards(cards, self.deck))
+        self.assertNotIn(self.cards[7], self.deck)
+        self.assertEqual(len(DeckManager.get_historian(self.deck).records), 8)
+        OperationHistorian.undo()
+        self.assertEqual(self.deck.cards, self.cards)
+        self.assertEqual(len(DeckManager.get_historian(self.deck).records), 10)
+        self.assertEqual(DeckManager.get_scheduler(self.deck).get_box(self.cards[7]), 3)
+
+    def testGroup(self):
+        new_cards = [FlashCard("New", "Card")]
+        OperationHistorian.execute(OperationGroup([RemoveCards([self.cards[3]], self.deck),
+                                                   AddCards(new_cards, self.deck, 3)]))
+        self.assertEqual(self.deck[3], new_cards[0])
+        OperationHistorian.undo()
+        self.assertEqual(self.deck.cards, self.cards)
+
+    def testEditMerge(self):
+        card = self.cards[4]
+        OperationHistorian.execute(EditFlashCard(card, "Q4 edited?", "R4"))
+        OperationHistorian.execute(EditFlashCard(card, "Q4 edited twice?", "R4 edited"))
+        self.assertEqual(len(OperationHistorian.undo_stack), 1)
+        self.assertEqual(card.question, "Q4 edited twice?")
+        OperationHistorian.undo()
+        self.assertEqual((card.question, card.correction), ("Q4?", "R4"))
+        OperationHistorian.redo()
+        self.assertEqual((card.question, card.correction), ("Q4 edited twice?", "R4 edited"))
+
+    def testPasteRenamed(self):
+        # Cut of Q1? then paste in a deck that has the question, as done by QTreeDeck
+        clipboard = Deck('')
+        OperationHistorian.execute(MoveCards([self.cards[1]], self.deck, clipboard, 0))
+        self.other_deck.add_card(FlashCard("Q1?", "R"))
+        cards = list(clipboard.cards)
+        renames = [EditFlashCard(card, question, card.correction)
+                   for card, question in zip(cards, self.other_deck.get_unique_questions(cards))]
+        self.assertEqual(self.cards[1].question, "Q1?")
+        OperationHistorian.execute(OperationGroup(renames + [MoveCards(cards, clipboard, self.other_deck)]))
+        self.assertEqual(self.other_deck[-1].question, "Q1?(1)")
+        OperationHistorian.undo()
+        OperationHistorian.undo()
+        self.assertEqual(self.deck.cards, self.cards)
+        self.assertEqual(self.cards[1].question, "Q1?")
+
+    def testToggleEnabled(self):
+        self.cards[2].enabled = False
+        OperationHistorian.execute(ToggleEnabled(self.cards[1:3]))
+        self.assertEqual([card.enabled for card in self.cards[1:3]], [False, True])
+        OperationHistorian.undo()
+        self.assertEqual([card.enabled for card in self.cards[1:3]], [True, False])
+
+    def testMemoryLimit(self):
+        size = EditFlashCard(self.cards[0], "", "").size()
+        for card in self.cards:
+            OperationHistorian.execute(EditFlashCard(card, "x" * (config.undo_memory_limit // 4), ""))
+        self.assertLessEqual(OperationHistorian.memory, config.undo_memory_limit + size)
+        self.assertLess(len(OperationHistorian.undo_stack), len(self.cards))
+
+    def tearDown(self):
+        OperationHistorian.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -78,6 +78,18 @@ class TestPicker(unittest.TestCase):
         self.assertScoreEqual(card, 0)
         self.assertEqual(self.scheduler.get_box(card), 1)
 
+    def testRankCards(self):
+        for card in self.deck[3:]:
+            self.historian.add_record(card, 5.8, True)
+            self.time_tracker.set_target_time(card, 5.8)
+        self.scheduler.next_box(self.deck[3])
+        boxes = {card.key: self.scheduler.get_box(card) for card in self.deck}
+        ranking = self.picker.rank_cards()
+        self.assertEqual(ranking[:3], sorted(self.deck[:3], key=lambda card: card.key))
+        self.assertEqual(ranking[-1], self.deck[3])  # Longest interval
+        self.assertEqual(len(ranking), len(self.deck))
+        self.assertEqual(boxes, {card.key: self.scheduler.get_box(card) for card in self.deck})
+
     def testRevisionTimePassed(self):
         # TODO: Find a way to test this
         pass
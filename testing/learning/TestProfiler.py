@@ -0,0 +1,55 @@
+import unittest
+import os
+import tracemalloc
+from learn.profiling import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def tearDown(self):
+        if Profiler.cprofile is not None:
+            Profiler.cprofile.disable()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        Profiler.enabled, Profiler.memory, Profiler.cprofile = False, False, None
+        Profiler.phases, Profiler.events, Profiler.calls = [], {}, {}
+
+    def testDisabled(self):
+        def function():
+            return 1
+        # No overhead when the profiling mode is off: the function itself is returned
+        self.assertIs(Profiler.timed(function), function)
+        with Profiler.phase('phase'):
+            Profiler.mark('event')
+        self.assertEqual((Profiler.phases, Profiler.events), ([], {}))
+        self.assertIsNone(Profiler.write_report())
+
+    def testReport(self):
+        Profiler.enable(memory=True, cprofile=True)
+
+        @Profiler.timed
+        def function(value):
+            return [value] * 1000
+        with Profiler.phase('deck load'):
+            with Profiler.phase('history load'):
+                function(1)
+            Profiler.mark('first paint')
+            Profiler.mark('first paint')
+            function(2)
+        self.assertEqual([phase[:2] for phase in Profiler.phases], [('deck load', 0), ('history load', 1)])
+        self.assertGreaterEqual(Profiler.phases[0][3], Profiler.phases[1][3])
+        self.assertEqual(list(Profiler.events), ['first paint'])
+        self.assertEqual(Profiler.calls[function.__qualname__][0], 2)
+        path = Profiler.write_report()
+        try:
+            with open(path, 'r') as file:
+                report = file.read()
+            self.assertIn('    history load', report)
+            self.assertIn(function.__qualname__, report)
+            self.assertTrue(os.path.isfile(path[:-len('.txt')] + '.prof'))
+        finally:
+            os.remove(path)
+            os.remove(path[:-len('.txt')] + '.prof')
+
+
+if __name__ == '__main__':
+    unittest.main()
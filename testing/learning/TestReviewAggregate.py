@@ -0,0 +1,31 @@
+import unittest
+from learn.quizz import ReviewAggregate
+
+
+class TestReviewAggregate(unittest.TestCase):
+    def setUp(self):
+        self.aggregate = ReviewAggregate({'a': 3, 'b': -2, 'c': None, 'd': 3, 'e': 0})
+
+    def testInit(self):
+        self.assertEqual(self.aggregate.get_min(), -2)
+        self.assertEqual(self.aggregate.due_count, 3)
+        self.assertEqual(len(self.aggregate), 5)
+
+    def testUpdate(self):
+        self.aggregate.set_days('b', 5)
+        self.assertEqual(self.aggregate.get_min(), 0)
+        self.assertEqual(self.aggregate.due_count, 2)
+        self.aggregate.discard('e')
+        self.aggregate.discard('c')
+        self.assertEqual(self.aggregate.get_min(), 3)
+        self.assertEqual(self.aggregate.due_count, 0)
+        self.aggregate.discard('a')
+        self.assertEqual(self.aggregate.get_min(), 3)
+        self.aggregate.discard('d')
+        self.aggregate.discard('b')
+        self.assertIsNone(self.aggregate.get_min())
+        self.assertEqual(len(self.aggregate), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from learn.deck import FlashCard, Deck
+from learn.search import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck("MyDeck", [FlashCard("Question %d about python" % i, "Response %d" % i) for i in range(10)])
+        self.other_deck = Deck("Other", [FlashCard("Capital of France?", "Paris"),
+                                         FlashCard("Pythagorean theorem?", "a^2 + b^2 = c^2")])
+        self.index = SearchIndex()
+        self.index.add_deck(self.deck)
+        self.index.add_deck(self.other_deck)
+
+    def testSubstring(self):
+        results = self.index.search('ytha') + self.index.search('ython')
+        self.assertEqual(len(results), 11)
+        self.assertEqual(self.index.search('question 3 ab'), [(self.deck[3], self.deck)])
+        self.assertEqual(self.index.search('PARIS'), [(self.other_deck[0], self.other_deck)])
+        self.assertEqual(self.index.search('unknown'), [])
+
+    def testPrefix(self):
+        self.assertEqual(self.index.search('pa'), [(self.other_deck[0], self.other_deck)])
+        self.assertEqual(self.index.search('ar'), [])
+
+    def testRanking(self):
+        results = self.index.search('pyth')
+        self.assertEqual(results[0], (self.other_deck[1], self.other_deck))
+
+    def testUpdate(self):
+        card = self.deck[2]
+        card.question = 'Edited'
+        self.index.update_card(card)
+        self.assertEqual(self.index.search('edited'), [(card, self.deck)])
+        self.assertNotIn((card, self.deck), self.index.search('question'))
+
+    def testMoveRemove(self):
+        cards = self.deck.cards[:3]
+        self.index.move_cards(cards, self.other_deck)
+        self.assertEqual(self.index.search('question 1 ')[0], (cards[1], self.other_deck))
+        self.index.move_cards(cards, Deck('Not indexed'))
+        self.assertEqual(len(self.index.search('question')), 7)
+        self.index.remove_deck(self.other_deck)
+        self.assertEqual(self.index.search('paris'), [])
+        self.assertEqual(len(self.index), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from io import StringIO
+from learn.deck import FlashCard, Deck
+from learn.quizz import Historian, TargetTimeTracker, Scheduler, Examiner, TerminalExam
+
+
+class TestTerminalExam(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck("MyDeck", [FlashCard("Q%d?" % i, "R%d" % i) for i in range(10)])
+        self.historian = Historian(self.deck)
+        self.examiner = Examiner(self.deck, self.historian, TargetTimeTracker(self.deck), Scheduler(self.deck))
+
+    def testToText(self):
+        self.assertEqual(TerminalExam.to_text('<b>Capital</b> of France?<br>file:///images/map.png\n$$x < y$$ &amp;'),
+                         'Capital of France?\n[Image: images/map.png]\n$$x < y$$ &')
+        self.assertEqual(TerminalExam.to_text('<python-code>print(1 &lt; 2)</python-code>'), 'print(1 < 2)')
+
+    def testRun(self):
+        output = StringIO()
+        # Correct, then wrong after an invalid answer, then quit on the third card
+        exam = TerminalExam(self.examiner, StringIO('\ny\n\nmaybe\nn\nq\n'), output)
+        self.assertEqual(exam.run(), 2)
+        self.assertEqual([success for _, _, _, success in self.historian.records], [True, False])
+        self.assertIn('[3] Question:', output.getvalue())
+        self.assertFalse(self.examiner.has_picked_card())
+        # The input ends during the first card
+        self.assertEqual(TerminalExam(self.examiner, StringIO(''), output).run(), 0)
+
+    def testReplay(self):
+        answers = TerminalExam.read_answers(StringIO('pass 2.5\n# Comment\n\nfail\n1 1\n'))
+        self.assertEqual(answers, [(True, 2.5), (False, None), (True, 1.0)])
+        self.assertEqual(TerminalExam(self.examiner).replay(answers), 3)
+        self.assertEqual([(duration, success) for _, _, duration, success in self.historian.records][::2],
+                         [(2.5, True), (1.0, True)])
+        self.assertRaises(ValueError, TerminalExam.read_answers, StringIO('pass\nmaybe\n'))
+        self.assertRaises(ValueError, TerminalExam.read_answers, StringIO('pass fast\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
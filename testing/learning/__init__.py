@@ -6,3 +6,17 @@ from .TestTargetTimeTracker import TestTargetTimeTracker
 from .TestScheduler import TestScheduler
 from .TestPicker import TestPicker
 from .TestDeckManager import TestDeckManager
+from .TestDataPack import TestDataPack
+from .TestBulkImporter import TestBulkImporter
+from .TestSearchIndex import TestSearchIndex
+from .TestDeckView import TestDeckView
+from .TestOperationHistorian import TestOperationHistorian
+from .TestReviewAggregate import TestReviewAggregate
+from .TestExaminer import TestExaminer
+from .TestCowList import TestCowList
+from .TestCowDict import TestCowDict
+from .TestExamCheckpoint import TestExamCheckpoint
+from .TestProfiler import TestProfiler
+from .TestTerminalExam import TestTerminalExam
+from .TestMathCache import TestMathCache
+from .TestAssetCache import TestAssetCache
@@ -1,5 +1,7 @@
 from testing.learning import TestFlashCard, TestDeck, TestJSON, TestHistorian, TestTargetTimeTracker, TestScheduler, \
-    TestPicker, TestDeckManager
+    TestPicker, TestDeckManager, TestDataPack, TestBulkImporter, TestSearchIndex, TestDeckView, \
+    TestOperationHistorian, TestReviewAggregate, TestExaminer, TestCowList, TestCowDict, \
+    TestExamCheckpoint, TestProfiler, TestTerminalExam, TestMathCache, TestAssetCache
 import unittest
 
 
@@ -8,7 +10,10 @@ def suite():
         Gather all the testing from this module in a test suite.
     """
     test_suite = unittest.TestSuite()
-    tests = [TestFlashCard, TestDeck, TestHistorian, TestTargetTimeTracker, TestScheduler, TestPicker, TestDeckManager]
+    tests = [TestFlashCard, TestDeck, TestHistorian, TestTargetTimeTracker, TestScheduler, TestPicker, TestDeckManager,
+             TestDataPack, TestBulkImporter, TestSearchIndex,
+             TestDeckView, TestOperationHistorian, TestReviewAggregate, TestExaminer, TestCowList, TestCowDict,
+             TestExamCheckpoint, TestProfiler, TestTerminalExam, TestMathCache, TestAssetCache]
     for test in tests:
         test_suite.addTest(unittest.makeSuite(test))
     return test_suite